@@ -1,18 +1,263 @@
 #!/usr/bin/env python3
-"""a16z OSS API - Static JSON API for Andreessen Horowitz investments."""
+"""a16z OSS API - Static JSON API for Andreessen Horowitz investments.
 
+Subcommands import their dependencies lazily: only `build` loads requests
+and the extractors, so commands that just read docs/ start fast.
+"""
+
+import argparse
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from src.build.build_dataset import build
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs")
+COMMANDS = ("build", "daemon", "validate", "serve", "stats", "query", "loadtest", "unbundle")
+
+
+def _load_json(path: str):
+    from src.formats import serializer
+
+    return serializer.load(path)
+
+
+def cmd_build(args) -> int:
+    from src.build.build_dataset import STAGE_NAMES, build, build_streaming
+    from src.extract.archive import SourceArchive
+
+    for stage in (args.start, args.stop):
+        if stage is not None and stage not in STAGE_NAMES:
+            print(f"Unknown stage '{stage}' (choose from {', '.join(STAGE_NAMES)})", file=sys.stderr)
+            return 2
+    if args.stream and (args.start or args.stop):
+        print("--stream does not use the stage cache; --from/--to cannot be combined with it", file=sys.stderr)
+        return 2
+
+    archive = None
+    if args.record:
+        archive = SourceArchive.record()
+    elif args.replay is not None:
+        archive = SourceArchive.replay(args.replay or None)
+
+    if args.stream:
+        summary = build_streaming(archive=archive, output_dir=args.docs, mirror_logos=args.logos, layout=args.layout)
+    else:
+        summary = build(
+            archive=archive,
+            output_dir=args.docs,
+            start=args.start,
+            stop=args.stop,
+            mirror_logos=args.logos,
+            layout=args.layout,
+        )
+    if "roster_parsed_count" in summary:
+        print(f"\nDone. {summary['roster_parsed_count']} companies built.")
+    if not summary.get("validation", {}).get("passed", True):
+        return 1
+    return 0
+
+
+def cmd_daemon(args) -> int:
+    from src.build.daemon import RefreshDaemon
+
+    RefreshDaemon(args.docs, args.interval, mirror_logos=args.logos, layout=args.layout).run(args.iterations)
+    return 0
+
+
+def cmd_validate(args) -> int:
+    from src.validate.validate_build import validate
+
+    print("=== Validating Build Output ===")
+    passed, errors = validate(args.docs, incremental=args.incremental)
+    for e in errors:
+        print(f"  ERROR: {e}")
+    if passed:
+        print("\nVALIDATION PASSED")
+        return 0
+    print(f"\nVALIDATION FAILED ({len(errors)} errors)")
+    return 1
+
+
+def cmd_unbundle(args) -> int:
+    from src.formats.bundle import BundleReader
+
+    try:
+        with BundleReader.open(args.bundle) as bundle:
+            count = bundle.extract_all(args.docs)
+    except ValueError as e:
+        print(f"ERROR: {args.bundle}: {e}")
+        return 1
+    print(f"Extracted {count} files into {args.docs}")
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from src.serve.server import serve
+
+    serve(args.docs, args.host, args.port, args.reload_interval)
+    return 0
+
+
+def cmd_stats(args) -> int:
+    meta = _load_json(os.path.join(args.docs, "meta.json"))
+    print(f"Last updated: {meta['last_updated_iso']}")
+    print(f"Total companies: {meta['total_companies']}")
+    for label, key in (("status", "counts_by_status"), ("sector", "counts_by_sector"), ("stage", "counts_by_stage")):
+        print(f"\nCounts by {label}:")
+        for name, count in sorted(meta.get(key, {}).items(), key=lambda kv: -kv[1]):
+            print(f"  {name}: {count}")
+    print("\nExtraction metrics:")
+    for name, value in meta.get("extraction_metrics", {}).items():
+        print(f"  {name}: {value}")
+    return 0
+
+
+def cmd_query(args) -> int:
+    from src.formats import serializer
+    from src.query.filters import filter_companies
+
+    companies = _load_json(os.path.join(args.docs, "companies", "all.json"))
+    results = filter_companies(companies, args.sector, args.stage, args.status, args.q)
+    shown = 0
+    for company in results:
+        if args.limit is not None and shown >= args.limit:
+            break
+        if args.json:
+            print(serializer.dumps(company, pretty=False).decode())
+        else:
+            print(f"{company['slug']}\t{company['name']}")
+        shown += 1
+    return 0
+
+
+def cmd_loadtest(args) -> int:
+    from src.bench.loadgen import format_report, run
+    from src.formats import serializer
+
+    target = args.target or args.docs
+    levels = [int(n) for n in args.concurrency.split(",")]
+    report = run(target, args.mix, levels, args.requests, args.gzip, args.seed)
+    print(format_report(report))
+    if args.output:
+        serializer.write(args.output, report)
+    return 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(description="a16z OSS API - Static JSON API for Andreessen Horowitz investments.")
+    commands = arg_parser.add_subparsers(dest="command", metavar="command")
+
+    p = commands.add_parser("build", help="fetch the sources and write docs/")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--record",
+        action="store_true",
+        help="record raw source pages into a dated archive under archive/",
+    )
+    mode.add_argument(
+        "--replay",
+        nargs="?",
+        const="",
+        metavar="ARCHIVE",
+        help="build from a recorded archive (default: the most recent one) with no network access",
+    )
+    p.add_argument(
+        "--from",
+        dest="start",
+        metavar="STAGE",
+        help="first stage to run; earlier stages are loaded from the artifact cache",
+    )
+    p.add_argument("--to", dest="stop", metavar="STAGE", help="last stage to run")
+    p.add_argument(
+        "--logos",
+        action="store_true",
+        help="download company logos not yet mirrored into docs/logos/",
+    )
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "stream records through the build, keeping only a small summary of each in memory; "
+            "memory still grows with the roster (skips the stage cache, columns.json, all.bin and related.json)"
+        ),
+    )
+    p.add_argument(
+        "--layout",
+        choices=("flat", "hashed"),
+        default="flat",
+        help="per-company files in companies/ (flat, default) or fanned out into companies/{bucket}/ (hashed)",
+    )
+    p.set_defaults(func=cmd_build)
+
+    p = commands.add_parser("daemon", help="poll the sources and rebuild docs/ whenever they change")
+    p.add_argument("--interval", type=float, default=300.0, help="seconds between polls (default: 300)")
+    p.add_argument("--iterations", type=int, help="stop after this many polls (default: run forever)")
+    p.add_argument(
+        "--logos",
+        action="store_true",
+        help="download company logos not yet mirrored into docs/logos/",
+    )
+    p.add_argument("--layout", choices=("flat", "hashed"), default="flat", help="per-company file layout (see build)")
+    p.set_defaults(func=cmd_daemon)
+
+    p = commands.add_parser("validate", help="validate the output in docs/")
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-check what changed since the last passing validation",
+    )
+    p.set_defaults(func=cmd_validate)
+
+    p = commands.add_parser("serve", help="serve docs/ and the /query endpoint over HTTP")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument(
+        "--reload-interval",
+        type=float,
+        default=2.0,
+        help="seconds between checks of meta.json for a newly published build",
+    )
+    p.set_defaults(func=cmd_serve)
+
+    p = commands.add_parser("stats", help="print dataset counts from meta.json")
+    p.set_defaults(func=cmd_stats)
+
+    p = commands.add_parser("query", help="filter companies in all.json")
+    p.add_argument("--sector")
+    p.add_argument("--stage")
+    p.add_argument("--status")
+    p.add_argument("--q", help="case-insensitive substring of name or description")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--json", action="store_true", help="print matching records as JSON lines")
+    p.set_defaults(func=cmd_query)
+
+    p = commands.add_parser("loadtest", help="replay client access patterns against a server or docs/")
+    p.add_argument("--target", help="server base URL, e.g. http://127.0.0.1:8000 (default: read --docs directly)")
+    p.add_argument("--mix", default="slug=80,facet=15,all=5", help="pattern weights: all, columns, slug, facet, meta, query")
+    p.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    p.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    p.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", help="also write the report as JSON to this path")
+    p.set_defaults(func=cmd_loadtest)
+
+    p = commands.add_parser("unbundle", help="extract a downloaded api.bundle into a docs/ mirror")
+    p.add_argument("bundle", help="path of the bundle file")
+    p.set_defaults(func=cmd_unbundle)
+
+    for sub in commands.choices.values():
+        sub.add_argument("--docs", default=DOCS_DIR, help="output directory (default: docs/)")
+    return arg_parser
 
 
-def main():
-    summary = build()
-    print(f"\nDone. {summary['roster_parsed_count']} companies built.")
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    # `python main.py [build options]` keeps working as a plain build
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["build", *argv]
+    args = make_parser().parse_args(argv)
+    return args.func(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
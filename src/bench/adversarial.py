@@ -0,0 +1,123 @@
+"""Generated adversarial source pages for the extractor performance tests.
+
+Each generator takes a size `n` and returns a page whose length grows
+linearly with `n`, shaped to stress one part of an extractor:
+
+Roster pages (``InvestmentListExtractor.extract_companies``):
+    huge_list       one ul.list with n <li> entries
+    many_headings   n <h6> headings, each followed by a one-entry list
+    deep_nesting    n nested <div>s around the list
+    stray_end_tags  n unclosed tags followed by n end tags that close nothing
+    entity_names    <li> names made of HTML entities and surrounding markup
+    long_name       a single <li> holding n characters of text
+
+Portfolio pages (``PortfolioExtractor.extract_data``):
+    big_blob        n companies in the data-json attribute
+    entity_blob     data-json strings that are mostly escaped characters
+    near_misses     n truncated portfolio-app divs before the real one
+    deep_json       n nested arrays in data-json (must be rejected quickly)
+"""
+
+import html
+import json
+from typing import Callable
+
+ROW_OPEN = '<html><body><div class="list-row"><h4>Investments</h4><div class="row">'
+ROW_CLOSE = "</div></div></body></html>"
+
+
+def _entry(i: int) -> str:
+    return f"Company {i:07d}"
+
+
+def huge_list(n: int) -> str:
+    items = "".join(f"<li>{_entry(i)}</li>" for i in range(n))
+    return f'{ROW_OPEN}<div class="col-xs-6"><h6>A</h6><ul class="list">{items}</ul></div>{ROW_CLOSE}'
+
+
+def many_headings(n: int) -> str:
+    columns = "".join(
+        f'<div class="col-xs-6"><h6>G{i}</h6><ul class="list"><li>{_entry(i)}</li></ul></div>' for i in range(n)
+    )
+    return ROW_OPEN + columns + ROW_CLOSE
+
+
+def deep_nesting(n: int) -> str:
+    return (
+        ROW_OPEN
+        + "<div>" * n
+        + f'<h6>A</h6><ul class="list"><li>{_entry(0)}</li><li>{_entry(1)}</li></ul>'
+        + "</div>" * n
+        + ROW_CLOSE
+    )
+
+
+def stray_end_tags(n: int) -> str:
+    return (
+        ROW_OPEN
+        + '<h6>A</h6><ul class="list">'
+        + "<span>" * n
+        + "</i>" * n
+        + "".join(f"<li>{_entry(i)}</li>" for i in range(10))
+        + "</ul>"
+        + ROW_CLOSE
+    )
+
+
+def entity_names(n: int) -> str:
+    items = "".join(f"<li>&amp;&#x41;<b>{_entry(i)}</b>&lt;&#233;&gt;<br/>&quot;</li>" for i in range(n))
+    return f'{ROW_OPEN}<h6>A</h6><ul class="list">{items}</ul>{ROW_CLOSE}'
+
+
+def long_name(n: int) -> str:
+    return f'{ROW_OPEN}<h6>A</h6><ul class="list"><li>{"x" * n}</li></ul>{ROW_CLOSE}'
+
+
+def _portfolio_page(data: str) -> str:
+    return f'<html><body><div class="portfolio-app" data-json="{html.escape(data)}"></div></body></html>'
+
+
+def big_blob(n: int) -> str:
+    companies = [
+        {
+            "ID": i,
+            "a16z_company_name": _entry(i),
+            "website_description": "Builds things for other companies. " * 3,
+            "website_categories": "AI;Enterprise",
+            "website_stage_at_investment": "Seed;Venture",
+            "website_current_status": "Active",
+            "company_url": f"https://example{i}.com",
+        }
+        for i in range(n)
+    ]
+    return _portfolio_page(json.dumps({"companies": companies}))
+
+
+def entity_blob(n: int) -> str:
+    noisy = "\"<'&>" * 20
+    return _portfolio_page(json.dumps({"companies": [{"a16z_company_name": noisy + str(i)} for i in range(n)]}))
+
+
+def near_misses(n: int) -> str:
+    return '<div class="portfolio-app" data-json=\n' * n + _portfolio_page('{"companies": []}')
+
+
+def deep_json(n: int) -> str:
+    return _portfolio_page("[" * n + "]" * n)
+
+
+ROSTER_PAGES: dict[str, Callable[[int], str]] = {
+    "huge_list": huge_list,
+    "many_headings": many_headings,
+    "deep_nesting": deep_nesting,
+    "stray_end_tags": stray_end_tags,
+    "entity_names": entity_names,
+    "long_name": long_name,
+}
+
+PORTFOLIO_PAGES: dict[str, Callable[[int], str]] = {
+    "big_blob": big_blob,
+    "entity_blob": entity_blob,
+    "near_misses": near_misses,
+    "deep_json": deep_json,
+}
@@ -0,0 +1,277 @@
+"""Load generator for the published API layout.
+
+Replays a weighted mix of client access patterns against either a running
+HTTP server (``http://host:port``) or a docs/ directory read straight from
+disk, at one or more concurrency levels, and reports per-pattern throughput,
+p50/p95/p99 latency and bytes transferred.
+
+Patterns:
+    all     GET /companies/all.json
+    columns GET /companies/columns.json
+    slug    GET the record file of a random company (/companies/{slug}.json in the flat layout)
+    facet   GET /{sectors,stages,statuses}/{id}.json for a random facet
+    meta    GET /meta.json
+    query   GET /query?... with a random facet filter (server only)
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.formats import serializer
+from src.formats.layout import company_path, layout_of
+
+PATTERNS = ("all", "columns", "slug", "facet", "meta", "query")
+DEFAULT_MIX = "slug=80,facet=15,all=5"
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse 'slug=80,facet=15,all=5' into normalized pattern weights."""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in PATTERNS:
+            raise ValueError(f"Unknown pattern '{name}' (choose from {', '.join(PATTERNS)})")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix weights must sum to a positive number")
+    return {name: w / total for name, w in weights.items()}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct * len(sorted_values) / 100) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Catalog:
+    """The slugs and facet ids that the randomized patterns pick from."""
+
+    def __init__(self, meta: dict[str, Any], companies: list[dict[str, Any]]):
+        self.slugs = [c["slug"] for c in companies]
+        self.layout = layout_of(meta)
+        self.facets = [
+            (directory, facet_id)
+            for directory, key in (("sectors", "counts_by_sector"), ("stages", "counts_by_stage"), ("statuses", "counts_by_status"))
+            for facet_id in meta.get(key, {})
+        ]
+
+    def path(self, pattern: str, rng: random.Random) -> str:
+        if pattern == "all":
+            return "/companies/all.json"
+        if pattern == "columns":
+            return "/companies/columns.json"
+        if pattern == "meta":
+            return "/meta.json"
+        if pattern == "slug":
+            return "/" + company_path(rng.choice(self.slugs), self.layout)
+        directory, facet_id = rng.choice(self.facets)
+        if pattern == "facet":
+            return f"/{directory}/{facet_id}.json"
+        param = {"sectors": "sector", "stages": "stage", "statuses": "status"}[directory]
+        return f"/query?{param}={facet_id}&limit=50"
+
+
+class HttpTarget:
+    """Keep-alive HTTP/1.1 client, one connection per worker."""
+
+    def __init__(self, base_url: str, accept_gzip: bool = False):
+        url = urlsplit(base_url)
+        if url.scheme != "http":
+            raise ValueError("Only plain http:// targets are supported")
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.accept_gzip = accept_gzip
+
+    async def open(self):
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def get(self, conn, path: str) -> tuple[Any, int, int]:
+        """Fetch path; returns (connection to reuse or None, status, body bytes)."""
+        if conn is None:
+            conn = await self.open()
+        reader, writer = conn
+        request = f"GET {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}\r\n"
+        if self.accept_gzip:
+            request += "Accept-Encoding: gzip\r\n"
+        writer.write((request + "\r\n").encode("latin-1"))
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+            conn = None
+        return conn, status, len(body)
+
+    async def fetch_json(self, path: str) -> Any:
+        reader, writer = await self.open()
+        writer.write(f"GET {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        _, _, body = raw.partition(b"\r\n\r\n")
+        return serializer.loads(body)
+
+    async def close(self, conn) -> None:
+        if conn is not None:
+            conn[1].close()
+
+    def shutdown(self) -> None:
+        pass
+
+
+class DirectoryTarget:
+    """Reads files from a docs/ directory, one thread per concurrent worker."""
+
+    def __init__(self, docs_dir: str, concurrency: int):
+        self.docs_dir = docs_dir
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def _read(self, path: str) -> tuple[int, int]:
+        if path.startswith("/query"):
+            raise ValueError("The query pattern needs an HTTP server target")
+        try:
+            with open(os.path.join(self.docs_dir, path.lstrip("/")), "rb") as f:
+                return 200, len(f.read())
+        except FileNotFoundError:
+            return 404, 0
+
+    async def open(self):
+        return None
+
+    async def get(self, conn, path: str) -> tuple[Any, int, int]:
+        status, size = await asyncio.get_running_loop().run_in_executor(self.pool, self._read, path)
+        return conn, status, size
+
+    async def fetch_json(self, path: str) -> Any:
+        return serializer.load(os.path.join(self.docs_dir, path.lstrip("/")))
+
+    async def close(self, conn) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+
+async def _run_level(target, catalog: Catalog, mix: dict[str, float], concurrency: int, total: int, seed: int) -> dict:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies: dict[str, list[float]] = {n: [] for n in names}
+    transferred = {n: 0 for n in names}
+    errors = {n: 0 for n in names}
+    remaining = [total]
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        conn = await target.open()
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                pattern = rng.choices(names, weights)[0]
+                path = catalog.path(pattern, rng)
+                t0 = time.perf_counter()
+                try:
+                    conn, status, size = await target.get(conn, path)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError, ValueError):
+                    # A dropped connection or malformed response is one failed request; the next one reconnects
+                    await target.close(conn)
+                    conn, status, size = None, 0, 0
+                latencies[pattern].append(time.perf_counter() - t0)
+                transferred[pattern] += size
+                if status == 0 or status >= 400:
+                    errors[pattern] += 1
+        finally:
+            await target.close(conn)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    patterns = {}
+    for name in names:
+        samples = sorted(latencies[name])
+        patterns[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            "p99_ms": round(percentile(samples, 99) * 1000, 3),
+            "bytes": transferred[name],
+        }
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "patterns": patterns,
+    }
+
+
+async def _run(target_spec: str, mix: dict[str, float], levels: list[int], requests: int, accept_gzip: bool, seed: int) -> dict:
+    results = []
+    catalog = None
+    for concurrency in levels:
+        if target_spec.startswith("http://"):
+            target = HttpTarget(target_spec, accept_gzip)
+        else:
+            if "query" in mix:
+                raise ValueError("The query pattern needs an HTTP server target")
+            target = DirectoryTarget(target_spec, concurrency)
+        if catalog is None:
+            catalog = Catalog(await target.fetch_json("/meta.json"), await target.fetch_json("/companies/all.json"))
+        try:
+            results.append(await _run_level(target, catalog, mix, concurrency, requests, seed))
+        finally:
+            target.shutdown()
+    return {"target": target_spec, "mix": mix, "gzip": accept_gzip, "levels": results}
+
+
+def run(
+    target: str,
+    mix: str = DEFAULT_MIX,
+    concurrency: list[int] | None = None,
+    requests: int = 2000,
+    accept_gzip: bool = False,
+    seed: int = 0,
+) -> dict:
+    """Run the load test at each concurrency level and return the report."""
+    return asyncio.run(_run(target, parse_mix(mix), concurrency or [1, 8, 32], requests, accept_gzip, seed))
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Target: {report['target']}  gzip={report['gzip']}"]
+    for level in report["levels"]:
+        lines.append(
+            f"\nconcurrency={level['concurrency']}  {level['requests']} requests in "
+            f"{level['elapsed_s']}s  ({level['throughput_rps']} req/s)"
+        )
+        lines.append(f"  {'pattern':<8} {'reqs':>6} {'err':>4} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'MB':>9}")
+        for name, p in level["patterns"].items():
+            lines.append(
+                f"  {name:<8} {p['requests']:>6} {p['errors']:>4} {p['throughput_rps']:>9} "
+                f"{p['p50_ms']:>8} {p['p95_ms']:>8} {p['p99_ms']:>8} {p['bytes'] / 1e6:>9.2f}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""Single-pass aggregation over company records.
+
+One `Aggregator.add()` call per company accumulates everything the build
+reports about the dataset: the meta.json counts and coverage, the
+sector/stage/status index maps, the founder index, and the sector × stage ×
+status cross-tab.
+"""
+
+from typing import Any, Iterable
+
+from src.normalize.founders import founder_key, parse_founder, shard_of
+
+# Fields whose presence is reported as coverage (meta key suffix -> record field)
+COVERAGE_FIELDS = {
+    "website": "website",
+    "description": "description",
+    "sector": "sectors",
+    "stage": "stages",
+    "status": "status",
+    "founders": "founders",
+}
+
+
+def _has(company: dict[str, Any], field: str) -> bool:
+    if field == "status":
+        status = company.get("status", "unknown")
+        return bool(status) and status != "unknown"
+    return bool(company.get(field))
+
+
+def _pct(n: int, total: int) -> float:
+    return round(100 * n / total, 1) if total else 0.0
+
+
+def _index_entry(facet_id: str) -> dict[str, Any]:
+    return {
+        "id": facet_id,
+        "name": facet_id.replace("-", " ").title(),
+        "companies": [],
+    }
+
+
+class Aggregator:
+    def __init__(self):
+        self.total = 0
+        self.coverage = {key: 0 for key in COVERAGE_FIELDS}
+        self.sectors: dict[str, dict] = {}
+        self.stages: dict[str, dict] = {}
+        self.statuses: dict[str, dict] = {}
+        self.founders: dict[str, dict] = {}
+        self.crosstab_counts: dict[tuple, int] = {}
+        self.sector_coverage: dict[str, dict[str, int]] = {}
+
+    def add(self, company: dict[str, Any]) -> None:
+        """Fold one company into every statistic."""
+        self.total += 1
+        company_id = company["id"]
+        present = {key: _has(company, field) for key, field in COVERAGE_FIELDS.items()}
+        for key, has in present.items():
+            if has:
+                self.coverage[key] += 1
+
+        sectors = company.get("sectors", [])
+        stages = company.get("stages", [])
+        status = company.get("status", "unknown")
+
+        for sector in sectors:
+            if sector not in self.sectors:
+                self.sectors[sector] = _index_entry(sector)
+                self.sector_coverage[sector] = {"total": 0, **{key: 0 for key in COVERAGE_FIELDS}}
+            self.sectors[sector]["companies"].append(company_id)
+            sector_cov = self.sector_coverage[sector]
+            sector_cov["total"] += 1
+            for key, has in present.items():
+                if has:
+                    sector_cov[key] += 1
+
+        for stage in stages:
+            if stage not in self.stages:
+                self.stages[stage] = _index_entry(stage)
+            self.stages[stage]["companies"].append(company_id)
+
+        if status not in self.statuses:
+            self.statuses[status] = _index_entry(status)
+        self.statuses[status]["companies"].append(company_id)
+
+        for name in company.get("founders", []):
+            key = founder_key(name)
+            if not key:
+                continue
+            if key not in self.founders:
+                self.founders[key] = dict(parse_founder(name), companies=[])
+            if self.founders[key]["companies"][-1:] != [company_id]:
+                self.founders[key]["companies"].append(company_id)
+
+        # Companies without a sector or stage are counted under None so they
+        # still appear in the cross-tab.
+        for sector in sectors or [None]:
+            for stage in stages or [None]:
+                cell = (sector, stage, status)
+                self.crosstab_counts[cell] = self.crosstab_counts.get(cell, 0) + 1
+
+    def add_all(self, companies: Iterable[dict[str, Any]]) -> "Aggregator":
+        for company in companies:
+            self.add(company)
+        return self
+
+    def counts(self, facet: str) -> dict[str, int]:
+        """Company counts per value of 'sectors', 'stages' or 'statuses'."""
+        index = getattr(self, facet)
+        return {facet_id: len(entry["companies"]) for facet_id, entry in index.items()}
+
+    def founder_shards(self) -> dict[str, dict[str, Any]]:
+        """Content of each founders/{prefix}.json: the founders whose key starts with the prefix."""
+        shards: dict[str, dict[str, Any]] = {}
+        for key in sorted(self.founders):
+            prefix = shard_of(key)
+            shards.setdefault(prefix, {"prefix": prefix, "founders": {}})["founders"][key] = self.founders[key]
+        return shards
+
+    def coverage_metrics(self) -> dict[str, float]:
+        return {f"pct_with_{key}": _pct(n, self.total) for key, n in self.coverage.items()}
+
+    def crosstab(self) -> dict[str, Any]:
+        """Content of stats/crosstab.json."""
+        return {
+            "dimensions": ["sector", "stage", "status"],
+            "total_companies": self.total,
+            "counts": [
+                {"sector": sector, "stage": stage, "status": status, "count": count}
+                for (sector, stage, status), count in self.crosstab_counts.items()
+            ],
+            "coverage_by_sector": {
+                sector: {
+                    "total": cov["total"],
+                    **{f"pct_with_{key}": _pct(cov[key], cov["total"]) for key in COVERAGE_FIELDS},
+                }
+                for sector, cov in self.sector_coverage.items()
+            },
+        }
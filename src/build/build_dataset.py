@@ -1,68 +1,166 @@
-"""Build the static JSON dataset from the a16z investment list + portfolio enrichment."""
+"""Build the static JSON dataset from the a16z investment list + portfolio enrichment.
 
+The build is a staged pipeline (see src/build/pipeline.py):
+
+    fetch → extract → normalize → merge → index → related → logos → emit → validate
+
+Each stage's output is cached, so any suffix of the pipeline can be re-run
+from the artifacts of the previous run.
+
+`build_streaming` is the low-memory alternative: records flow from
+extraction through enrichment into the writers one at a time, without the
+stage cache. Memory still grows with the roster, by a small per-record
+summary rather than the whole record.
+"""
+
+import hashlib
 import json
 import os
+import queue
 import shutil
 import sys
+import threading
+from array import array
+from itertools import chain, islice
+from typing import BinaryIO, Iterable, Iterator
 
 # Ensure project root is on path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.extract.investment_list import InvestmentListExtractor
-from src.extract.portfolio import PortfolioExtractor
+from src.extract.archive import SourceArchive
+from src.extract.investment_list import INVESTMENT_LIST_URL, InvestmentListExtractor
+from src.extract.portfolio import PORTFOLIO_URL, PortfolioExtractor
 from src.parse.investment_list import InvestmentListParser
-from src.build.merge import merge_enrichment
+from src.build.aggregate import Aggregator
+from src.build.merge import StreamingMerger, merge_enrichment
+from src.build.pipeline import CACHE_DIR, Pipeline, Stage
+from src.formats import serializer
+from src.formats.bundle import BUNDLE_NAME, bundle_paths, train_dictionary, write_bundle
+from src.formats.columnar import encode_columns
+from src.formats.domains import DomainIndex, build_domain_index
+from src.formats.history import HISTORY_PATH, extend_history, load_history
+from src.formats.layout import FLAT, PATTERNS, company_path
+from src.formats.membership import BloomFilter, NameIndex, build_membership
+from src.formats.offsets import ArrayWriter, build_index as build_offset_index, dump_array_with_offsets
+from src.formats.packed import PackedDataset, pack_records
+from src.formats.sorts import build_sorts
+from src.normalize.clock import Clock, fixed_clock, now_iso
+from src.normalize.company import normalize_company
+from src.validate.validate_build import VALIDATED_PATHS, Manifest, Validator
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "docs")
 
+# Files the bundle dictionary is trained on, and the largest file that counts as a record sample
+BUNDLE_SAMPLES = 2000
+BUNDLE_SAMPLE_SIZE = 16 * 1024
 
-def _write_json(path: str, data) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
 
+def _write_bytes(path: str, data: bytes, manifest: Manifest | None = None) -> None:
+    """Write a file, recording it in the manifest; skips the write if the manifest's baseline already holds it."""
+    digest = hashlib.sha256(data).hexdigest() if manifest is not None else None
+    if manifest is None or manifest.baseline is None or not manifest.baseline.holds(path, digest):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    if manifest is not None:
+        manifest.add(path, digest)
 
-def build(max_companies: int | None = None) -> dict:
-    """Run the full extraction→parse→merge→build pipeline.
 
-    Returns a summary dict for the run report.
+def _write_json(path: str, data, compact: bool = False, manifest: Manifest | None = None) -> None:
+    _write_bytes(path, serializer.dumps(data, pretty=not compact) + b"\n", manifest)
+
+
+class _HashingFile:
+    """Write-through file wrapper that hashes what is written."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.sha = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.sha.update(data)
+        return self.f.write(data)
+
+
+def build_clock(archive: SourceArchive | None = None) -> Clock:
+    """The clock of one build, fixed for its whole run so its time can key the stage cache.
+
+    An archive's recording time when recording or replaying one, so a replay
+    reproduces the recorded build; otherwise the time the build started.
     """
-    print("=== a16z Static API Build ===")
+    return fixed_clock(archive.recorded_iso if archive is not None else now_iso())
+
+
+def fetch_stage(ctx: dict) -> dict:
+    """Download the raw source pages (or read them from a replay archive, or take them from ctx["pages"])."""
+    if ctx.get("pages") is not None:
+        return ctx["pages"]
+    archive = ctx.get("archive")
+    il_html = InvestmentListExtractor(archive=archive).fetch_page(INVESTMENT_LIST_URL)
+    print(f"       Fetched investment list ({len(il_html)} bytes)")
+
+    try:
+        pf_html = PortfolioExtractor(archive=archive).fetch_page(PORTFOLIO_URL)
+        print(f"       Fetched portfolio ({len(pf_html)} bytes)")
+    except Exception as e:
+        print(f"       WARNING: Portfolio fetch failed: {e}")
+        print("       Continuing with roster data only.")
+        pf_html = None
+
+    return {"investment_list": il_html, "portfolio": pf_html}
 
-    # --- Step 1: Extract investment list ---
-    print("\n[1/6] Extracting investment list...")
-    il_extractor = InvestmentListExtractor()
-    raw_companies = il_extractor.get_companies(max_companies)
+
+def extract_stage(ctx: dict, pages: dict) -> dict:
+    """Parse raw company entries out of the fetched pages."""
+    il_extractor = InvestmentListExtractor(clock=ctx.get("clock"))
+    raw_companies = il_extractor.extract_companies(pages["investment_list"])
+    if ctx.get("max_companies") is not None:
+        raw_companies = raw_companies[: ctx["max_companies"]]
     print(f"       Extracted {len(raw_companies)} raw entries")
 
     if not raw_companies:
         print("ERROR: No companies extracted. Aborting build.")
         sys.exit(1)
 
-    # --- Step 2: Normalize roster ---
-    print("\n[2/6] Normalizing roster companies...")
-    parser = InvestmentListParser()
-    companies = parser.parse_companies(raw_companies)
+    portfolio_data = None
+    if pages["portfolio"] is not None:
+        try:
+            portfolio_data = PortfolioExtractor().extract_data(pages["portfolio"])
+            print(f"       Extracted {len(portfolio_data.get('companies', []))} raw portfolio entries")
+        except Exception as e:
+            print(f"       WARNING: Portfolio extraction failed: {e}")
+            print("       Continuing with roster data only.")
+
+    return {"raw_companies": raw_companies, "portfolio_data": portfolio_data}
+
+
+def normalize_stage(ctx: dict, extracted: dict) -> dict:
+    """Normalize roster entries and portfolio enrichment records."""
+    parser = InvestmentListParser(clock=ctx.get("clock"))
+    companies = parser.parse_companies(extracted["raw_companies"])
     print(f"       Normalized {len(companies)} companies")
 
-    # --- Step 3: Extract portfolio enrichment ---
-    print("\n[3/6] Extracting portfolio data...")
-    try:
-        pf_extractor = PortfolioExtractor()
-        portfolio_companies, taxonomy = pf_extractor.get_companies()
-        print(f"       Extracted {len(portfolio_companies)} portfolio companies")
+    portfolio_companies: list[dict] = []
+    taxonomy: dict = {}
+    if extracted["portfolio_data"] is not None:
+        portfolio_companies, taxonomy = PortfolioExtractor().parse_companies(extracted["portfolio_data"])
+        print(f"       Normalized {len(portfolio_companies)} portfolio companies")
         print(f"       Categories: {taxonomy['categories']}")
         print(f"       Stages: {taxonomy['stages']}")
         print(f"       Statuses: {taxonomy['statuses']}")
-    except Exception as e:
-        print(f"       WARNING: Portfolio extraction failed: {e}")
-        print("       Continuing with roster data only.")
-        portfolio_companies = []
-        taxonomy = {}
 
-    # --- Step 4: Merge enrichment ---
-    print("\n[4/6] Merging portfolio enrichment...")
+    return {
+        "companies": companies,
+        "portfolio_companies": portfolio_companies,
+        "taxonomy": taxonomy,
+        "raw_extracted": len(extracted["raw_companies"]),
+    }
+
+
+def merge_stage(ctx: dict, normalized: dict) -> dict:
+    """Merge portfolio enrichment into the roster."""
+    companies = normalized["companies"]
+    portfolio_companies = normalized["portfolio_companies"]
     if portfolio_companies:
         companies, quarantined, merge_stats = merge_enrichment(companies, portfolio_companies)
         print(f"       Matched: {merge_stats['matched']}/{merge_stats['portfolio_count']}")
@@ -72,98 +170,167 @@ def build(max_companies: int | None = None) -> dict:
         quarantined = []
         merge_stats = {"matched": 0, "portfolio_count": 0, "match_rate": 0.0, "unmatched_portfolio": 0}
 
-    # --- Step 5: Generate meta ---
-    print("\n[5/6] Generating metadata...")
-    meta = parser.generate_meta(companies)
+    return {
+        "companies": companies,
+        "quarantined": quarantined,
+        "merge_stats": merge_stats,
+        "raw_extracted": normalized["raw_extracted"],
+        "portfolio_extracted": len(portfolio_companies),
+    }
+
+
+def index_stage(ctx: dict, merged: dict) -> dict:
+    """Generate meta.json content, the facet index maps and cross-tab stats in one pass."""
+    stats = Aggregator().add_all(merged["companies"])
+    print(
+        f"       {len(stats.sectors)} sectors, {len(stats.stages)} stages, {len(stats.statuses)} statuses,"
+        f" {len(stats.founders)} founders"
+    )
+    return _indexes(stats, ctx.get("clock"), merged["merge_stats"])
+
+
+def _indexes(stats: Aggregator, clock, merge_stats: dict) -> dict:
+    """meta.json content plus the facet index maps, founder shards and cross-tab from an Aggregator."""
+    meta = InvestmentListParser(clock=clock).generate_meta([], stats=stats)
     # Update portfolio match rate in meta
     meta["extraction_metrics"]["portfolio_match_rate"] = merge_stats["match_rate"]
+    return {
+        "meta": meta,
+        "sectors": stats.sectors,
+        "stages": stats.stages,
+        "statuses": stats.statuses,
+        "founders": stats.founder_shards(),
+        "crosstab": stats.crosstab(),
+    }
+
+
+def related_stage(ctx: dict, merged: dict) -> dict:
+    """Compute the top-k related companies for every company."""
+    from src.build.related import related_index
+
+    related = related_index(merged["companies"])
+    linked = sum(1 for entries in related["related"].values() if entries)
+    print(f"       {linked}/{len(related['related'])} companies have related companies")
+    return related
+
+
+def logos_stage(ctx: dict, merged: dict) -> dict:
+    """Map logo URLs to mirrored files in docs/logos/, downloading new ones if enabled."""
+    from src.extract.logos import LogoMirror
 
-    # --- Step 6: Write output files ---
-    print("\n[6/6] Writing static JSON files...")
+    archive = ctx.get("archive")
+    fetch = ctx.get("mirror_logos", False) and not (archive is not None and archive.replaying)
+    mirror = LogoMirror(ctx.get("output_dir", OUTPUT_DIR))
+    paths = mirror.mirror((c.get("logo_url") for c in merged["companies"]), fetch=fetch)
+    stats = mirror.stats
+    print(f"       {len(paths)} logos mirrored ({stats['fetched']} fetched, {stats['cached']} cached, {stats['failed']} failed)")
+    return paths
 
-    # Clean output dirs (keep docs/ root markdown files)
-    for subdir in ["companies", "sectors", "stages", "statuses", "sources"]:
-        target = os.path.join(OUTPUT_DIR, subdir)
+
+def _clean_output(output_dir: str, keep: Iterable[str] = ()) -> None:
+    """Remove generated subdirectories (keeps docs/ root markdown files, mirrored logos and `keep`)."""
+    for subdir in ["companies", "sectors", "stages", "statuses", "founders", "sorts", "sources", "stats"]:
+        if subdir in keep:
+            continue
+        target = os.path.join(output_dir, subdir)
         if os.path.exists(target):
             shutil.rmtree(target)
 
-    # meta.json
-    _write_json(os.path.join(OUTPUT_DIR, "meta.json"), meta)
-    print("  meta.json")
-
-    # companies/all.json
-    _write_json(os.path.join(OUTPUT_DIR, "companies", "all.json"), companies)
-    print(f"  companies/all.json ({len(companies)} companies)")
 
-    # companies/{slug}.json
-    for company in companies:
-        _write_json(
-            os.path.join(OUTPUT_DIR, "companies", f"{company['slug']}.json"),
-            company,
-        )
-    print(f"  companies/{{slug}}.json ({len(companies)} files)")
+def _record_logos(output_dir: str, manifest: Manifest) -> None:
+    """Record the mirrored logos, which the logos stage wrote, in the manifest."""
+    for directory, _, names in os.walk(os.path.join(output_dir, "logos")):
+        for name in names:
+            manifest.add_existing(os.path.join(directory, name))
+
+
+def _write_membership(output_dir: str, companies: Iterable[dict], manifest: Manifest) -> NameIndex:
+    """Write companies/names.bloom and companies/aliases.json; returns their reader."""
+    bloom, aliases = build_membership(companies)
+    _write_bytes(os.path.join(output_dir, "companies", "names.bloom"), bloom, manifest)
+    _write_json(os.path.join(output_dir, "companies", "aliases.json"), aliases, compact=True, manifest=manifest)
+    print(f"  companies/names.bloom ({len(bloom)} bytes), companies/aliases.json ({len(aliases['aliases'])} aliases)")
+    return NameIndex(BloomFilter.from_bytes(bloom), aliases)
+
+
+def _write_domains(output_dir: str, companies: Iterable[dict], manifest: Manifest) -> DomainIndex:
+    """Write companies/domains.json and its shards under companies/domains/; returns the reader."""
+    index, shards = build_domain_index(companies)
+    _write_json(os.path.join(output_dir, "companies", "domains.json"), index, compact=True, manifest=manifest)
+    for prefix, shard in shards.items():
+        path = os.path.join(output_dir, "companies", "domains", f"{prefix}.json")
+        _write_json(path, shard, compact=True, manifest=manifest)
+    print(f"  companies/domains.json ({len(index['domains'])} domains), companies/domains/ ({len(shards)} shards)")
+    return DomainIndex(index)
+
+
+def _write_sorts(output_dir: str, companies: Iterable[dict], manifest: Manifest) -> dict:
+    """Write sorts/{key}.json and its pages sorts/{key}/{page}.json; returns them for validation."""
+    sorts = build_sorts(companies)
+    for key, (index, pages) in sorts.items():
+        _write_json(os.path.join(output_dir, "sorts", f"{key}.json"), index, compact=True, manifest=manifest)
+        for page in pages:
+            path = os.path.join(output_dir, "sorts", key, f"{page['page']}.json")
+            _write_json(path, page, compact=True, manifest=manifest)
+    pages = sum(len(pages) for _, pages in sorts.values())
+    print(f"  sorts/ ({len(sorts)} sort orders, {pages} pages)")
+    return sorts
+
+
+def _write_indexes(output_dir: str, indexed: dict, manifest: Manifest) -> None:
+    """Write the sector/stage/status index files, the founder shards and stats/crosstab.json."""
+    for kind in ("sectors", "stages", "statuses"):
+        for sid, sdata in indexed[kind].items():
+            _write_json(os.path.join(output_dir, kind, f"{sid}.json"), sdata, manifest=manifest)
+        print(f"  {kind}/ ({len(indexed[kind])} files)")
+
+    for prefix, shard in indexed["founders"].items():
+        _write_json(os.path.join(output_dir, "founders", f"{prefix}.json"), shard, compact=True, manifest=manifest)
+    print(f"  founders/ ({len(indexed['founders'])} files, {_founder_count(indexed)} founders)")
+
+    crosstab = indexed["crosstab"]
+    _write_json(os.path.join(output_dir, "stats", "crosstab.json"), crosstab, manifest=manifest)
+    print(f"  stats/crosstab.json ({len(crosstab['counts'])} cells)")
+
+
+def _previous_history(output_dir: str) -> dict:
+    """The stats history files of the build in `output_dir`, read before it is cleaned."""
+    try:
+        return load_history(output_dir)
+    except ValueError as e:
+        print(f"  WARNING: stats history unreadable ({e}); starting a new one")
+        return {}
 
-    # Build index maps
-    sectors: dict[str, dict] = {}
-    stages: dict[str, dict] = {}
-    statuses: dict[str, dict] = {}
 
-    for company in companies:
-        for sector in company.get("sectors", []):
-            if sector not in sectors:
-                sectors[sector] = {
-                    "id": sector,
-                    "name": sector.replace("-", " ").title(),
-                    "companies": [],
-                }
-            sectors[sector]["companies"].append(company["id"])
-
-        for stage in company.get("stages", []):
-            if stage not in stages:
-                stages[stage] = {
-                    "id": stage,
-                    "name": stage.replace("-", " ").title(),
-                    "companies": [],
-                }
-            stages[stage]["companies"].append(company["id"])
-
-        status = company.get("status", "unknown")
-        if status not in statuses:
-            statuses[status] = {
-                "id": status,
-                "name": status.replace("-", " ").title(),
-                "companies": [],
-            }
-        statuses[status]["companies"].append(company["id"])
-
-    # sectors/{id}.json
-    for sid, sdata in sectors.items():
-        _write_json(os.path.join(OUTPUT_DIR, "sectors", f"{sid}.json"), sdata)
-    print(f"  sectors/ ({len(sectors)} files)")
-
-    # stages/{id}.json
-    for sid, sdata in stages.items():
-        _write_json(os.path.join(OUTPUT_DIR, "stages", f"{sid}.json"), sdata)
-    print(f"  stages/ ({len(stages)} files)")
-
-    # statuses/{id}.json
-    for sid, sdata in statuses.items():
-        _write_json(os.path.join(OUTPUT_DIR, "statuses", f"{sid}.json"), sdata)
-    print(f"  statuses/ ({len(statuses)} files)")
-
-    # sources/
+def _write_history(output_dir: str, previous: dict, meta: dict, manifest: Manifest) -> dict:
+    """Write stats/history.json and stats/history/{facet}.json with this build's row; returns them."""
+    try:
+        tables = extend_history(previous, meta)
+    except ValueError as e:
+        print(f"  WARNING: stats history not extendable ({e}); starting a new one")
+        tables = extend_history({}, meta)
+    for rel, table in tables.items():
+        _write_json(os.path.join(output_dir, *rel.split("/")), table, compact=True, manifest=manifest)
+    print(f"  {HISTORY_PATH} ({tables[HISTORY_PATH]['count']} builds), stats/history/ ({len(tables) - 1} facets)")
+    return tables
+
+
+def _write_sources_and_meta(output_dir: str, merged: dict, meta: dict, manifest: Manifest) -> None:
+    """Write sources/ and, last, meta.json."""
+    merge_stats = merged["merge_stats"]
+    quarantined = merged["quarantined"]
     _write_json(
-        os.path.join(OUTPUT_DIR, "sources", "investment-list.json"),
+        os.path.join(output_dir, "sources", "investment-list.json"),
         {
-            "url": "https://a16z.com/investment-list/",
-            "companies_extracted": len(raw_companies),
+            "url": INVESTMENT_LIST_URL,
+            "companies_extracted": merged["raw_extracted"],
         },
     )
     _write_json(
-        os.path.join(OUTPUT_DIR, "sources", "portfolio.json"),
+        os.path.join(output_dir, "sources", "portfolio.json"),
         {
-            "url": "https://a16z.com/portfolio/",
-            "companies_extracted": len(portfolio_companies),
+            "url": PORTFOLIO_URL,
+            "companies_extracted": merged["portfolio_extracted"],
             "matched": merge_stats["matched"],
             "match_rate": merge_stats["match_rate"],
         },
@@ -173,23 +340,488 @@ def build(max_companies: int | None = None) -> dict:
     # Write quarantine file if any
     if quarantined:
         _write_json(
-            os.path.join(OUTPUT_DIR, "sources", "quarantine.json"),
+            os.path.join(output_dir, "sources", "quarantine.json"),
             [{"name": q["name"], "slug": q["slug"]} for q in quarantined],
         )
         print(f"  sources/quarantine.json ({len(quarantined)} unmatched)")
 
-    print(f"\n=== Build complete: {len(companies)} companies ===")
+    # meta.json last, so its change marks a complete build for anything watching docs/;
+    # the bundle, which includes it, just before
+    meta_bytes = serializer.dumps(meta) + b"\n"
+    _write_bundle(output_dir, meta_bytes, manifest)
+    _write_bytes(os.path.join(output_dir, "meta.json"), meta_bytes, manifest)
+    print("  meta.json")
+
+
+def _write_bundle(output_dir: str, meta_bytes: bytes, manifest: Manifest) -> None:
+    """Write docs/api.bundle: every file under docs/ plus the meta.json about to be written."""
+    paths = [rel for rel in bundle_paths(output_dir) if rel != "meta.json"]
+
+    def read(rel: str) -> bytes:
+        with open(os.path.join(output_dir, rel), "rb") as f:
+            return f.read()
+
+    # The dictionary is trained on a spread of the small files under companies/, the per-company records
+    small = [
+        rel
+        for rel in paths
+        if rel.startswith("companies/") and os.path.getsize(os.path.join(output_dir, rel)) <= BUNDLE_SAMPLE_SIZE
+    ]
+    dictionary = train_dictionary(read(rel) for rel in small[:: max(1, len(small) // BUNDLE_SAMPLES)])
+    files = chain(((rel, read(rel)) for rel in paths), [("meta.json", meta_bytes)])
+    path = os.path.join(output_dir, BUNDLE_NAME)
+    with open(path + ".tmp", "wb") as f:
+        totals = write_bundle(f, files, dictionary)
+    os.replace(path + ".tmp", path)
+    manifest.add_existing(path)
+    print(
+        f"  {BUNDLE_NAME} ({totals['files']} files, {totals['size']} bytes in {totals['compressed']},"
+        f" {len(dictionary)}-byte dictionary)"
+    )
+
+
+def _finish_validation(
+    validator: Validator,
+    manifest: Manifest,
+    output_dir: str,
+    meta: dict,
+    names: NameIndex,
+    domains: DomainIndex,
+    sorts: dict,
+    history: dict,
+    related: dict | None = None,
+    packed: bytes | None = None,
+) -> dict:
+    """Run the dataset-level checks on what was just written; on success, save the manifest."""
+    validator.check_meta(meta)
+    # Everything but the mirrored logos was written by this build, so only logos need a stat
+    validator.check_files(lambda rel: rel in manifest or os.path.exists(os.path.join(output_dir, rel)))
+    if related is not None:
+        validator.check_related(related)
+    if packed is not None:
+        validator.check_packed(PackedDataset(packed))
+    validator.check_domains(domains)
+    validator.check_bundle(
+        os.path.join(output_dir, BUNDLE_NAME), serializer.dumps(meta) + b"\n", bundle_paths(output_dir)
+    )
+    for index, pages in sorts.values():
+        validator.check_sort(index, pages)
+    validator.check_history(history, meta)
+    validator.check_membership(names)
+    passed, errors = validator.finish()
+    if passed:
+        manifest.save()
+    return {"passed": passed, "errors": errors}
+
+
+def _with_layout(indexed: dict, layout: str) -> dict:
+    """The index outputs with the record layout declared in meta.json."""
+    return dict(indexed, meta=dict(indexed["meta"], record_layout=layout))
+
+
+def _founder_count(indexed: dict) -> int:
+    return sum(len(shard["founders"]) for shard in indexed["founders"].values())
+
+
+def _summary(merged: dict, indexed: dict) -> dict:
     return {
-        "roster_parsed_count": len(companies),
-        "raw_extracted": len(raw_companies),
-        "portfolio_extracted": len(portfolio_companies),
+        "roster_parsed_count": indexed["meta"]["total_companies"],
+        "raw_extracted": merged["raw_extracted"],
+        "portfolio_extracted": merged["portfolio_extracted"],
+        "merge_stats": merged["merge_stats"],
+        "meta": indexed["meta"],
+        "sector_count": len(indexed["sectors"]),
+        "stage_count": len(indexed["stages"]),
+        "status_count": len(indexed["statuses"]),
+        "founder_count": _founder_count(indexed),
+        "quarantined_count": len(merged["quarantined"]),
+    }
+
+
+def emit_stage(ctx: dict, merged: dict, indexed: dict, related: dict, logos: dict) -> dict:
+    """Write the static JSON files."""
+    output_dir = ctx.get("output_dir", OUTPUT_DIR)
+    layout = ctx.get("layout") or FLAT
+    companies = [dict(c, logo_path=logos.get(c.get("logo_url"))) for c in merged["companies"]]
+    indexed = _with_layout(indexed, layout)
+
+    # A long-running caller passes the manifest of the previous emit: files whose
+    # bytes did not change are not rewritten, and files no longer produced are removed
+    previous = ctx.get("output_manifest")
+    history = _previous_history(output_dir)
+    _clean_output(output_dir, keep=VALIDATED_PATHS if previous is not None else ())
+    manifest = Manifest(output_dir, baseline=previous)
+    validator = Validator(layout)
+    _record_logos(output_dir, manifest)
+
+    # companies/all.json, recording where each record lands for companies/offsets.json
+    all_json, spans = dump_array_with_offsets(companies)
+    _write_bytes(os.path.join(output_dir, "companies", "all.json"), all_json, manifest)
+    print(f"  companies/all.json ({len(companies)} companies)")
+
+    # companies/offsets.json
+    _write_json(
+        os.path.join(output_dir, "companies", "offsets.json"),
+        build_offset_index((c["slug"] for c in companies), spans),
+        compact=True,
+        manifest=manifest,
+    )
+    print("  companies/offsets.json")
+
+    # companies/columns.json
+    _write_json(
+        os.path.join(output_dir, "companies", "columns.json"), encode_columns(companies), compact=True, manifest=manifest
+    )
+    print("  companies/columns.json")
+
+    # companies/all.bin
+    packed = pack_records(companies)
+    _write_bytes(os.path.join(output_dir, "companies", "all.bin"), packed, manifest)
+    print(f"  companies/all.bin ({len(packed)} bytes)")
+
+    # companies/related.json
+    _write_json(os.path.join(output_dir, "companies", "related.json"), related, compact=True, manifest=manifest)
+    print("  companies/related.json")
+
+    names = _write_membership(output_dir, companies, manifest)
+    domains = _write_domains(output_dir, companies, manifest)
+    sorts = _write_sorts(output_dir, companies, manifest)
+
+    # companies/{slug}.json (or companies/{bucket}/{slug}.json), validating each record as it is written
+    for company in companies:
+        _write_json(os.path.join(output_dir, company_path(company["slug"], layout)), company, manifest=manifest)
+        validator.check_company(company)
+    print(f"  {PATTERNS[layout]} ({len(companies)} files)")
+
+    _write_indexes(output_dir, indexed, manifest)
+    history = _write_history(output_dir, history, indexed["meta"], manifest)
+    if previous is not None:
+        # Before the bundle is written, so it does not carry files this build no longer produces
+        stale = previous.files.keys() - manifest.files.keys() - {"meta.json", BUNDLE_NAME}
+        for rel in stale:
+            path = os.path.join(output_dir, rel)
+            if os.path.exists(path):
+                os.remove(path)
+                if not os.listdir(os.path.dirname(path)):
+                    os.rmdir(os.path.dirname(path))
+    _write_sources_and_meta(output_dir, merged, indexed["meta"], manifest)
+    if previous is not None:
+        kept = sum(1 for rel, entry in manifest.files.items() if previous.digest(rel) == entry[2])
+        print(f"  {kept} of {len(manifest.files)} files unchanged, {len(stale)} removed")
+    ctx["output_manifest"] = manifest
+    # Picked up by validate_stage; emit's cached output is not validated output on a later run
+    ctx["validation"] = _finish_validation(
+        validator, manifest, output_dir, indexed["meta"], names, domains, sorts, history, related, packed
+    )
+    return _summary(merged, indexed)
+
+
+def validate_stage(ctx: dict, summary: dict) -> dict:
+    """Report the checks emit ran inline, or re-check the written output if emit did not run."""
+    from src.validate.validate_build import validate
+
+    if "validation" in ctx:
+        passed, errors = ctx["validation"]["passed"], ctx["validation"]["errors"]
+    else:
+        passed, errors = validate(ctx.get("output_dir", OUTPUT_DIR), incremental=True)
+    for e in errors:
+        print(f"  ERROR: {e}")
+    print(f"       Validation {'passed' if passed else f'FAILED ({len(errors)} errors)'}")
+    return {"passed": passed, "errors": errors}
+
+
+STAGES = [
+    Stage("fetch", fetch_stage, always_run=True),
+    Stage(
+        "extract",
+        extract_stage,
+        inputs=("fetch",),
+        params=("max_companies", "clock_iso"),
+        modules=("src.extract.investment_list", "src.extract.portfolio", "src.normalize.slugify"),
+    ),
+    Stage(
+        "normalize",
+        normalize_stage,
+        inputs=("extract",),
+        params=("clock_iso",),
+        modules=(
+            "src.parse.investment_list",
+            "src.normalize.company",
+            "src.normalize.founders",
+            "src.extract.portfolio",
+        ),
+    ),
+    Stage("merge", merge_stage, inputs=("normalize",), modules=("src.build.merge",)),
+    Stage(
+        "index",
+        index_stage,
+        inputs=("merge",),
+        params=("clock_iso",),
+        modules=("src.parse.investment_list", "src.build.aggregate", "src.normalize.founders"),
+    ),
+    Stage("related", related_stage, inputs=("merge",), modules=("src.build.related",)),
+    Stage(
+        "logos",
+        logos_stage,
+        inputs=("merge",),
+        params=("mirror_logos", "output_dir"),
+        modules=("src.extract.logos",),
+        always_run=True,
+    ),
+    Stage(
+        "emit",
+        emit_stage,
+        inputs=("merge", "index", "related", "logos"),
+        params=("output_dir", "layout"),
+        modules=(
+            "src.formats.columnar",
+            "src.formats.domains",
+            "src.formats.history",
+            "src.formats.layout",
+            "src.formats.membership",
+            "src.formats.offsets",
+            "src.formats.packed",
+            "src.formats.sorts",
+            "src.normalize.names",
+            "src.validate.validate_build",
+        ),
+        always_run=True,
+    ),
+    Stage("validate", validate_stage, inputs=("emit",), params=("output_dir",), always_run=True),
+]
+
+STAGE_NAMES = [s.name for s in STAGES]
+
+
+def build(
+    max_companies: int | None = None,
+    archive: SourceArchive | None = None,
+    output_dir: str = OUTPUT_DIR,
+    start: str | None = None,
+    stop: str | None = None,
+    mirror_logos: bool = False,
+    layout: str = FLAT,
+    cache_dir: str = CACHE_DIR,
+) -> dict:
+    """Run the fetch→extract→normalize→merge→index→related→logos→emit→validate pipeline.
+
+    If an archive is given, raw pages are recorded into it, or (when it was
+    opened for replay) read from it with no network access and the archive's
+    recording time as the build clock. `start`/`stop` limit the run to a
+    range of stages; earlier stages are loaded from the artifact cache.
+    `mirror_logos` downloads logos not yet in docs/logos/ (never when replaying).
+    `layout` places the per-company files (see src/formats/layout.py).
+    `cache_dir` holds the stage artifacts.
+
+    Returns a summary dict for the run report.
+    """
+    print("=== a16z Static API Build ===")
+    if archive is not None:
+        print(f"{'Replaying' if archive.replaying else 'Recording'} archive: {archive.path}")
+
+    clock = build_clock(archive)
+    context = {
+        "archive": archive,
+        "clock": clock,
+        # The clock itself is a function; its fixed time is what goes into the stage cache keys
+        "clock_iso": now_iso(clock),
+        "max_companies": max_companies,
+        "output_dir": output_dir,
+        "mirror_logos": mirror_logos,
+        "layout": layout,
+    }
+    outputs = Pipeline(STAGES, cache_dir=cache_dir).run(context, start=start, stop=stop)
+
+    if "emit" not in outputs:
+        print(f"\n=== Stopped after {stop} ===")
+        return {"stages": list(outputs)}
+
+    summary = dict(outputs["emit"])
+    if "validate" in outputs:
+        summary["validation"] = outputs["validate"]
+    print(f"\n=== Build complete: {summary['roster_parsed_count']} companies ===")
+    return summary
+
+
+# --- Streaming build ---
+
+QUEUE_SIZE = 256  # records buffered between two streaming stages
+# Whole-dataset exports the streaming build does not write
+STREAM_SKIPPED = ("companies/columns.json", "companies/all.bin", "companies/related.json")
+
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _threaded(items: Iterable, maxsize: int = QUEUE_SIZE) -> Iterator:
+    """Iterate `items` on a worker thread, handing them over through a bounded queue.
+
+    The producer blocks when the consumer falls `maxsize` items behind, so
+    chained stages run concurrently with bounded buffering between them.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize)
+
+    def pump() -> None:
+        try:
+            for item in items:
+                handoff.put(item)
+        except BaseException as e:
+            handoff.put(_Failed(e))
+        handoff.put(_DONE)
+
+    threading.Thread(target=pump, daemon=True).start()
+    while (item := handoff.get()) is not _DONE:
+        if isinstance(item, _Failed):
+            raise item.error
+        yield item
+
+
+def build_streaming(
+    max_companies: int | None = None,
+    archive: SourceArchive | None = None,
+    output_dir: str = OUTPUT_DIR,
+    mirror_logos: bool = False,
+    layout: str = FLAT,
+) -> dict:
+    """Build docs/ with records streamed from extraction straight into the writers.
+
+    Roster entries are parsed, normalized, enriched and written one at a
+    time, with extraction, normalization/enrichment and writing running
+    concurrently on their own threads. Whole records are not kept, but the
+    portfolio lookup, the aggregated indexes and, for every record, its
+    slug, all.json span and the summary fields the membership, domain and
+    sort indexes need (about 0.5 KB each) stay in memory until the end, so
+    memory grows slowly with the roster rather than staying flat. The stage
+    cache is not used, and the exports in STREAM_SKIPPED, which need every
+    record at once, are not written; the build says so and lists them in
+    its summary.
+
+    Returns a summary dict for the run report.
+    """
+    from src.extract.logos import LogoMirror
+
+    print("=== a16z Static API Build (streaming) ===")
+    clock = build_clock(archive)
+    pages = fetch_stage({"archive": archive})
+
+    portfolio_companies: list[dict] = []
+    if pages["portfolio"] is not None:
+        try:
+            extractor = PortfolioExtractor()
+            portfolio_companies, _ = extractor.parse_companies(extractor.extract_data(pages["portfolio"]))
+            print(f"       Normalized {len(portfolio_companies)} portfolio companies")
+        except Exception as e:
+            print(f"       WARNING: Portfolio extraction failed: {e}")
+            print("       Continuing with roster data only.")
+    merger = StreamingMerger(portfolio_companies)
+
+    # Logo URLs all come from the portfolio, so they can be resolved up front
+    fetch_logos = mirror_logos and not (archive is not None and archive.replaying)
+    logo_paths = LogoMirror(output_dir).mirror((p.get("logo_url") for p in portfolio_companies), fetch=fetch_logos)
+
+    counts = {"raw_extracted": 0, "normalize_errors": 0}
+
+    def extract() -> Iterator[dict]:
+        raw_companies = InvestmentListExtractor(clock=clock).iter_companies([pages["investment_list"]])
+        for raw in islice(raw_companies, max_companies):
+            counts["raw_extracted"] += 1
+            yield raw
+
+    def normalize_and_enrich(raw_companies: Iterable[dict]) -> Iterator[dict]:
+        for raw in raw_companies:
+            try:
+                company = normalize_company(raw, clock)
+            except Exception as e:
+                counts["normalize_errors"] += 1
+                print(f"WARNING: {raw.get('name', 'unknown')} failed normalization: {e}")
+                continue
+            company = merger.enrich(company)
+            company["logo_path"] = logo_paths.get(company.get("logo_url"))
+            yield company
+
+    companies = _threaded(normalize_and_enrich(_threaded(extract())))
+    first = next(companies, None)
+    if first is None:
+        print("ERROR: No companies extracted. Aborting build.")
+        sys.exit(1)
+
+    history = _previous_history(output_dir)
+    _clean_output(output_dir)
+    os.makedirs(os.path.join(output_dir, "companies"), exist_ok=True)
+    manifest = Manifest(output_dir)
+    validator = Validator(layout)
+    _record_logos(output_dir, manifest)
+    stats = Aggregator()
+    slugs: list[str] = []
+    # The fields of each record that the membership, domain and sort indexes need
+    summaries: list[dict] = []
+    offsets, lengths = array("q"), array("q")
+    all_path = os.path.join(output_dir, "companies", "all.json")
+    with open(all_path, "wb") as f:
+        hashing = _HashingFile(f)
+        writer = ArrayWriter(hashing)
+        for company in chain([first], companies):
+            offset, length = writer.write(company)
+            offsets.append(offset)
+            lengths.append(length)
+            slugs.append(company["slug"])
+            summaries.append(
+                {
+                    "id": company["id"],
+                    "name": company["name"],
+                    "slug": company["slug"],
+                    "website": company.get("website"),
+                    "status": company.get("status"),
+                    "sectors": company.get("sectors", []),
+                    "first_seen_iso": company.get("first_seen_iso"),
+                }
+            )
+            _write_json(os.path.join(output_dir, company_path(company["slug"], layout)), company, manifest=manifest)
+            stats.add(company)
+            validator.check_company(company)
+        writer.close()
+    manifest.add(all_path, hashing.sha.hexdigest())
+    print(f"  companies/all.json ({stats.total} companies)")
+    print(f"  {PATTERNS[layout]} ({stats.total} files)")
+
+    _write_json(
+        os.path.join(output_dir, "companies", "offsets.json"),
+        build_offset_index(slugs, zip(offsets, lengths)),
+        compact=True,
+        manifest=manifest,
+    )
+    print("  companies/offsets.json")
+    name_index = _write_membership(output_dir, summaries, manifest)
+    domain_index = _write_domains(output_dir, summaries, manifest)
+    sorts = _write_sorts(output_dir, summaries, manifest)
+
+    quarantined, merge_stats = merger.finish()
+    merged = {
+        "quarantined": quarantined,
         "merge_stats": merge_stats,
-        "meta": meta,
-        "sector_count": len(sectors),
-        "stage_count": len(stages),
-        "status_count": len(statuses),
-        "quarantined_count": len(quarantined),
+        "raw_extracted": counts["raw_extracted"],
+        "portfolio_extracted": len(portfolio_companies),
     }
+    indexed = _with_layout(_indexes(stats, clock, merge_stats), layout)
+    _write_indexes(output_dir, indexed, manifest)
+    history = _write_history(output_dir, history, indexed["meta"], manifest)
+    _write_sources_and_meta(output_dir, merged, indexed["meta"], manifest)
+
+    validation = _finish_validation(
+        validator, manifest, output_dir, indexed["meta"], name_index, domain_index, sorts, history
+    )
+    errors = validation["errors"]
+    for e in errors:
+        print(f"  ERROR: {e}")
+    print(f"  Validation {'passed' if validation['passed'] else f'FAILED ({len(errors)} errors)'}")
+
+    print(f"  Not written in streaming mode: {', '.join(STREAM_SKIPPED)}")
+    print(f"\n=== Build complete: {stats.total} companies ===")
+    return dict(_summary(merged, indexed), validation=validation, skipped_exports=list(STREAM_SKIPPED))
 
 
 if __name__ == "__main__":
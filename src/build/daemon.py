@@ -0,0 +1,154 @@
+"""Long-running refresh: poll the sources and rebuild docs/ only when they change.
+
+`RefreshDaemon` keeps in memory what a cold `build` recomputes every run:
+
+- one extractor per source, so HTTP connections stay alive between polls,
+  and the ETag/Last-Modified of each page for conditional requests;
+- a hash of each page body and the data parsed from it (timestamps
+  excluded), so a page whose markup changed around the same roster or
+  portfolio entries does not trigger a rebuild;
+- the pipeline artifacts of the last build, kept in memory rather than read
+  back from the stage cache (every rebuild is stamped with its own time, so
+  the stages from extract on always re-run);
+- the manifest of the last emit, so only files whose bytes changed are
+  rewritten and files no longer produced are removed.
+
+A failed portfolio fetch keeps the last portfolio page; a failed roster fetch
+skips the poll.
+"""
+
+import hashlib
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.build.build_dataset import OUTPUT_DIR, STAGES, build_clock
+from src.build.pipeline import CACHE_DIR, Pipeline
+from src.extract.investment_list import INVESTMENT_LIST_URL, InvestmentListExtractor
+from src.extract.portfolio import PORTFOLIO_URL, PortfolioExtractor
+from src.formats.layout import FLAT
+from src.normalize.clock import now_iso
+
+DEFAULT_INTERVAL = 300.0  # seconds between polls
+
+
+class RefreshDaemon:
+    def __init__(
+        self,
+        output_dir: str = OUTPUT_DIR,
+        interval: float = DEFAULT_INTERVAL,
+        mirror_logos: bool = False,
+        urls: dict[str, str] | None = None,
+        cache_dir: str = CACHE_DIR,
+        layout: str = FLAT,
+    ):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.mirror_logos = mirror_logos
+        self.layout = layout
+        self.urls = urls or {"investment_list": INVESTMENT_LIST_URL, "portfolio": PORTFOLIO_URL}
+        self.extractors = {"investment_list": InvestmentListExtractor(), "portfolio": PortfolioExtractor()}
+        self.pipeline = Pipeline(STAGES, cache_dir=cache_dir, keep_in_memory=True)
+        self.pages: dict[str, str | None] = {"investment_list": None, "portfolio": None}
+        self.digests: dict[str, str] = {}
+        self.parsed: dict[str, object] = {}
+        self.output_manifest = None
+        # A change was seen but not yet built successfully
+        self.pending = False
+        self.builds = 0
+
+    def _parse(self, source: str, html: str) -> object:
+        """The data a build takes from a page, without the fetch timestamps."""
+        if source == "investment_list":
+            roster = [
+                {k: v for k, v in raw.items() if not k.endswith("_iso")}
+                for raw in self.extractors[source].extract_companies(html)
+            ]
+            if not roster:
+                raise ValueError("no companies on the page")
+            return roster
+        return self.extractors[source].extract_data(html)
+
+    def poll(self) -> bool:
+        """Fetch both sources conditionally; True if the data of either changed since the last poll."""
+        changed = False
+        for source, extractor in self.extractors.items():
+            try:
+                html = extractor.fetch_page_if_changed(self.urls[source])
+            except requests.RequestException as e:
+                print(f"  WARNING: {source} fetch failed: {e}")
+                if source == "investment_list":
+                    return False
+                continue
+            if html is None:
+                print(f"  {source}: not modified")
+                continue
+            digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+            if digest == self.digests.get(source):
+                print(f"  {source}: unchanged")
+                continue
+            try:
+                parsed = self._parse(source, html)
+            except Exception as e:
+                print(f"  WARNING: {source} parse failed: {e}")
+                continue
+            self.digests[source] = digest
+            self.pages[source] = html
+            if parsed != self.parsed.get(source):
+                print(f"  {source}: changed")
+                self.parsed[source] = parsed
+                changed = True
+            else:
+                print(f"  {source}: markup changed, data unchanged")
+        return changed and self.pages["investment_list"] is not None
+
+    def rebuild(self) -> dict:
+        """Run the build pipeline on the current pages."""
+        clock = build_clock()
+        context = {
+            "archive": None,
+            "clock": clock,
+            "clock_iso": now_iso(clock),
+            "max_companies": None,
+            "output_dir": self.output_dir,
+            "mirror_logos": self.mirror_logos,
+            "layout": self.layout,
+            "pages": dict(self.pages),
+            "output_manifest": self.output_manifest,
+        }
+        outputs = self.pipeline.run(context)
+        self.output_manifest = context["output_manifest"]
+        self.builds += 1
+        summary = dict(outputs["emit"])
+        summary["validation"] = outputs["validate"]
+        return summary
+
+    def refresh(self) -> dict | None:
+        """Poll once and rebuild if anything changed; returns the build summary, or None."""
+        print(f"=== Poll ({time.strftime('%Y-%m-%d %H:%M:%S')}) ===")
+        if self.poll():
+            self.pending = True
+        if not self.pending:
+            return None
+        summary = self.rebuild()
+        self.pending = False
+        print(f"\n=== Rebuilt: {summary['roster_parsed_count']} companies ===")
+        return summary
+
+    def run(self, iterations: int | None = None) -> None:
+        """Poll every `interval` seconds (forever, or `iterations` times)."""
+        done = 0
+        while iterations is None or done < iterations:
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep the warm state and try again on the next poll
+                print(f"  ERROR: refresh failed: {e}")
+            done += 1
+            if iterations is None or done < iterations:
+                time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
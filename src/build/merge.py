@@ -8,6 +8,46 @@ Matching strategy:
 from src.normalize.slugify import slugify
 
 
+class StreamingMerger:
+    """Merge portfolio data into roster companies that arrive one at a time.
+
+    Only the portfolio lookup (slug -> portfolio records) and the set of
+    roster slugs seen so far are held in memory.
+    """
+
+    def __init__(self, portfolio: list[dict]):
+        self.portfolio = portfolio
+        self.by_slug: dict[str, list[dict]] = {}
+        for p in portfolio:
+            slug = p.get("slug", "")
+            if slug:
+                self.by_slug.setdefault(slug, []).append(p)
+        self.seen_slugs: set[str] = set()
+        self.roster_count = 0
+        self.matched = 0
+
+    def enrich(self, company: dict) -> dict:
+        """Apply matching portfolio enrichment to one roster company (in place)."""
+        self.roster_count += 1
+        self.seen_slugs.add(company["slug"])
+        for p in self.by_slug.get(company["slug"], ()):
+            _apply_enrichment(company, p)
+            self.matched += 1
+        return company
+
+    def finish(self) -> tuple[list[dict], dict]:
+        """Return (quarantined_portfolio, stats) once the whole roster has been seen."""
+        unmatched_portfolio = [p for p in self.portfolio if p.get("slug") and p["slug"] not in self.seen_slugs]
+        stats = {
+            "roster_count": self.roster_count,
+            "portfolio_count": len(self.portfolio),
+            "matched": self.matched,
+            "unmatched_portfolio": len(unmatched_portfolio),
+            "match_rate": round(100 * self.matched / len(self.portfolio), 1) if self.portfolio else 0.0,
+        }
+        return unmatched_portfolio, stats
+
+
 def merge_enrichment(
     roster: list[dict],
     portfolio: list[dict],
@@ -26,29 +66,11 @@ def merge_enrichment(
     for company in roster:
         roster_by_slug[company["slug"]] = company
 
-    matched = 0
-    unmatched_portfolio = []
-
-    for p in portfolio:
-        slug = p.get("slug", "")
-        if not slug:
-            continue
-
-        if slug in roster_by_slug:
-            _apply_enrichment(roster_by_slug[slug], p)
-            matched += 1
-        else:
-            unmatched_portfolio.append(p)
-
-    stats = {
-        "roster_count": len(roster),
-        "portfolio_count": len(portfolio),
-        "matched": matched,
-        "unmatched_portfolio": len(unmatched_portfolio),
-        "match_rate": round(100 * matched / len(portfolio), 1) if portfolio else 0.0,
-    }
-
-    return list(roster_by_slug.values()), unmatched_portfolio, stats
+    merger = StreamingMerger(portfolio)
+    companies = [merger.enrich(company) for company in roster_by_slug.values()]
+    unmatched_portfolio, stats = merger.finish()
+    stats["roster_count"] = len(roster)
+    return companies, unmatched_portfolio, stats
 
 
 def _apply_enrichment(company: dict, portfolio: dict) -> None:
@@ -65,6 +87,10 @@ def _apply_enrichment(company: dict, portfolio: dict) -> None:
     if not company.get("website") and portfolio.get("website"):
         company["website"] = portfolio["website"]
 
+    # Enrich logo (mirrored into docs/logos/ by the logos stage)
+    if not company.get("logo_url") and portfolio.get("logo_url"):
+        company["logo_url"] = portfolio["logo_url"]
+
     # Enrich status (only if currently unknown)
     if company.get("status") in (None, "unknown") and portfolio.get("status"):
         company["status"] = portfolio["status"]
@@ -85,6 +111,10 @@ def _apply_enrichment(company: dict, portfolio: dict) -> None:
                 company.setdefault("stages", []).append(stage)
                 existing.add(stage)
 
+    # Enrich founders (the investment list names none)
+    if not company.get("founders") and portfolio.get("founders"):
+        company["founders"] = list(portfolio["founders"])
+
     # Enrich a16z_company_id
     if not company.get("a16z_company_id") and portfolio.get("a16z_company_id"):
         company["a16z_company_id"] = portfolio["a16z_company_id"]
@@ -0,0 +1,170 @@
+"""Staged build pipeline with persisted intermediate artifacts.
+
+The build runs as a chain of named stages. Each stage's output is pickled
+under .cache/pipeline/ keyed by a hash of its upstream artifact keys, its
+parameters and the source code of the stage and the modules it depends on.
+A stage whose key has not changed is loaded from the cache instead of being
+re-run, so fixing a bug in a late stage only re-executes that stage.
+
+`start`/`stop` restrict execution to a range of stages; stages before the
+range are loaded from their most recent cached artifact.
+
+A pipeline created with `keep_in_memory=True` also holds each stage's latest
+artifact in memory, so a long-running process that runs it repeatedly reuses
+unchanged stages without unpickling them.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import os
+import pickle
+import time
+from typing import Any, Callable
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "pipeline")
+
+
+class Stage:
+    """A named pipeline step.
+
+    Args:
+        name: Stage name used on the command line and in cache filenames.
+        fn: Callable taking (context, *upstream_outputs) and returning the artifact.
+        inputs: Names of upstream stages whose outputs are passed to fn.
+        params: Context keys that affect the output and so belong in the cache key.
+        modules: Dotted module names whose source is part of the code version.
+        always_run: Run even on a cache hit (network fetches, file writes).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: tuple[str, ...] = (),
+        params: tuple[str, ...] = (),
+        modules: tuple[str, ...] = (),
+        always_run: bool = False,
+    ):
+        self.name = name
+        self.fn = fn
+        self.inputs = inputs
+        self.params = params
+        self.modules = modules
+        self.always_run = always_run
+
+    def code_version(self) -> str:
+        """Hash of the stage function's source and its dependency modules."""
+        h = hashlib.sha256(inspect.getsource(self.fn).encode("utf-8"))
+        for module in self.modules:
+            spec = importlib.util.find_spec(module)
+            if spec is None or spec.origin is None:
+                raise ImportError(f"Cannot locate module {module} for stage {self.name}")
+            with open(spec.origin, "rb") as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+
+class Pipeline:
+    def __init__(self, stages: list[Stage], cache_dir: str = CACHE_DIR, keep_in_memory: bool = False):
+        self.stages = stages
+        self.names = [s.name for s in stages]
+        self.cache_dir = cache_dir
+        self.keep_in_memory = keep_in_memory
+        # Latest (key, artifact) per stage when keeping artifacts in memory
+        self.memory: dict[str, tuple[str, Any]] = {}
+
+    def run(
+        self,
+        context: dict[str, Any],
+        start: str | None = None,
+        stop: str | None = None,
+    ) -> dict[str, Any]:
+        """Run stages start..stop (inclusive) and return every stage's output by name."""
+        first = self.names.index(start) if start else 0
+        last = self.names.index(stop) if stop else len(self.names) - 1
+        if first > last:
+            raise ValueError(f"--from {start} comes after --to {stop}")
+
+        outputs: dict[str, Any] = {}
+        keys: dict[str, str] = {}
+        for i, stage in enumerate(self.stages[: last + 1]):
+            label = f"[{i + 1}/{len(self.stages)}] {stage.name}"
+            if i < first:
+                keys[stage.name] = self._latest_key(stage.name)
+                outputs[stage.name] = self._load(stage.name, keys[stage.name])
+                print(f"\n{label}: loaded cached artifact {keys[stage.name][:12]}")
+                continue
+
+            key = self._key(stage, context, keys)
+            if not stage.always_run and self._has(stage.name, key):
+                outputs[stage.name] = self._load(stage.name, key)
+                keys[stage.name] = key
+                self._set_latest(stage.name, key)
+                print(f"\n{label}: up to date (cached {key[:12]})")
+                continue
+
+            print(f"\n{label}...")
+            t0 = time.perf_counter()
+            output = stage.fn(context, *(outputs[name] for name in stage.inputs))
+            if not stage.inputs:
+                # Source stages have nothing upstream to hash, so key them by content
+                key = hashlib.sha256(key.encode() + pickle.dumps(output, pickle.HIGHEST_PROTOCOL)).hexdigest()
+            self._save(stage.name, key, output)
+            outputs[stage.name] = output
+            keys[stage.name] = key
+            print(f"       {stage.name} finished in {time.perf_counter() - t0:.2f}s")
+
+        return outputs
+
+    def _key(self, stage: Stage, context: dict[str, Any], keys: dict[str, str]) -> str:
+        h = hashlib.sha256(stage.name.encode())
+        h.update(stage.code_version().encode())
+        for name in stage.inputs:
+            h.update(keys[name].encode())
+        for param in stage.params:
+            h.update(f"{param}={context.get(param)!r}".encode())
+        return h.hexdigest()
+
+    def _path(self, name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}-{key[:16]}.pkl")
+
+    def _has(self, name: str, key: str) -> bool:
+        return self.memory.get(name, (None,))[0] == key or os.path.exists(self._path(name, key))
+
+    def _load(self, name: str, key: str) -> Any:
+        if self.memory.get(name, (None,))[0] == key:
+            return self.memory[name][1]
+        with open(self._path(name, key), "rb") as f:
+            output = pickle.load(f)
+        if self.keep_in_memory:
+            self.memory[name] = (key, output)
+        return output
+
+    def _save(self, name: str, key: str, output: Any) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Keep one artifact per stage so the cache does not grow without bound
+        for entry in os.listdir(self.cache_dir):
+            if entry.startswith(f"{name}-") and entry.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, entry))
+        path = self._path(name, key)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(output, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+        self._set_latest(name, key)
+        if self.keep_in_memory:
+            self.memory[name] = (key, output)
+
+    def _latest_key(self, name: str) -> str:
+        path = os.path.join(self.cache_dir, f"{name}.latest")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No cached artifact for stage '{name}'; run it first")
+        with open(path) as f:
+            key = f.read().strip()
+        if not self._has(name, key):
+            raise FileNotFoundError(f"Cached artifact for stage '{name}' is missing; run it first")
+        return key
+
+    def _set_latest(self, name: str, key: str) -> None:
+        with open(os.path.join(self.cache_dir, f"{name}.latest"), "w") as f:
+            f.write(key + "\n")
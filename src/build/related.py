@@ -0,0 +1,257 @@
+"""Related-companies index: top-k similar companies by description and facets.
+
+Each company is represented by two L2-normalized feature blocks:
+
+- a sparse TF-IDF vector over its description (CSR arrays), and
+- a one-hot vector over its sectors and stages.
+
+Similarity is the weighted sum of the two blocks' cosine similarities,
+``TEXT_WEIGHT * cos(text) + FACET_WEIGHT * cos(facets)``. Companies are
+processed in row chunks sized so the number of candidate pairs per chunk
+stays bounded:
+
+1. Text pairs come from expanding each chunk row's terms through the
+   inverted index (only pairs that share a term are ever materialized).
+2. Facet similarity only depends on a company's distinct sector/stage
+   combination ("signature"), so it is a small signature × signature matrix.
+   Companies without text overlap can only score through it, and for each
+   signature the best-scoring such companies are precomputed, which makes
+   the per-chunk top-k exact without scoring all pairs.
+
+Everything after tokenization is vectorized with NumPy.
+"""
+
+import re
+from typing import Any
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our "
+    "that the their this to we with you your".split()
+)
+
+TOP_K = 10
+TEXT_WEIGHT = 0.7
+FACET_WEIGHT = 0.3
+MIN_DF = 2  # terms in a single description cannot link two companies
+MAX_DF = 0.05  # terms in more than 5% of descriptions carry little signal but dominate cost
+PAIRS_PER_COMPANY = 200  # cap on expanded text pairs (sum of df^2), as a multiple of n
+PAIR_BUDGET = 4_000_000  # candidate text pairs materialized per chunk
+MAX_CHUNK_ROWS = 4096
+SCORE_STEPS = 1 << 20  # scores are ranked at ~1e-6 resolution
+
+
+def _tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def text_features(
+    descriptions: list[str | None],
+    min_df: int = MIN_DF,
+    max_df: float = MAX_DF,
+    pairs_per_company: int = PAIRS_PER_COMPANY,
+):
+    """Build the L2-normalized TF-IDF matrix in COO/CSR form.
+
+    Besides the min_df/max_df bounds, the most common terms are dropped until
+    the number of pairs expanded through the inverted index (sum of df^2) is
+    at most ``pairs_per_company * n``, so cost stays linear in n.
+
+    Returns (rows, cols, weights, indptr), with entries sorted by row then column.
+    """
+    n = len(descriptions)
+    vocab: dict[str, int] = {}
+    flat: list[int] = []
+    lengths = np.zeros(n, dtype=np.int64)
+    for i, text in enumerate(descriptions):
+        tokens = _tokenize(text)
+        lengths[i] = len(tokens)
+        flat.extend(vocab.setdefault(t, len(vocab)) for t in tokens)
+
+    n_terms = max(len(vocab), 1)
+    rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    keys, tf = np.unique(rows * n_terms + np.asarray(flat, dtype=np.int64), return_counts=True)
+    rows, cols = keys // n_terms, keys % n_terms
+
+    df = np.bincount(cols, minlength=n_terms)
+    ceiling = max(min_df, int(max_df * n))
+    kept_df = np.sort(df[(df >= min_df) & (df <= ceiling)])
+    over = np.flatnonzero(np.cumsum(kept_df.astype(np.float64) ** 2) > pairs_per_company * n)
+    if len(over):
+        # Drop every term at or above the first df that overflows the budget
+        ceiling = kept_df[over[0]] - 1
+    keep = (df[cols] >= min_df) & (df[cols] <= ceiling)
+    rows, cols, tf = rows[keep], cols[keep], tf[keep]
+
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = ((1 + np.log(tf)) * idf[cols]).astype(np.float32)
+    norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=n))
+    weights /= norms[rows].astype(np.float32)
+
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+    return rows, cols, weights, indptr
+
+
+def facet_signatures(companies: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Map companies to facet signatures.
+
+    Returns (signature id per company, signature × signature cosine matrix).
+    """
+    facet_ids: dict[str, int] = {}
+    sig_ids: dict[tuple, int] = {}
+    sig_of = np.empty(len(companies), dtype=np.int64)
+    for i, c in enumerate(companies):
+        facets = [f"sector:{s}" for s in c.get("sectors", [])] + [f"stage:{s}" for s in c.get("stages", [])]
+        key = tuple(sorted({facet_ids.setdefault(f, len(facet_ids)) for f in facets}))
+        sig_of[i] = sig_ids.setdefault(key, len(sig_ids))
+
+    vectors = np.zeros((len(sig_ids), max(len(facet_ids), 1)), dtype=np.float32)
+    for key, s in sig_ids.items():
+        if key:
+            vectors[s, list(key)] = 1 / np.sqrt(len(key))
+    return sig_of, vectors @ vectors.T
+
+
+def _fill_candidates(sig_of: np.ndarray, sig_sim: np.ndarray, width: int) -> np.ndarray:
+    """For each signature, the `width` companies with the highest facet similarity to it (-1 padded)."""
+    order = np.argsort(sig_of, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(sig_of, minlength=len(sig_sim)))))
+    fill = np.full((len(sig_sim), width), -1, dtype=np.int64)
+    for s in range(len(sig_sim)):
+        ranked = np.argsort(-sig_sim[s], kind="stable")
+        ranked = ranked[sig_sim[s, ranked] > 0]
+        members = []
+        count = 0
+        for g in ranked:
+            group = order[bounds[g] : bounds[g + 1]][: width - count]
+            members.append(group)
+            count += len(group)
+            if count >= width:
+                break
+        if members:
+            picked = np.concatenate(members)
+            fill[s, : len(picked)] = picked
+    return fill
+
+
+def related_companies(
+    companies: list[dict[str, Any]],
+    k: int = TOP_K,
+    pair_budget: int = PAIR_BUDGET,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the top-k related companies for every company.
+
+    Returns (neighbors, scores): n × k arrays of company ordinals (-1 where
+    fewer than k companies have any similarity) and similarity scores.
+    """
+    n = len(companies)
+    neighbors = np.full((n, k), -1, dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if n < 2:
+        return neighbors, scores
+
+    rows, cols, weights, indptr = text_features([c.get("description") for c in companies])
+    # Inverted index (CSC): postings of each term sorted by row
+    n_terms = int(cols.max()) + 1 if len(cols) else 1
+    by_term = np.argsort(cols, kind="stable")
+    post_rows, post_weights = rows[by_term], weights[by_term]
+    colptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=n_terms))))
+    df = np.diff(colptr)
+
+    sig_of, sig_sim = facet_signatures(companies)
+    fill = _fill_candidates(sig_of, sig_sim, 2 * k + 2)
+
+    # Chunk boundaries: bound the number of text pairs expanded per chunk
+    row_cost = np.bincount(rows, weights=df[cols], minlength=n) if len(cols) else np.zeros(n)
+    cum_cost = np.cumsum(row_cost)
+
+    start = 0
+    while start < n:
+        base = cum_cost[start - 1] if start else 0.0
+        stop = int(np.searchsorted(cum_cost, base + pair_budget, side="right"))
+        stop = min(max(stop, start + 1), start + MAX_CHUNK_ROWS, n)
+        _score_chunk(
+            start, stop, n, k, rows, cols, weights, indptr, post_rows, post_weights, colptr,
+            sig_of, sig_sim, fill, neighbors, scores,
+        )
+        start = stop
+    return neighbors, scores
+
+
+def _score_chunk(start, stop, n, k, rows, cols, weights, indptr, post_rows, post_weights, colptr,
+                 sig_of, sig_sim, fill, neighbors, scores) -> None:
+    size = stop - start
+
+    # 1. Text pairs sharing at least one term, expanded through the postings
+    lo, hi = indptr[start], indptr[stop]
+    q_rows, q_cols, q_w = rows[lo:hi] - start, cols[lo:hi], weights[lo:hi]
+    lengths = colptr[q_cols + 1] - colptr[q_cols]
+    total = int(lengths.sum())
+    if total:
+        which = np.repeat(np.arange(len(q_cols)), lengths)
+        pos = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(colptr[q_cols], lengths)
+        i_local, j = q_rows[which], post_rows[pos]
+        distinct = j != i_local + start
+        pair_keys = i_local[distinct] * n + j[distinct]
+        products = (q_w[which] * post_weights[pos])[distinct]
+        order = np.argsort(pair_keys)
+        pair_keys = pair_keys[order]
+        heads = np.flatnonzero(np.concatenate(([True], pair_keys[1:] != pair_keys[:-1])))
+        text_sim = np.add.reduceat(products[order], heads) if len(heads) else np.empty(0)
+        t_keys = pair_keys[heads]
+        t_i, t_j = t_keys // n, t_keys % n
+        t_score = TEXT_WEIGHT * text_sim + FACET_WEIGHT * sig_sim[sig_of[t_i + start], sig_of[t_j]]
+    else:
+        t_keys = t_i = t_j = np.empty(0, dtype=np.int64)
+        t_score = np.empty(0)
+
+    # 2. Facet-only candidates: the best facet matches for each row's signature,
+    #    minus pairs already scored above (their text score only adds to it)
+    f_j = fill[sig_of[start:stop]]
+    f_i = np.broadcast_to(np.arange(size)[:, None], f_j.shape)
+    valid = (f_j >= 0) & (f_j != f_i + start)
+    f_i, f_j = f_i[valid], f_j[valid]
+    if len(t_keys):
+        at = np.minimum(np.searchsorted(t_keys, f_i * n + f_j), len(t_keys) - 1)
+        fresh = t_keys[at] != f_i * n + f_j
+        f_i, f_j = f_i[fresh], f_j[fresh]
+    f_score = FACET_WEIGHT * sig_sim[sig_of[f_i + start], sig_of[f_j]]
+
+    # 3. Top-k per row: one integer sort on (row, descending score, ordinal)
+    c_i = np.concatenate((t_i, f_i))
+    c_j = np.concatenate((t_j, f_j))
+    c_score = np.concatenate((t_score, f_score))
+    keep = c_score > 0
+    c_i, c_j, c_score = c_i[keep], c_j[keep], c_score[keep]
+    if not len(c_i):
+        return
+
+    rank_key = SCORE_STEPS - np.rint(np.minimum(c_score, 1) * SCORE_STEPS).astype(np.int64)
+    order = np.argsort((c_i * (SCORE_STEPS + 1) + rank_key) * n + c_j)
+    c_i, c_j, c_score = c_i[order], c_j[order], c_score[order]
+    rank = np.arange(len(c_i)) - np.searchsorted(c_i, c_i, side="left")
+    top = rank < k
+    neighbors[c_i[top] + start, rank[top]] = c_j[top]
+    scores[c_i[top] + start, rank[top]] = c_score[top]
+
+
+def related_index(companies: list[dict[str, Any]], k: int = TOP_K) -> dict[str, Any]:
+    """Content of companies/related.json."""
+    neighbors, scores = related_companies(companies, k)
+    ids = [c["id"] for c in companies]
+    related = {}
+    for i, company_id in enumerate(ids):
+        related[company_id] = [
+            {"id": ids[j], "score": round(float(score), 4)}
+            for j, score in zip(neighbors[i], scores[i])
+            if j >= 0
+        ]
+    return {
+        "k": k,
+        "weights": {"description": TEXT_WEIGHT, "facets": FACET_WEIGHT},
+        "related": related,
+    }
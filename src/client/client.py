@@ -0,0 +1,303 @@
+"""Caching Python client for the static API.
+
+    client = ApiClient()                     # GitHub Pages by default
+    client.company("stripe")
+    client.by_sector("ai")
+
+`meta.json` is revalidated with a conditional request (ETag /
+Last-Modified), and every other file is cached on disk under a directory
+keyed by the build's `last_updated_iso`, so a warm start against an
+unchanged build costs one small 304 request. Individual company records are
+fetched lazily and kept in an in-memory LRU; lookups returning many records
+download all.json once instead. `base_url` may also be a local docs/
+directory, in which case files are read directly.
+"""
+
+import os
+import re
+import shutil
+from collections import OrderedDict
+from typing import Any, TypedDict
+
+from src.formats import serializer
+from src.formats.domains import DomainIndex
+from src.formats.history import HISTORY_PATH, facet_path
+from src.formats.layout import company_path, layout_of
+from src.formats.membership import BloomFilter, NameIndex
+from src.normalize.founders import founder_key, shard_of
+
+DEFAULT_BASE_URL = "https://thedarknight21.github.io/a16z-oss-api/"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "a16z-oss-api")
+USER_AGENT = "a16z-oss-api-client/1.0 (https://github.com/TheDarkNight21/a16z-oss-api)"
+# A lookup needing more records than this that are not in memory downloads all.json once instead of one file each
+BULK_THRESHOLD = 16
+
+
+class SourceUrls(TypedDict):
+    investment_list: str
+    portfolio: str | None
+
+
+class SourceEvidence(TypedDict):
+    in_investment_list: bool
+    in_portfolio: bool
+
+
+class Company(TypedDict):
+    id: str
+    a16z_company_id: str | None
+    name: str
+    slug: str
+    description: str | None
+    website: str | None
+    logo_url: str | None
+    logo_path: str | None
+    status: str | None
+    sectors: list[str]
+    stages: list[str]
+    founders: list[str]
+    source_urls: SourceUrls
+    source_evidence: SourceEvidence
+    first_seen_iso: str
+    last_seen_iso: str
+
+
+def slug_from_id(company_id: str) -> str:
+    return company_id.split(":", 1)[1] if ":" in company_id else company_id
+
+
+class ApiClient:
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        lru_size: int = 256,
+        timeout: float = 30,
+    ):
+        self.local_dir = None if re.match(r"^https?://", base_url) else base_url
+        self.base_url = base_url if self.local_dir else base_url.rstrip("/") + "/"
+        self.cache_dir = cache_dir
+        self.lru_size = lru_size
+        self.timeout = timeout
+        self._session = None
+        self._meta: dict[str, Any] | None = None
+        self._all: list[Company] | None = None
+        self._by_slug: dict[str, Company] | None = None
+        self._lru: OrderedDict[str, Company | None] = OrderedDict()
+        self._names: NameIndex | None = None
+        self._domains: DomainIndex | None = None
+
+    # --- Transport ---
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+            self._session.headers.update({"User-Agent": USER_AGENT})
+        return self._session
+
+    def _build_dir(self) -> str:
+        key = re.sub(r"[^0-9A-Za-z]+", "", self.meta()["last_updated_iso"])
+        return os.path.join(self.cache_dir, "builds", key)
+
+    def _get(self, path: str) -> bytes | None:
+        """Return the bytes of a build file, or None if it does not exist."""
+        if self.local_dir:
+            try:
+                with open(os.path.join(self.local_dir, path), "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+
+        cached = os.path.join(self._build_dir(), path)
+        if os.path.exists(cached):
+            with open(cached, "rb") as f:
+                return f.read()
+
+        response = self.session.get(self.base_url + path, timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        _write_atomic(cached, response.content)
+        return response.content
+
+    def _get_json(self, path: str) -> Any:
+        body = self._get(path)
+        return None if body is None else serializer.loads(body)
+
+    # --- Build metadata ---
+
+    def meta(self, refresh: bool = False) -> dict[str, Any]:
+        """Return meta.json, revalidating it at most once per client unless refresh=True."""
+        if self._meta is not None and not refresh:
+            return self._meta
+
+        if self.local_dir:
+            with open(os.path.join(self.local_dir, "meta.json"), "rb") as f:
+                self._meta = serializer.loads(f.read())
+            return self._meta
+
+        meta_path = os.path.join(self.cache_dir, "meta.json")
+        validators_path = os.path.join(self.cache_dir, "meta.validators.json")
+        headers = {}
+        if os.path.exists(meta_path) and os.path.exists(validators_path):
+            validators = serializer.load(validators_path)
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            response = self.session.get(self.base_url + "meta.json", headers=headers, timeout=self.timeout)
+        except Exception:
+            if not os.path.exists(meta_path):
+                raise
+            response = None  # offline: fall back to the cached build
+
+        if response is not None and response.status_code != 304:
+            response.raise_for_status()
+            _write_atomic(meta_path, response.content)
+            _write_atomic(
+                validators_path,
+                serializer.dumps(
+                    {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                ),
+            )
+
+        with open(meta_path, "rb") as f:
+            meta = serializer.loads(f.read())
+        if self._meta is not None and meta.get("last_updated_iso") != self._meta.get("last_updated_iso"):
+            self._all = self._by_slug = self._names = self._domains = None
+            self._lru.clear()
+        self._meta = meta
+        self._prune_builds()
+        return meta
+
+    def _prune_builds(self) -> None:
+        """Drop cached files from builds other than the current one."""
+        builds = os.path.join(self.cache_dir, "builds")
+        if not os.path.isdir(builds):
+            return
+        current = os.path.basename(self._build_dir())
+        for entry in os.listdir(builds):
+            if entry != current:
+                shutil.rmtree(os.path.join(builds, entry), ignore_errors=True)
+
+    def history(self, facet: str | None = None) -> dict[str, Any] | None:
+        """The per-build time series of stats/history.json, or of one facet ("statuses", "sectors", "stages")."""
+        return self._get_json(HISTORY_PATH if facet is None else facet_path(facet))
+
+    # --- Lookups ---
+
+    def companies(self) -> list[Company]:
+        """All company records (downloads all.json once per build)."""
+        if self._all is None:
+            self._all = self._get_json("companies/all.json") or []
+            self._by_slug = {c["slug"]: c for c in self._all}
+        return self._all
+
+    def company(self, slug: str) -> Company | None:
+        """Look up one company by slug, fetching only its own record if needed."""
+        if self._by_slug is not None:
+            return self._by_slug.get(slug)
+        if slug in self._lru:
+            self._lru.move_to_end(slug)
+            return self._lru[slug]
+        record = self._get_json(company_path(slug, layout_of(self.meta())))
+        self._lru[slug] = record
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+        return record
+
+    def by_id(self, company_id: str) -> Company | None:
+        return self.company(slug_from_id(company_id))
+
+    def by_ids(self, company_ids: list[str]) -> list[Company]:
+        """The records of several companies in order, skipping unknown ids.
+
+        A few are fetched one by one; past BULK_THRESHOLD records not yet in
+        memory, all.json is downloaded once and answers the rest.
+        """
+        slugs = [slug_from_id(cid) for cid in company_ids]
+        if self._by_slug is None and sum(1 for slug in slugs if slug not in self._lru) > BULK_THRESHOLD:
+            self.companies()
+        return [c for c in map(self.company, slugs) if c is not None]
+
+    def logo(self, slug: str) -> bytes | None:
+        """The mirrored logo image of a company, if one was mirrored."""
+        company = self.company(slug)
+        if company is None or not company.get("logo_path"):
+            return None
+        return self._get(company["logo_path"])
+
+    def find(self, name: str) -> list[str]:
+        """Slugs of the companies going by a name, slug or website domain.
+
+        Misses are answered from the few-KB names.bloom alone; aliases.json
+        is fetched only to confirm the first hit.
+        """
+        if self._names is None:
+            bloom = self._get("companies/names.bloom")
+            if bloom is None:
+                return []
+            self._names = NameIndex(BloomFilter.from_bytes(bloom))
+        if not self._names.might_contain(name):
+            return []
+        if self._names.aliases is None:
+            aliases = self._get_json("companies/aliases.json")
+            if aliases is None:
+                return []
+            self._names = NameIndex(self._names.bloom, aliases)
+        return self._names.lookup(name)
+
+    def by_domain(self, domain_or_url: str) -> list[Company]:
+        """Companies whose website is on the same registrable domain as a domain or URL."""
+        if self._domains is None:
+            data = self._get_json("companies/domains.json")
+            if data is None:
+                return []
+            self._domains = DomainIndex(data)
+        return self.by_ids(self._domains.lookup(domain_or_url))
+
+    def by_founder(self, name: str) -> list[Company]:
+        """Companies founded by a person, read from the one founders/{prefix}.json shard for the name."""
+        key = founder_key(name)
+        shard = self._get_json(f"founders/{shard_of(key)}.json") if key else None
+        entry = shard["founders"].get(key) if shard else None
+        if entry is None:
+            return []
+        return self.by_ids(entry["companies"])
+
+    def sorted_page(self, key: str, page: int = 1) -> list[Company]:
+        """One page of companies in a precomputed order ("name", "first_seen", "status", "sector_count")."""
+        data = self._get_json(f"sorts/{key}/{page}.json")
+        if data is None:
+            return []
+        return self.by_ids(data["companies"])
+
+    def _facet(self, kind: str, value: str) -> list[Company]:
+        index = self._get_json(f"{kind}/{value}.json")
+        if index is None:
+            return []
+        return self.by_ids(index["companies"])
+
+    def by_sector(self, sector: str) -> list[Company]:
+        return self._facet("sectors", sector)
+
+    def by_stage(self, stage: str) -> list[Company]:
+        return self._facet("stages", stage)
+
+    def by_status(self, status: str) -> list[Company]:
+        return self._facet("statuses", status)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
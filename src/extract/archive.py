@@ -0,0 +1,84 @@
+"""Record/replay archive of raw source pages.
+
+Recording stores every page fetched by the extractors in a gzip-compressed
+JSON file named after the UTC date of the run (``archive/2026-02-11.json.gz``).
+Replaying serves pages from such a file with no network access and no request
+delay, and pins the build clock to the time the archive was recorded so a
+replayed build is byte-for-byte reproducible.
+"""
+
+import glob
+import gzip
+import json
+import os
+
+from src.normalize.clock import Clock, fixed_clock, now_iso
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "archive")
+FORMAT_VERSION = 1
+
+
+class SourceArchive:
+    def __init__(self, path: str, replaying: bool, recorded_iso: str, pages: dict[str, str] | None = None):
+        self.path = path
+        self.replaying = replaying
+        self.recorded_iso = recorded_iso
+        self.pages: dict[str, str] = pages or {}
+
+    @classmethod
+    def record(cls, archive_dir: str = ARCHIVE_DIR, clock: Clock | None = None) -> "SourceArchive":
+        """Start a new archive for today's date in archive_dir."""
+        recorded_iso = now_iso(clock)
+        path = os.path.join(archive_dir, f"{recorded_iso[:10]}.json.gz")
+        return cls(path, replaying=False, recorded_iso=recorded_iso)
+
+    @classmethod
+    def replay(cls, path: str | None = None) -> "SourceArchive":
+        """Open an archive for replay. Defaults to the most recent one in ARCHIVE_DIR."""
+        if path is None:
+            path = latest_archive()
+            if path is None:
+                raise FileNotFoundError(f"No archives found in {ARCHIVE_DIR}")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported archive format: {data.get('format_version')}")
+        return cls(path, replaying=True, recorded_iso=data["recorded_iso"], pages=data["pages"])
+
+    @property
+    def clock(self) -> Clock | None:
+        """Fixed clock at the recording time when replaying, else None (system clock)."""
+        return fixed_clock(self.recorded_iso) if self.replaying else None
+
+    def get(self, url: str) -> str:
+        if url not in self.pages:
+            raise KeyError(f"{url} not in archive {self.path}")
+        return self.pages[url]
+
+    def put(self, url: str, text: str) -> None:
+        """Record a fetched page and flush the archive to disk."""
+        self.pages[url] = text
+        self.save()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        # mtime=0 keeps the gzip header stable across re-recordings
+        with open(tmp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            gz.write(
+                json.dumps(
+                    {
+                        "format_version": FORMAT_VERSION,
+                        "recorded_iso": self.recorded_iso,
+                        "pages": self.pages,
+                    },
+                    ensure_ascii=False,
+                ).encode("utf-8")
+            )
+        os.replace(tmp_path, self.path)
+
+
+def latest_archive(archive_dir: str = ARCHIVE_DIR) -> str | None:
+    """Return the path of the newest dated archive, or None."""
+    paths = sorted(glob.glob(os.path.join(archive_dir, "*.json.gz")))
+    return paths[-1] if paths else None
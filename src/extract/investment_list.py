@@ -2,10 +2,16 @@
 
 import random
 import time
+from collections import Counter, deque
+from html.entities import html5
+from html.parser import HTMLParser
+from itertools import chain
+from typing import Iterable, Iterator
 
 import requests
-from bs4 import BeautifulSoup
 
+from src.extract.archive import SourceArchive
+from src.normalize.clock import Clock, now_iso
 from src.normalize.slugify import slugify, make_id
 
 INVESTMENT_LIST_URL = "https://a16z.com/investment-list/"
@@ -13,17 +19,230 @@ REQUEST_DELAY_MIN = 0.8
 REQUEST_DELAY_MAX = 1.5
 USER_AGENT = "a16z-oss-api/1.0 (https://github.com/a16z-oss/api)"
 
+# Elements BeautifulSoup closes as soon as they open; a later end tag for one is absorbed
+VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta", "param",
+        "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer",
+    }
+)
+# Elements whose text BeautifulSoup keeps out of get_text()
+STRING_CONTAINERS = frozenset({"script", "style", "template", "rt", "rp"})
+# Named references BeautifulSoup resolves: the HTML5 names, with or without their semicolon
+ENTITIES: dict[str, str] = {}
+for _name, _character in sorted(html5.items()):
+    ENTITIES.setdefault(_name.removesuffix(";"), _character)
+
+
+def _numeric_reference(name: str) -> str:
+    """The character for ``&#name;``, resolved the way BeautifulSoup resolves it."""
+    number = int(name[1:], 16) if name[:1] in "xX" else int(name)
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return "\ufffd"
+    if 0x80 <= number <= 0x9F:
+        try:
+            return bytes([number]).decode("cp1252")
+        except UnicodeDecodeError:
+            pass
+    return chr(number)
+
+
+class _Text:
+    """The text of one <li> or <h6>: stripped strings from `start` on, joined once the element closes."""
+
+    __slots__ = ("start", "text", "group")
+
+    def __init__(self, start: int, group: "_Text | None" = None):
+        self.start = start
+        self.text: str | None = None
+        self.group = group  # for an <li>, the <h6> naming its letter group
+
+
+class _RosterParser(HTMLParser):
+    """Event-driven scan for the <li> names under `div.list-row ul.list`.
+
+    Gives the same (name, letter_group) pairs as selecting
+    ``div.list-row ul.list`` with BeautifulSoup's html.parser tree and
+    taking each <li>'s ``get_text(strip=True)`` with the text of the
+    list's preceding sibling <h6>, else the <h6> opened last before it.
+    It follows that tree's rules (end tags close up to the nearest open
+    element of their name and nothing closes implicitly, so <li>s nest;
+    void elements close at once; script, style, template, rt and rp text
+    and comments are left out) in a single pass, without building the
+    tree. Pairs accumulate in `found` in <li> order as the HTML is fed in,
+    each once its <li> and heading have closed; an <li> under nested
+    lists appears once, with the outermost list's heading.
+    """
 
-class InvestmentListExtractor:
     def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.found: list[tuple[str, str | None]] = []
+        # Open elements, the document first, with what closing each one settles: a _Text, or its kind below
+        self._stack: list[str] = ["[document]"]
+        self._marks: list[object] = [None]
+        self._child_h6: list[_Text | None] = [None]  # the last <h6> child of each open element
+        self._open = Counter()  # open elements per tag, so stray end tags are dismissed without scanning the stack
+        self._closed_void = Counter()  # void elements whose end tag is still to be absorbed
+        self._list_rows = 0  # open div.list-row
+        self._lists = 0  # open ul.list inside a list-row
+        self._containers = 0  # open elements whose text is left out
+        self._data: list[str] = []  # pieces of the current string
+        self._strings: list[str] = []  # stripped strings since the first open <li> or <h6>
+        self._capturing = 0
+        self._latest_h6: _Text | None = None
+        self._list_group: _Text | None = None
+        self._pending: deque[_Text] = deque()  # <li>s in order, until each and its heading are complete
+
+    def handle_starttag(self, tag, attrs, void=True):
+        self._end_data()
+        classes = next((value.split() for key, value in reversed(attrs) if key == "class"), None) or ()
+        mark: object = None
+        if tag == "div" and "list-row" in classes:
+            self._list_rows += 1
+            mark = "list-row"
+        elif tag == "ul" and "list" in classes and self._list_rows:
+            if not self._lists:
+                self._list_group = self._child_h6[-1] or self._latest_h6
+            self._lists += 1
+            mark = "list"
+        elif tag == "li" and self._lists:
+            mark = _Text(len(self._strings), self._list_group)
+            self._pending.append(mark)
+            self._capturing += 1
+        elif tag == "h6":
+            mark = self._child_h6[-1] = self._latest_h6 = _Text(len(self._strings))
+            self._capturing += 1
+        elif tag in STRING_CONTAINERS:
+            self._containers += 1
+            mark = "container"
+        self._stack.append(tag)
+        self._marks.append(mark)
+        self._child_h6.append(None)
+        self._open[tag] += 1
+        if void and tag in VOID_TAGS:
+            self._pop_to(tag)
+            self._closed_void[tag] += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, void=False)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if self._closed_void[tag]:
+            self._closed_void[tag] -= 1
+            return
+        self._end_data()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        # A string can arrive in several pieces, e.g. when the HTML is fed in chunks
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        self._data.append(_numeric_reference(name))
+
+    def handle_entityref(self, name):
+        self._data.append(ENTITIES.get(name, "&" + name))
+
+    def handle_comment(self, data):
+        self._end_data()
+        self._data = []
+
+    handle_decl = handle_pi = handle_comment
+
+    def unknown_decl(self, data):
+        self._end_data()
+        if data.upper().startswith("CDATA["):
+            self._data = [data[len("CDATA[") :]]
+            self._end_data(cdata=True)
+        else:
+            self._data = []
+
+    def close(self):
+        super().close()
+        self._end_data()
+        while len(self._stack) > 1:
+            self._pop()
+
+    def _end_data(self, cdata: bool = False) -> None:
+        if not self._data:
+            return
+        text = "".join(self._data).strip()
+        self._data = []
+        if text and self._capturing and (cdata or not self._containers):
+            self._strings.append(text)
+
+    def _pop_to(self, tag: str) -> None:
+        if not self._open[tag]:
+            return  # stray end tag
+        while self._pop() != tag:
+            pass
+
+    def _pop(self) -> str:
+        tag, mark = self._stack.pop(), self._marks.pop()
+        self._child_h6.pop()
+        self._open[tag] -= 1
+        if isinstance(mark, _Text):
+            mark.text = "".join(self._strings[mark.start :])
+            self._capturing -= 1
+            if not self._capturing:
+                self._strings = []
+            self._emit()
+        elif mark == "list":
+            self._lists -= 1
+        elif mark == "list-row":
+            self._list_rows -= 1
+        elif mark == "container":
+            self._containers -= 1
+        return tag
+
+    def _emit(self) -> None:
+        pending = self._pending
+        while pending and pending[0].text is not None:
+            group = pending[0].group
+            if group is not None and group.text is None:
+                break  # the heading is an open ancestor of the list
+            li = pending.popleft()
+            self.found.append((li.text, group.text if group is not None else None))
+
+
+class InvestmentListExtractor:
+    def __init__(self, archive: SourceArchive | None = None, clock: Clock | None = None):
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
+        self.archive = archive
+        # Conditional request headers (If-None-Match/If-Modified-Since) per URL from its last response
+        self.validators: dict[str, dict[str, str]] = {}
+        self.clock = clock or (archive.clock if archive is not None else None)
 
     def fetch_page(self, url: str) -> str:
+        if self.archive is not None and self.archive.replaying:
+            return self.archive.get(url)
         delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
         time.sleep(delay)
         response = self.session.get(url, timeout=30)
         response.raise_for_status()
+        if self.archive is not None:
+            self.archive.put(url, response.text)
+        return response.text
+
+    def fetch_page_if_changed(self, url: str) -> str | None:
+        """Fetch a page with a conditional request; None if the server reports it unchanged."""
+        if self.archive is not None and self.archive.replaying:
+            return self.archive.get(url)
+        delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
+        time.sleep(delay)
+        response = self.session.get(url, headers=self.validators.get(url, {}), timeout=30)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self.validators[url] = {
+            header: response.headers[source]
+            for header, source in (("If-None-Match", "ETag"), ("If-Modified-Since", "Last-Modified"))
+            if source in response.headers
+        }
+        if self.archive is not None:
+            self.archive.put(url, response.text)
         return response.text
 
     def extract_companies(self, html: str) -> list[dict]:
@@ -39,22 +258,21 @@ class InvestmentListExtractor:
                             <li>CompanyName</li>
                             ...
         """
-        soup = BeautifulSoup(html, "html.parser")
-        now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return list(self.iter_companies([html]))
 
-        companies = []
+    def iter_companies(self, chunks: Iterable[str]) -> Iterator[dict]:
+        """Yield raw company dicts as the HTML arrives, one chunk at a time."""
+        parser = _RosterParser()
+        seen_iso = now_iso(self.clock)
         seen_slugs: set[str] = set()
 
-        # Find all <ul class="list"> inside list-row sections
-        for ul in soup.select("div.list-row ul.list"):
-            # Determine the letter group from the preceding <h6>
-            letter_group = None
-            prev = ul.find_previous_sibling("h6") or ul.find_previous("h6")
-            if prev:
-                letter_group = prev.get_text(strip=True)
-
-            for li in ul.find_all("li"):
-                name = li.get_text(strip=True)
+        for chunk in chain(chunks, [None]):
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            found, parser.found = parser.found, []
+            for name, letter_group in found:
                 if not name:
                     continue
 
@@ -67,26 +285,22 @@ class InvestmentListExtractor:
                     continue
                 seen_slugs.add(slug)
 
-                companies.append(
-                    {
-                        "name": name,
-                        "slug": slug,
-                        "id": make_id(slug),
-                        "letter_group": letter_group,
-                        "source_urls": {
-                            "investment_list": INVESTMENT_LIST_URL,
-                            "portfolio": None,
-                        },
-                        "source_evidence": {
-                            "in_investment_list": True,
-                            "in_portfolio": False,
-                        },
-                        "first_seen_iso": now_iso,
-                        "last_seen_iso": now_iso,
-                    }
-                )
-
-        return companies
+                yield {
+                    "name": name,
+                    "slug": slug,
+                    "id": make_id(slug),
+                    "letter_group": letter_group,
+                    "source_urls": {
+                        "investment_list": INVESTMENT_LIST_URL,
+                        "portfolio": None,
+                    },
+                    "source_evidence": {
+                        "in_investment_list": True,
+                        "in_portfolio": False,
+                    },
+                    "first_seen_iso": seen_iso,
+                    "last_seen_iso": seen_iso,
+                }
 
     def get_companies(self, max_companies: int | None = None) -> list[dict]:
         """Fetch and parse the investment list. Returns raw company dicts."""
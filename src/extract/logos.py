@@ -0,0 +1,131 @@
+"""Logo mirror - downloads portfolio logos into docs/logos/.
+
+Logos are stored under content-hash filenames (`logos/{sha256[:16]}.{ext}`),
+so a record's `logo_path` only changes when the image itself does, and
+identical images share one file. `logos/manifest.json` maps each source URL
+to its local path; URLs already in the manifest (with the file still on
+disk) are never fetched again. New URLs are downloaded concurrently through
+one pooled session, with at most `max_workers` requests in flight, and a
+download is abandoned as soon as it grows past `MAX_LOGO_BYTES`.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.extract.portfolio import USER_AGENT
+from src.formats import serializer
+
+LOGO_DIR = "logos"
+MANIFEST_NAME = "manifest.json"
+MAX_WORKERS = 8
+MAX_LOGO_BYTES = 2_000_000
+CHUNK_SIZE = 64 * 1024
+
+# Content types we mirror, by file extension
+EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/svg+xml": "svg",
+}
+
+
+def _url_extension(url: str) -> str | None:
+    ext = os.path.splitext(urlsplit(url).path)[1].lower().lstrip(".")
+    ext = "jpg" if ext == "jpeg" else ext
+    return ext if ext in EXTENSIONS.values() else None
+
+
+class LogoMirror:
+    def __init__(self, output_dir: str, max_workers: int = MAX_WORKERS, timeout: float = 15):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, LOGO_DIR, MANIFEST_NAME)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.manifest = self._load_manifest()
+        self.stats = {"cached": 0, "fetched": 0, "failed": 0}
+
+    def _load_manifest(self) -> dict[str, str]:
+        try:
+            logos = serializer.load(self.manifest_path).get("logos", {})
+        except FileNotFoundError:
+            return {}
+        # Only trust entries whose file is still on disk
+        return {url: path for url, path in logos.items() if os.path.exists(os.path.join(self.output_dir, path))}
+
+    def _save_manifest(self) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        serializer.write(self.manifest_path + ".tmp", {"logos": dict(sorted(self.manifest.items()))})
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+    def _session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": USER_AGENT})
+        return session
+
+    def _fetch(self, session: requests.Session, url: str) -> str | None:
+        """Download one logo and return its path relative to the output dir, or None on failure."""
+        try:
+            with session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                ext = EXTENSIONS.get(content_type) or _url_extension(url)
+                if ext is None or int(response.headers.get("Content-Length") or 0) > MAX_LOGO_BYTES:
+                    return None
+                body = bytearray()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > MAX_LOGO_BYTES:
+                        return None
+        except (requests.RequestException, ValueError):
+            return None
+        if not body:
+            return None
+
+        rel = f"{LOGO_DIR}/{hashlib.sha256(body).hexdigest()[:16]}.{ext}"
+        path = os.path.join(self.output_dir, rel)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Unique temp name: two URLs can resolve to the same image concurrently
+            tmp = f"{path}.{os.getpid()}.{id(response)}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        return rel
+
+    def mirror(self, urls: Iterable[str | None], fetch: bool = True) -> dict[str, str]:
+        """Return {logo_url: logo_path} for the given URLs.
+
+        With fetch=False nothing is downloaded and only already-mirrored
+        logos are resolved.
+        """
+        wanted = sorted({url for url in urls if url})
+        missing = [url for url in wanted if url not in self.manifest]
+        self.stats["cached"] = len(wanted) - len(missing)
+
+        if fetch and missing:
+            session = self._session()
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    paths = pool.map(lambda url: self._fetch(session, url), missing)
+                    for url, rel in zip(missing, paths):
+                        if rel is None:
+                            self.stats["failed"] += 1
+                        else:
+                            self.manifest[url] = rel
+                            self.stats["fetched"] += 1
+            finally:
+                session.close()
+            self._save_manifest()
+
+        return {url: self.manifest[url] for url in wanted if url in self.manifest}
@@ -5,7 +5,6 @@ The portfolio page embeds all company data as HTML-entity-encoded JSON in a
 and normalizes that data.
 """
 
-import json
 import random
 import re
 import time
@@ -14,12 +13,17 @@ from typing import Any
 
 import requests
 
+from src.extract.archive import SourceArchive
+from src.formats import serializer
+from src.normalize.founders import split_founders
 from src.normalize.slugify import slugify
 
 PORTFOLIO_URL = "https://a16z.com/portfolio/"
 USER_AGENT = "a16z-oss-api/1.0 (https://github.com/a16z-oss/api)"
 REQUEST_DELAY_MIN = 0.8
 REQUEST_DELAY_MAX = 1.5
+# The data blob nests a few levels deep; anything deeper is rejected before it is parsed
+MAX_DATA_DEPTH = 64
 
 # Map raw stage labels to our controlled vocabulary
 STAGE_MAP = {
@@ -56,15 +60,41 @@ def _split_semicolons(value: str) -> list[str]:
 
 
 class PortfolioExtractor:
-    def __init__(self):
+    def __init__(self, archive: SourceArchive | None = None):
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
+        self.archive = archive
+        # Conditional request headers (If-None-Match/If-Modified-Since) per URL from its last response
+        self.validators: dict[str, dict[str, str]] = {}
 
     def fetch_page(self, url: str) -> str:
+        if self.archive is not None and self.archive.replaying:
+            return self.archive.get(url)
         delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
         time.sleep(delay)
         response = self.session.get(url, timeout=30)
         response.raise_for_status()
+        if self.archive is not None:
+            self.archive.put(url, response.text)
+        return response.text
+
+    def fetch_page_if_changed(self, url: str) -> str | None:
+        """Fetch a page with a conditional request; None if the server reports it unchanged."""
+        if self.archive is not None and self.archive.replaying:
+            return self.archive.get(url)
+        delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
+        time.sleep(delay)
+        response = self.session.get(url, headers=self.validators.get(url, {}), timeout=30)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self.validators[url] = {
+            header: response.headers[source]
+            for header, source in (("If-None-Match", "ETag"), ("If-Modified-Since", "Last-Modified"))
+            if source in response.headers
+        }
+        if self.archive is not None:
+            self.archive.put(url, response.text)
         return response.text
 
     def extract_data(self, html: str) -> dict[str, Any]:
@@ -78,7 +108,7 @@ class PortfolioExtractor:
 
         raw = match.group(1)
         decoded = unescape(raw)
-        return json.loads(decoded)
+        return serializer.loads(decoded, max_depth=MAX_DATA_DEPTH)
 
     def normalize_company(self, raw: dict[str, Any]) -> dict[str, Any]:
         """Normalize a single raw portfolio company into enrichment data.
@@ -126,7 +156,7 @@ class PortfolioExtractor:
             "sectors_raw": sectors_raw,
             "stages": stages,
             "logo_url": (raw.get("logo") or "").strip() or None,
-            "founders": (raw.get("founders_list") or "").strip() or None,
+            "founders": split_founders(raw.get("founders_list")),
             "source_urls": {
                 "portfolio": PORTFOLIO_URL,
             },
@@ -140,7 +170,10 @@ class PortfolioExtractor:
         """
         html = self.fetch_page(PORTFOLIO_URL)
         data = self.extract_data(html)
+        return self.parse_companies(data)
 
+    def parse_companies(self, data: dict[str, Any]) -> tuple[list[dict], dict]:
+        """Normalize the companies and taxonomy out of an extracted data blob."""
         companies = []
         for raw in data.get("companies", []):
             normalized = self.normalize_company(raw)
@@ -0,0 +1,217 @@
+"""Columnar, dictionary-encoded export of company records (companies/columns.json).
+
+Records are stored struct-of-arrays: one column per (flattened) field, e.g.
+``source_urls.portfolio``. Column encodings:
+
+- ``plain``: a JSON array of values.
+- ``dictionary``: distinct values in ``dictionary`` and one small integer
+  code per row in ``codes``. Used for low-cardinality strings.
+- ``dictionary-list``: list-valued fields (sectors, stages) as a dictionary
+  plus CSR arrays: row i's codes are ``codes[offsets[i]:offsets[i + 1]]``.
+- ``bitmap``: booleans packed LSB-first into base64-encoded bytes.
+- ``derived``: ``prefix + <other column>`` (e.g. ``id`` = "a16z:" + slug).
+
+Nullable columns carry a ``validity`` bitmap; their ``values``/``codes``
+arrays then hold only the non-null entries. `ColumnarReader` decodes
+columns on first access and rehydrates individual rows on demand.
+"""
+
+import base64
+from itertools import accumulate
+from typing import Any
+
+from src.formats import serializer
+
+FORMAT = "a16z-columns"
+VERSION = 1
+
+# Scalar string columns are dictionary-encoded when this many rows share each value on average
+DICTIONARY_MIN_REPEAT = 4
+
+
+def _pack_bits(bits: list[bool]) -> str:
+    packed = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            packed[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(packed)).decode("ascii")
+
+
+def _unpack_bits(encoded: str, count: int) -> list[bool]:
+    packed = base64.b64decode(encoded)
+    return [bool(packed[i >> 3] & (1 << (i & 7))) for i in range(count)]
+
+
+def flatten(company: dict[str, Any]) -> dict[str, Any]:
+    """One level of nesting flattened into dotted keys (``source_urls.portfolio``)."""
+    flat = {}
+    for key, value in company.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                flat[f"{key}.{sub_key}"] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def _dictionary(values: list) -> tuple[list, list[int]]:
+    codes_by_value: dict = {}
+    codes = []
+    for value in values:
+        if value not in codes_by_value:
+            codes_by_value[value] = len(codes_by_value)
+        codes.append(codes_by_value[value])
+    return list(codes_by_value), codes
+
+
+def _encode_column(name: str, values: list, flat_rows: list[dict]) -> dict[str, Any]:
+    non_null = [v for v in values if v is not None]
+
+    if non_null and all(isinstance(v, bool) for v in non_null) and len(non_null) == len(values):
+        return {"encoding": "bitmap", "bits": _pack_bits(values)}
+
+    if non_null and all(isinstance(v, list) for v in non_null):
+        dictionary, codes = _dictionary([item for v in values for item in (v or [])])
+        return {
+            "encoding": "dictionary-list",
+            "dictionary": dictionary,
+            "offsets": [0, *accumulate(len(v or []) for v in values)],
+            "codes": codes,
+        }
+
+    if name == "id" and non_null and "slug" in flat_rows[0]:
+        prefix = "a16z:"
+        if all(row.get("id") == prefix + row.get("slug", "") for row in flat_rows):
+            return {"encoding": "derived", "from": "slug", "prefix": prefix}
+
+    column: dict[str, Any]
+    if non_null and len(set(non_null)) * DICTIONARY_MIN_REPEAT <= len(non_null):
+        dictionary, codes = _dictionary(non_null)
+        column = {"encoding": "dictionary", "dictionary": dictionary, "codes": codes}
+    else:
+        column = {"encoding": "plain", "values": non_null}
+    if len(non_null) != len(values):
+        column["validity"] = _pack_bits([v is not None for v in values])
+    return column
+
+
+def encode_columns(companies: list[dict[str, Any]]) -> dict[str, Any]:
+    """Encode a list of company records into the columns.json structure."""
+    flat_rows = [flatten(c) for c in companies]
+    fields = list(flat_rows[0]) if flat_rows else []
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "count": len(flat_rows),
+        "fields": fields,
+        "columns": {
+            name: _encode_column(name, [row.get(name) for row in flat_rows], flat_rows)
+            for name in fields
+        },
+    }
+
+
+class ColumnarReader:
+    """Lazy decoder for columns.json content.
+
+    `column(name)` decodes (and caches) a whole column; `row(i)` rebuilds a
+    single record from the encoded arrays without decoding whole columns.
+    """
+
+    def __init__(self, data: dict[str, Any]):
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            raise ValueError(f"Not a {FORMAT} v{VERSION} file")
+        self.count: int = data["count"]
+        self.fields: list[str] = data["fields"]
+        self._columns: dict[str, dict] = data["columns"]
+        self._decoded: dict[str, list] = {}
+        self._ranks: dict[str, list[int]] = {}
+        self._bytes: dict[str, bytes] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "ColumnarReader":
+        return cls(serializer.load(path))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, name: str) -> list:
+        """Decode a whole column into a list of Python values."""
+        if name not in self._decoded:
+            self._decoded[name] = self._decode_column(name)
+        return self._decoded[name]
+
+    def row(self, i: int) -> dict[str, Any]:
+        """Rehydrate record i with the original nesting and key order."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        record: dict[str, Any] = {}
+        for name in self.fields:
+            value = self.column(name)[i] if name in self._decoded else self._value(name, i)
+            if "." in name:
+                parent, child = name.split(".", 1)
+                record.setdefault(parent, {})[child] = value
+            else:
+                record[name] = value
+        return record
+
+    def rows(self):
+        for i in range(self.count):
+            yield self.row(i)
+
+    def _bits(self, name: str, key: str) -> bytes:
+        cache_key = f"{name}:{key}"
+        if cache_key not in self._bytes:
+            self._bytes[cache_key] = base64.b64decode(self._columns[name][key])
+        return self._bytes[cache_key]
+
+    def _dense_index(self, name: str, i: int) -> int | None:
+        """Position of row i in a nullable column's values, or None if the row is null."""
+        if "validity" not in self._columns[name]:
+            return i
+        validity = self._bits(name, "validity")
+        if not validity[i >> 3] & (1 << (i & 7)):
+            return None
+        if name not in self._ranks:
+            # Number of valid rows before each byte boundary
+            self._ranks[name] = [0, *accumulate(bin(b).count("1") for b in validity)]
+        below = validity[i >> 3] & ((1 << (i & 7)) - 1)
+        return self._ranks[name][i >> 3] + bin(below).count("1")
+
+    def _value(self, name: str, i: int) -> Any:
+        col = self._columns[name]
+        encoding = col["encoding"]
+        if encoding == "bitmap":
+            return bool(self._bits(name, "bits")[i >> 3] & (1 << (i & 7)))
+        if encoding == "dictionary-list":
+            dictionary = col["dictionary"]
+            return [dictionary[c] for c in col["codes"][col["offsets"][i] : col["offsets"][i + 1]]]
+        if encoding == "derived":
+            return col["prefix"] + self._value(col["from"], i)
+        j = self._dense_index(name, i)
+        if j is None:
+            return None
+        if encoding == "dictionary":
+            return col["dictionary"][col["codes"][j]]
+        return col["values"][j]
+
+    def _decode_column(self, name: str) -> list:
+        col = self._columns[name]
+        encoding = col["encoding"]
+        if encoding == "bitmap":
+            return _unpack_bits(col["bits"], self.count)
+        if encoding == "dictionary-list":
+            dictionary, offsets, codes = col["dictionary"], col["offsets"], col["codes"]
+            return [[dictionary[c] for c in codes[offsets[i] : offsets[i + 1]]] for i in range(self.count)]
+        if encoding == "derived":
+            return [col["prefix"] + v for v in self.column(col["from"])]
+
+        if encoding == "dictionary":
+            dictionary = col["dictionary"]
+            dense = [dictionary[c] for c in col["codes"]]
+        else:
+            dense = col["values"]
+        if "validity" not in col:
+            return list(dense)
+        it = iter(dense)
+        return [next(it) if valid else None for valid in _unpack_bits(col["validity"], self.count)]
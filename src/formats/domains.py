@@ -0,0 +1,107 @@
+"""Reverse index from website domain to company ids.
+
+The build keys every company's `website` by its registrable domain
+(`src.normalize.names.registrable_domain`: "https://shop.mayvenn.com/" is
+``mayvenn.com``) and writes:
+
+- companies/domains.json — the domains sorted, each with the id of the
+  company it belongs to (a domain shared by several companies repeats),
+  and the shard layout;
+- companies/domains/{prefix}.json — the same entries split by the first
+  `prefix_length` hex digits of the domain's BLAKE2b hash, so a client
+  looking up a few domains in a large index fetches only their shards.
+
+`DomainIndex` loads either into a dict, so resolving a domain or URL is one
+normalization and one dictionary lookup.
+"""
+
+import hashlib
+from typing import Any, Iterable
+
+from src.formats import serializer
+from src.normalize.names import registrable_domain
+
+FORMAT = "a16z-domains"
+VERSION = 1
+
+SHARD_SIZE = 1000  # most entries per shard on average
+
+
+def shard_prefix_length(count: int) -> int:
+    """Hex digits of shard prefix for an index of `count` entries (at least one)."""
+    length = 1
+    while count > SHARD_SIZE * 16**length:
+        length += 1
+    return length
+
+
+def shard_of(domain: str, prefix_length: int) -> str:
+    return hashlib.blake2b(domain.encode("utf-8"), digest_size=8).hexdigest()[:prefix_length]
+
+
+def _table(pairs: list[tuple[str, str]], **extra: Any) -> dict[str, Any]:
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        **extra,
+        "domains": [domain for domain, _ in pairs],
+        "ids": [company_id for _, company_id in pairs],
+    }
+
+
+def build_domain_index(companies: Iterable[dict]) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Content of companies/domains.json and of each companies/domains/{prefix}.json."""
+    pairs = sorted(
+        {(domain, c["id"]) for c in companies if c.get("id") and (domain := registrable_domain(c.get("website")))}
+    )
+    prefix_length = shard_prefix_length(len(pairs))
+    by_shard: dict[str, list[tuple[str, str]]] = {}
+    for pair in pairs:
+        by_shard.setdefault(shard_of(pair[0], prefix_length), []).append(pair)
+    shards = {prefix: _table(entries, shard=prefix) for prefix, entries in sorted(by_shard.items())}
+    return _table(pairs, prefix_length=prefix_length), shards
+
+
+class DomainIndex:
+    """Domain → company ids, from domains.json or any of its shards."""
+
+    def __init__(self, data: dict[str, Any] | None = None):
+        self.ids: dict[str, list[str]] = {}
+        self.prefix_length: int | None = None
+        if data is not None:
+            self.add(data)
+
+    @classmethod
+    def load(cls, path: str) -> "DomainIndex":
+        return cls(serializer.load(path))
+
+    def add(self, data: dict[str, Any]) -> None:
+        """Merge in the entries of domains.json or a shard."""
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            raise ValueError(f"Not a {FORMAT} v{VERSION} file")
+        if "prefix_length" in data:
+            self.prefix_length = data["prefix_length"]
+        for domain, company_id in zip(data["domains"], data["ids"]):
+            self.ids.setdefault(domain, []).append(company_id)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, domain_or_url: str) -> bool:
+        return bool(self.lookup(domain_or_url))
+
+    def lookup(self, domain_or_url: str | None) -> list[str]:
+        """Ids of the companies whose website is on the same registrable domain."""
+        domain = registrable_domain(domain_or_url)
+        return self.ids.get(domain, []) if domain else []
+
+    def lookup_many(self, values: Iterable[str | None]) -> list[list[str]]:
+        """`lookup` for each value, in order (e.g. a column of CRM website URLs)."""
+        ids, normalized = self.ids, {}
+        results = []
+        for value in values:
+            if value not in normalized:
+                domain = registrable_domain(value)
+                normalized[value] = ids.get(domain, []) if domain else []
+            results.append(normalized[value])
+        return results
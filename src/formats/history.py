@@ -0,0 +1,94 @@
+"""Time series of the aggregate numbers in meta.json, one row per build.
+
+meta.json only describes the current build. Each build also adds its row to:
+
+- stats/history.json — ``built_at`` (the build's ``last_updated_iso``) and a
+  column per metric: ``total_companies`` and the match rate and coverage
+  percentages of ``extraction_metrics``;
+- stats/history/{facet}.json — the same ``built_at`` column and a column of
+  counts per value of the facet (``statuses``, ``sectors``, ``stages``).
+
+A build reads the previous build's files, which are a few numbers per build,
+and adds its row; nothing older is re-parsed. Rows stay sorted by
+``built_at``, and a build with the same ``built_at`` as an existing row (a
+replayed archive) replaces it. A metric or facet value missing from some
+builds is null (metrics) or 0 (facet counts) in those rows.
+"""
+
+import bisect
+import os
+from typing import Any
+
+from src.formats import serializer
+
+FORMAT = "a16z-history"
+VERSION = 1
+
+HISTORY_PATH = "stats/history.json"  # relative to docs/
+# Facet series file name -> the meta.json counts it records
+FACETS = {"statuses": "counts_by_status", "sectors": "counts_by_sector", "stages": "counts_by_stage"}
+
+
+def facet_path(facet: str) -> str:
+    return f"stats/history/{facet}.json"
+
+
+def empty_table(**extra: Any) -> dict[str, Any]:
+    return {"format": FORMAT, "version": VERSION, **extra, "count": 0, "built_at": [], "columns": {}}
+
+
+def append_row(table: dict[str, Any], built_at: str, row: dict[str, Any], fill: Any = None) -> dict[str, Any]:
+    """Add (or replace) the row for one build in a history table, in place; returns the table.
+
+    Columns the table has but the row lacks get `fill`, and a new column is
+    back-filled with `fill` for the earlier rows.
+    """
+    if table.get("format") != FORMAT or table.get("version") != VERSION:
+        raise ValueError(f"Not a {FORMAT} v{VERSION} file")
+    times, columns = table["built_at"], table["columns"]
+    i = bisect.bisect_left(times, built_at)
+    replace = i < len(times) and times[i] == built_at
+    for name in row:
+        if name not in columns:
+            columns[name] = [fill] * len(times)
+    for name, values in columns.items():
+        value = row.get(name, fill)
+        if replace:
+            values[i] = value
+        else:
+            values.insert(i, value)
+    if not replace:
+        times.insert(i, built_at)
+    table["count"] = len(times)
+    return table
+
+
+def metrics_row(meta: dict[str, Any]) -> dict[str, Any]:
+    """The history.json columns of a build: its total and numeric extraction metrics."""
+    metrics = meta.get("extraction_metrics") or {}
+    return {
+        "total_companies": meta.get("total_companies"),
+        **{name: value for name, value in metrics.items() if isinstance(value, (int, float))},
+    }
+
+
+def load_history(docs_dir: str) -> dict[str, dict[str, Any]]:
+    """The history files of the build in `docs_dir`, keyed by path relative to docs/ ({} if none)."""
+    tables = {}
+    for rel in [HISTORY_PATH, *(facet_path(facet) for facet in FACETS)]:
+        path = os.path.join(docs_dir, *rel.split("/"))
+        if os.path.exists(path):
+            tables[rel] = serializer.load(path)
+    return tables
+
+
+def extend_history(previous: dict[str, dict[str, Any]], meta: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """`previous` (from `load_history`) with the row of the build described by `meta` added."""
+    built_at = meta["last_updated_iso"]
+    table = previous.get(HISTORY_PATH) or empty_table(facets=list(FACETS))
+    tables = {HISTORY_PATH: append_row(table, built_at, metrics_row(meta))}
+    for facet, counts in FACETS.items():
+        rel = facet_path(facet)
+        table = previous.get(rel) or empty_table(facet=facet)
+        tables[rel] = append_row(table, built_at, meta.get(counts) or {}, fill=0)
+    return tables
@@ -0,0 +1,37 @@
+"""Where the per-company record files live under docs/.
+
+- ``flat`` (default): companies/{slug}.json, one directory for every record;
+- ``hashed``: companies/{bucket}/{slug}.json, where the bucket is the first
+  `BUCKET_DIGITS` hex digits of the slug's BLAKE2b hash. 256 buckets keep
+  each directory to a few hundred entries even at 100k records.
+
+The build records the layout it used in meta.json as ``record_layout``, so a
+reader that already has meta.json maps a slug to its file with `company_path`
+without fetching anything else. Builds from before the field are flat.
+"""
+
+import hashlib
+from typing import Any
+
+FLAT = "flat"
+HASHED = "hashed"
+# Record file path pattern of each layout, relative to docs/
+PATTERNS = {FLAT: "companies/{slug}.json", HASHED: "companies/{bucket}/{slug}.json"}
+
+BUCKET_DIGITS = 2
+
+
+def bucket_of(slug: str) -> str:
+    return hashlib.blake2b(slug.encode("utf-8"), digest_size=8).hexdigest()[:BUCKET_DIGITS]
+
+
+def company_path(slug: str, layout: str = FLAT) -> str:
+    """Path of a company's record file relative to docs/ (with "/" separators)."""
+    if layout not in PATTERNS:
+        raise ValueError(f"Unknown record layout: {layout!r} (choose from {', '.join(PATTERNS)})")
+    return PATTERNS[layout].format(slug=slug, bucket=bucket_of(slug) if layout == HASHED else "")
+
+
+def layout_of(meta: dict[str, Any] | None) -> str:
+    """The record layout a build's meta.json declares."""
+    return (meta or {}).get("record_layout") or FLAT
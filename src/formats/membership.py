@@ -0,0 +1,142 @@
+"""Portfolio membership files: a Bloom filter and an exact alias table.
+
+The build writes two files keyed by the canonical forms from
+`src.normalize.names` (company names, slugs and website domains):
+
+- companies/names.bloom — a Bloom filter of every key, a few KB. A miss
+  means the company is definitely not in the portfolio, at the cost of a
+  few hash probes; a hit is right with probability 1 - FALSE_POSITIVE_RATE.
+- companies/aliases.json — the keys sorted, each with the slug it names,
+  for an exact answer by binary search.
+
+`NameIndex` reads both; `aliases.json` is only needed to confirm hits.
+"""
+
+import bisect
+import hashlib
+import math
+import struct
+from typing import Any, Iterable
+
+from src.formats import serializer
+from src.normalize.names import canonical_domain, canonical_name, company_keys, looks_like_domain
+
+FORMAT = "a16z-aliases"
+VERSION = 1
+
+FALSE_POSITIVE_RATE = 0.01
+
+# magic, version, hash count, bit count, key count; the bit array follows
+BLOOM_MAGIC = b"A16ZBLM"
+BLOOM_HEADER = struct.Struct("<7sBBII")
+BLOOM_VERSION = 1
+
+
+def query_keys(text: str) -> list[str]:
+    """Canonical keys to look up for a free-text name, slug, domain or URL."""
+    keys = [key for key in (canonical_name(text),) if key]
+    if looks_like_domain(text) and (domain := canonical_domain(text)):
+        keys.append(domain)
+    return keys
+
+
+class BloomFilter:
+    """Bloom filter over strings, using double hashing of one BLAKE2b digest."""
+
+    def __init__(self, size_bits: int, hash_count: int, count: int = 0, bits: bytes | None = None):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.count = count
+        self.bits = bytearray(bits) if bits is not None else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, n: int, false_positive_rate: float = FALSE_POSITIVE_RATE) -> "BloomFilter":
+        n = max(n, 1)
+        size_bits = max(8, math.ceil(-n * math.log(false_positive_rate) / math.log(2) ** 2))
+        size_bits = (size_bits + 7) // 8 * 8
+        hash_count = max(1, round(size_bits / n * math.log(2)))
+        return cls(size_bits, hash_count)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        h2 |= 1
+        return ((h1 + i * h2) % self.size_bits for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def to_bytes(self) -> bytes:
+        header = BLOOM_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.hash_count, self.size_bits, self.count)
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, version, hash_count, size_bits, count = BLOOM_HEADER.unpack_from(data)
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+            raise ValueError("not a version 1 names.bloom file")
+        bits = data[BLOOM_HEADER.size :]
+        if len(bits) != (size_bits + 7) // 8:
+            raise ValueError("names.bloom is truncated")
+        return cls(size_bits, hash_count, count, bits)
+
+
+def build_membership(companies: Iterable[dict[str, Any]]) -> tuple[bytes, dict[str, Any]]:
+    """The names.bloom bytes and aliases.json structure for a set of companies."""
+    pairs = sorted({(key, c["slug"]) for c in companies for key in company_keys(c)})
+    bloom = BloomFilter.for_capacity(len({key for key, _ in pairs}))
+    previous = None
+    for key, _ in pairs:
+        if key != previous:
+            bloom.add(key)
+            previous = key
+    return bloom.to_bytes(), {
+        "format": FORMAT,
+        "version": VERSION,
+        "aliases": [key for key, _ in pairs],
+        "slugs": [slug for _, slug in pairs],
+    }
+
+
+class NameIndex:
+    """Reader for names.bloom and (optionally) aliases.json."""
+
+    def __init__(self, bloom: BloomFilter, aliases: dict[str, Any] | None = None):
+        self.bloom = bloom
+        self.aliases: list[str] | None = None
+        self.slugs: list[str] | None = None
+        if aliases is not None:
+            if aliases.get("format") != FORMAT or aliases.get("version") != VERSION:
+                raise ValueError(f"not a version {VERSION} {FORMAT} file")
+            self.aliases = aliases["aliases"]
+            self.slugs = aliases["slugs"]
+
+    @classmethod
+    def load(cls, bloom_path: str, aliases_path: str | None = None) -> "NameIndex":
+        with open(bloom_path, "rb") as f:
+            bloom = BloomFilter.from_bytes(f.read())
+        return cls(bloom, serializer.load(aliases_path) if aliases_path else None)
+
+    def might_contain(self, text: str) -> bool:
+        """False if no company goes by this name, slug or domain; True if one probably does."""
+        return any(key in self.bloom for key in query_keys(text))
+
+    def lookup(self, text: str) -> list[str]:
+        """Slugs of the companies that go by this name, slug or domain (exact)."""
+        if self.aliases is None:
+            raise ValueError("lookup() needs aliases.json")
+        slugs: list[str] = []
+        for key in query_keys(text):
+            if key not in self.bloom:
+                continue
+            i = bisect.bisect_left(self.aliases, key)
+            while i < len(self.aliases) and self.aliases[i] == key:
+                if self.slugs[i] not in slugs:
+                    slugs.append(self.slugs[i])
+                i += 1
+        return slugs
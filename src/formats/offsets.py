@@ -0,0 +1,165 @@
+"""Byte-offset index for reading single records out of all.json.
+
+The build serializes all.json record by record (byte-identical to
+``json.dump(companies, indent=2, ensure_ascii=False)``) and records where
+each record's JSON object starts and how long it is. The index is written
+to companies/offsets.json with slugs sorted, so a reader can binary-search
+or hash a slug, then `seek()` into a local all.json or send an HTTP
+``Range`` request (several records per request via multi-range).
+"""
+
+import bisect
+import io
+from typing import Any, BinaryIO, Iterable
+
+from src.formats import serializer
+
+FORMAT = "a16z-offsets"
+VERSION = 1
+
+
+class ArrayWriter:
+    """Write records to a binary file as a pretty JSON array, one at a time.
+
+    Output is byte-identical to ``json.dump(records, f, indent=2,
+    ensure_ascii=False)`` plus a trailing newline; `write()` returns the
+    (offset, length) of the record's JSON object within the file.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.pos = 0
+        self.count = 0
+
+    def write(self, record: dict[str, Any]) -> tuple[int, int]:
+        body = serializer.dumps(record).replace(b"\n", b"\n  ")
+        # Each record is preceded by the previous one's separator (or the opening bracket)
+        prefix = b"[\n  " if self.count == 0 else b",\n  "
+        self.f.write(prefix)
+        self.f.write(body)
+        span = (self.pos + len(prefix), len(body))
+        self.pos += len(prefix) + len(body)
+        self.count += 1
+        return span
+
+    def close(self) -> None:
+        self.f.write(b"\n]\n" if self.count else b"[]\n")
+
+
+def dump_array_with_offsets(records: list[dict[str, Any]]) -> tuple[bytes, list[tuple[int, int]]]:
+    """Serialize records as a pretty JSON array plus the (offset, length) of each record."""
+    buffer = io.BytesIO()
+    writer = ArrayWriter(buffer)
+    spans = [writer.write(record) for record in records]
+    writer.close()
+    return buffer.getvalue(), spans
+
+
+def build_index(slugs: Iterable[str], spans: Iterable[tuple[int, int]], target: str = "all.json") -> dict[str, Any]:
+    """Content of companies/offsets.json: parallel arrays sorted by slug."""
+    rows = sorted(zip(slugs, spans))
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "file": target,
+        "slugs": [slug for slug, _ in rows],
+        "offsets": [span[0] for _, span in rows],
+        "lengths": [span[1] for _, span in rows],
+    }
+
+
+class OffsetIndex:
+    def __init__(self, data: dict[str, Any]):
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            raise ValueError(f"Not a {FORMAT} v{VERSION} file")
+        self.file: str = data["file"]
+        self.slugs: list[str] = data["slugs"]
+        self.offsets: list[int] = data["offsets"]
+        self.lengths: list[int] = data["lengths"]
+
+    @classmethod
+    def load(cls, path: str) -> "OffsetIndex":
+        return cls(serializer.load(path))
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def locate(self, slug: str) -> tuple[int, int] | None:
+        """(offset, length) of a record, found by binary search over the sorted slugs."""
+        i = bisect.bisect_left(self.slugs, slug)
+        if i == len(self.slugs) or self.slugs[i] != slug:
+            return None
+        return self.offsets[i], self.lengths[i]
+
+    def read_local(self, path: str, slugs: Iterable[str]) -> dict[str, dict]:
+        """Read records for the given slugs from a local all.json by seeking."""
+        spans = {slug: span for slug in slugs if (span := self.locate(slug)) is not None}
+        records = {}
+        with open(path, "rb") as f:
+            # Visit records in file order to keep seeks forward-only
+            for slug, (offset, length) in sorted(spans.items(), key=lambda kv: kv[1][0]):
+                f.seek(offset)
+                records[slug] = serializer.loads(f.read(length))
+        return records
+
+    def range_header(self, slugs: Iterable[str]) -> str | None:
+        """A multi-range `Range` header covering the given slugs (adjacent records merged)."""
+        spans = sorted(span for slug in slugs if (span := self.locate(slug)) is not None)
+        if not spans:
+            return None
+        ranges: list[list[int]] = []
+        for offset, length in spans:
+            end = offset + length - 1
+            # Records are separated by ",\n  ", so treat near neighbours as contiguous
+            if ranges and offset <= ranges[-1][1] + 8:
+                ranges[-1][1] = max(ranges[-1][1], end)
+            else:
+                ranges.append([offset, end])
+        return "bytes=" + ",".join(f"{start}-{end}" for start, end in ranges)
+
+    def fetch_http(self, session, url: str, slugs: Iterable[str]) -> dict[str, dict]:
+        """Fetch records from a remote all.json with one (multi-)range request.
+
+        Works whether the server answers with multipart/byteranges, a single
+        206 part, or (if it ignores Range) the full 200 body.
+        """
+        slugs = [s for s in slugs if self.locate(s) is not None]
+        header = self.range_header(slugs)
+        if header is None:
+            return {}
+        response = session.get(url, headers={"Range": header}, timeout=30)
+        response.raise_for_status()
+
+        if response.status_code == 200:
+            parts = [(0, response.content)]
+        else:
+            parts = _parse_partial(response.headers.get("Content-Type", ""), response.headers.get("Content-Range"), response.content)
+
+        records = {}
+        for slug in slugs:
+            offset, length = self.locate(slug)
+            for start, data in parts:
+                if start <= offset and offset + length <= start + len(data):
+                    records[slug] = serializer.loads(data[offset - start : offset - start + length])
+                    break
+        return records
+
+
+def _parse_partial(content_type: str, content_range: str | None, body: bytes) -> list[tuple[int, bytes]]:
+    """Split a 206 response body into (start offset, bytes) parts."""
+    if not content_type.startswith("multipart/byteranges"):
+        start = int(content_range.split(" ", 1)[1].split("-", 1)[0])
+        return [(start, body)]
+
+    boundary = content_type.split("boundary=", 1)[1].strip().strip('"').encode("latin-1")
+    parts = []
+    for chunk in body.split(b"--" + boundary):
+        if not chunk.strip() or chunk.startswith(b"--"):
+            continue
+        head, _, data = chunk.lstrip(b"\r\n").partition(b"\r\n\r\n")
+        for line in head.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-range":
+                start = int(value.strip().split(b" ", 1)[1].split(b"-", 1)[0])
+                parts.append((start, data[:-2] if data.endswith(b"\r\n") else data))
+    return parts
@@ -0,0 +1,238 @@
+"""Memory-mappable binary dataset (companies/all.bin).
+
+Worker processes that `mmap` this file share one page-cache copy of the
+dataset instead of each parsing all.json, and opening it only reads the
+header. All integers are little-endian; sections start on 8-byte boundaries.
+
+- Header: magic ``A16ZPACK``, version (u32), record count (u32), then
+  (offset, length) as two u64 for each section in SECTIONS order.
+- ``schema``: compact JSON ``[[field, kind], ...]`` over flattened field
+  names (``source_urls.portfolio``); kind is ``str``, ``bool``, ``list``
+  (list of strings) or ``json`` (anything else, stored as compact JSON).
+- ``string_offsets`` (u32, one more than the number of strings) and
+  ``string_data``: the deduplicated UTF-8 string pool; string i is
+  ``string_data[string_offsets[i]:string_offsets[i + 1]]``.
+- ``list_offsets`` (u32) and ``list_items`` (u32 string ids): the
+  deduplicated pool of string lists, laid out the same way.
+- ``slug_order`` (u32 per record): record ordinals sorted by slug, for
+  binary search.
+- ``records``: fixed-width rows of one u32 per field — a string id, 0/1, a
+  list id or a string id of JSON text; NULL (0xFFFFFFFF) for None.
+"""
+
+import bisect
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Iterator
+
+from src.formats import serializer
+from src.formats.columnar import flatten
+
+MAGIC = b"A16ZPACK"
+VERSION = 1
+SECTIONS = ("schema", "string_offsets", "string_data", "list_offsets", "list_items", "slug_order", "records")
+HEADER = struct.Struct("<8sII" + "QQ" * len(SECTIONS))
+NULL = 0xFFFFFFFF
+
+
+def _kind(values: list) -> str:
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, list) and all(isinstance(item, str) for item in v) for v in present):
+        return "list"
+    return "json"
+
+
+class _Pool:
+    """Deduplicating pool of byte strings, numbered in insertion order."""
+
+    def __init__(self):
+        self.ids: dict = {}
+        self.offsets = array("I", [0])
+        self.data = bytearray()
+
+    def add(self, key, encoded: bytes | None = None) -> int:
+        if key not in self.ids:
+            self.ids[key] = len(self.ids)
+            self.data += encoded if encoded is not None else key
+            self.offsets.append(len(self.data))
+        return self.ids[key]
+
+
+def _u32(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def pack_records(companies: list[dict[str, Any]]) -> bytes:
+    """Encode records into the all.bin layout."""
+    flat = [flatten(c) for c in companies]
+    fields = list(dict.fromkeys(name for row in flat for name in row))
+    kinds = {name: _kind([row.get(name) for row in flat]) for name in fields}
+
+    strings = _Pool()
+    list_ids: dict[tuple, int] = {}
+    list_offsets = array("I", [0])
+    list_items = array("I")
+    rows = array("I")
+    for row in flat:
+        for name in fields:
+            value = row.get(name)
+            kind = kinds[name]
+            if value is None:
+                rows.append(NULL)
+            elif kind == "str":
+                rows.append(strings.add(value.encode("utf-8")))
+            elif kind == "bool":
+                rows.append(int(value))
+            elif kind == "list":
+                ids = tuple(strings.add(item.encode("utf-8")) for item in value)
+                if ids not in list_ids:
+                    list_ids[ids] = len(list_ids)
+                    list_items.extend(ids)
+                    list_offsets.append(len(list_items))
+                rows.append(list_ids[ids])
+            else:
+                rows.append(strings.add(serializer.dumps(value, pretty=False)))
+
+    slugs = [row.get("slug") or "" for row in flat]
+    slug_order = array("I", sorted(range(len(flat)), key=slugs.__getitem__))
+
+    sections = {
+        "schema": serializer.dumps([[name, kinds[name]] for name in fields], pretty=False),
+        "string_offsets": _u32(strings.offsets),
+        "string_data": bytes(strings.data),
+        "list_offsets": _u32(list_offsets),
+        "list_items": _u32(list_items),
+        "slug_order": _u32(slug_order),
+        "records": _u32(rows),
+    }
+    body = bytearray()
+    spans = []
+    for name in SECTIONS:
+        body += b"\0" * (-(HEADER.size + len(body)) % 8)
+        spans += [HEADER.size + len(body), len(sections[name])]
+        body += sections[name]
+    return HEADER.pack(MAGIC, VERSION, len(flat), *spans) + bytes(body)
+
+
+class PackedDataset:
+    """Zero-copy reader over all.bin content (an mmap, or any bytes-like buffer).
+
+    Sections are memoryviews into the buffer; a record is decoded only when
+    it is asked for.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, version, self.count, *spans = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} all.bin file")
+        if sys.byteorder != "little":
+            raise ValueError("all.bin readers need a little-endian host")
+        self._sections = {
+            name: view[spans[2 * i] : spans[2 * i] + spans[2 * i + 1]] for i, name in enumerate(SECTIONS)
+        }
+        self.fields: list[tuple[str, str]] = [tuple(f) for f in serializer.loads(bytes(self._sections["schema"]))]
+        self._string_offsets = self._sections["string_offsets"].cast("I")
+        self._string_data = self._sections["string_data"]
+        self._list_offsets = self._sections["list_offsets"].cast("I")
+        self._list_items = self._sections["list_items"].cast("I")
+        self._slug_order = self._sections["slug_order"].cast("I")
+        self._records = self._sections["records"].cast("I")
+        self._slug_slot = next((i for i, (name, _) in enumerate(self.fields) if name == "slug"), None)
+        self._file = None
+
+    @classmethod
+    def open(cls, path: str) -> "PackedDataset":
+        """Map a file read-only; the pages are shared with every other process mapping it."""
+        f = open(path, "rb")
+        try:
+            packed = cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except Exception:
+            f.close()
+            raise
+        packed._file = f
+        return packed
+
+    def close(self) -> None:
+        for section in (
+            self._string_offsets, self._list_offsets, self._list_items, self._slug_order, self._records,
+            *self._sections.values(),
+        ):
+            section.release()
+        if self._file is not None:
+            self._buffer.close()
+            self._file.close()
+
+    def __enter__(self) -> "PackedDataset":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, i: int) -> str:
+        return str(self._string_data[self._string_offsets[i] : self._string_offsets[i + 1]], "utf-8")
+
+    def _slug(self, i: int) -> str:
+        return self._string(self._records[i * len(self.fields) + self._slug_slot])
+
+    def record(self, i: int) -> dict[str, Any]:
+        """Decode record i with the original nesting and key order."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        width = len(self.fields)
+        slots = self._records[i * width : (i + 1) * width]
+        record: dict[str, Any] = {}
+        for (name, kind), slot in zip(self.fields, slots):
+            if slot == NULL:
+                value = None
+            elif kind == "str":
+                value = self._string(slot)
+            elif kind == "bool":
+                value = bool(slot)
+            elif kind == "list":
+                items = self._list_items[self._list_offsets[slot] : self._list_offsets[slot + 1]]
+                value = [self._string(s) for s in items]
+            else:
+                value = serializer.loads(self._string(slot))
+            if "." in name:
+                parent, child = name.split(".", 1)
+                record.setdefault(parent, {})[child] = value
+            else:
+                record[name] = value
+        return record
+
+    def find(self, slug: str) -> int | None:
+        """Ordinal of the record with this slug, by binary search over the sorted slugs."""
+        if self._slug_slot is None:
+            return None
+        order = self._slug_order
+        lo = bisect.bisect_left(range(self.count), slug, key=lambda k: self._slug(order[k]))
+        if lo < self.count and self._slug(order[lo]) == slug:
+            return order[lo]
+        return None
+
+    def get(self, slug: str) -> dict[str, Any] | None:
+        i = self.find(slug)
+        return None if i is None else self.record(i)
+
+    def slugs(self) -> Iterator[str]:
+        """Slugs in sorted order."""
+        if self._slug_slot is None:
+            return iter(())
+        return (self._slug(i) for i in self._slug_order)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self.record(i) for i in range(self.count))
@@ -0,0 +1,97 @@
+"""JSON serialization shared by the build, validator, server and client.
+
+`dumps()` returns exactly the bytes the stdlib encoder produces with the
+settings the build has always used — ``json.dumps(obj, indent=2,
+ensure_ascii=False)`` when pretty, ``separators=(",", ":")`` when compact,
+UTF-8 encoded — but uses orjson when it is installed, which is several
+times faster. orjson formats some floats differently (``1e-6`` rather than
+``1e-06``, ``0.00001`` rather than ``1e-05``) and rejects integers wider
+than 64 bits and non-string keys, so such output is re-serialized with the
+stdlib encoder. (Non-finite floats are not valid JSON; orjson writes them as
+null, and the build never emits them.)
+
+`loads()` parses with orjson when available, falling back to the stdlib for
+input orjson rejects, such as NaN literals. orjson reads integers wider than
+64 bits as floats; the API's records contain none. orjson also parses
+arbitrarily deep nesting, slowly, where the stdlib stops at its recursion
+limit, so callers parsing untrusted input pass `max_depth` to have deeper
+input rejected before either parser sees it.
+"""
+
+import json
+import re
+from itertools import accumulate, repeat
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# The encoders disagree on when to switch floats to exponent notation and on how to
+# write the exponent: orjson gives "1e-6" and "1e16" where the stdlib gives "1e-06"
+# and "1e+16", and "0.00001" where the stdlib gives "1e-05". These patterns find
+# such tokens in orjson output; leading with literals keeps the scans fast, and a
+# false match inside a string only costs a stdlib re-serialization.
+_EXPONENT = re.compile(rb"e[-+]?\d+(?:$|[\s,\]}])")
+_SMALL_DECIMAL = b"0.0000"
+
+# For measuring nesting: strings are dropped, then every byte but brackets, and the
+# brackets left map to 2 (opener) or 0 (closer), i.e. depth steps of +1 and -1 plus one
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+_NOT_BRACKET = re.compile(rb"[^\[\]{}]+")
+_DEPTH_STEPS = bytes.maketrans(b"[{]}", b"\x02\x02\x00\x00")
+
+
+def _stdlib_dumps(obj: Any, pretty: bool) -> bytes:
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: bool = True) -> bytes:
+    """Serialize obj to UTF-8 JSON (no trailing newline)."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:  # orjson.JSONEncodeError
+            data = None
+        if data is not None and _SMALL_DECIMAL not in data and not _EXPONENT.search(data):
+            return data
+    return _stdlib_dumps(obj, pretty)
+
+
+def nesting_depth(data: bytes) -> int:
+    """How deeply arrays and objects nest in JSON text, measured without parsing or recursing."""
+    brackets = _NOT_BRACKET.sub(b"", _STRING.sub(b"", data)).translate(_DEPTH_STEPS)
+    return max(accumulate(map(int.__sub__, brackets, repeat(1))), default=0)
+
+
+def loads(data: bytes | str, max_depth: int | None = None) -> Any:
+    """Parse JSON from bytes or str; with max_depth, nesting deeper than that raises ValueError."""
+    if max_depth is not None:
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        if raw.count(b"[") + raw.count(b"{") > max_depth and nesting_depth(raw) > max_depth:
+            raise ValueError(f"JSON nested deeper than {max_depth} levels")
+        del raw
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # re-parse with the stdlib for its extensions and error messages
+    return json.loads(data)
+
+
+def load(path: str) -> Any:
+    """Parse a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write(path: str, obj: Any, pretty: bool = True) -> None:
+    """Write obj to path as JSON followed by a newline."""
+    with open(path, "wb") as f:
+        f.write(dumps(obj, pretty))
+        f.write(b"\n")
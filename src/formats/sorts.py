@@ -0,0 +1,86 @@
+"""Precomputed sort orders over the records of all.json.
+
+For every key in `SORT_KEYS` the build writes:
+
+- sorts/{key}.json — the permutation: ``order[k]`` is the position in
+  all.json (the record's ordinal) of the k-th company in sorted order;
+- sorts/{key}/{page}.json — `PAGE_SIZE` consecutive entries of the same
+  order as ordinals and company ids, pages numbered from 1.
+
+Every order ends with a tie-break on the company name and then the ordinal,
+so it is total and a page always holds the same companies for the same build.
+"""
+
+from typing import Any, Callable, Iterable
+
+from src.normalize.names import canonical_name
+
+FORMAT = "a16z-sort"
+VERSION = 1
+
+PAGE_SIZE = 50
+
+# Statuses in display order; anything else sorts after them
+STATUS_ORDER = {"active": 0, "exited": 1, "unknown": 2}
+
+
+def _name(c: dict) -> str:
+    return canonical_name(c.get("name") or "")
+
+
+# Sort key -> (description, key function); smaller keys come first
+SORT_KEYS: dict[str, tuple[str, Callable[[dict], Any]]] = {
+    "name": ("company name, A to Z", lambda c: _name(c)),
+    "first_seen": ("first seen, oldest first", lambda c: (c.get("first_seen_iso") or "", _name(c))),
+    "status": (
+        "status (active, exited, unknown), then name",
+        lambda c: (STATUS_ORDER.get(c.get("status") or "unknown", len(STATUS_ORDER)), _name(c)),
+    ),
+    "sector_count": ("number of sectors, most first, then name", lambda c: (-len(c.get("sectors") or []), _name(c))),
+}
+
+
+def page_count(count: int, page_size: int = PAGE_SIZE) -> int:
+    return (count + page_size - 1) // page_size
+
+
+def build_sorts(
+    companies: Iterable[dict], page_size: int = PAGE_SIZE
+) -> dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """Each sort key's sorts/{key}.json content and its pages, in page order."""
+    companies = list(companies)
+    ids = [c["id"] for c in companies]
+    pages = page_count(len(companies), page_size)
+    sorts = {}
+    for key, (description, sort_key) in SORT_KEYS.items():
+        keys = [sort_key(c) for c in companies]
+        order = sorted(range(len(companies)), key=lambda i: (keys[i], i))
+        index = {
+            "format": FORMAT,
+            "version": VERSION,
+            "key": key,
+            "description": description,
+            "count": len(order),
+            "page_size": page_size,
+            "pages": pages,
+            "order": order,
+        }
+        slices = []
+        for page in range(1, pages + 1):
+            ordinals = order[(page - 1) * page_size : page * page_size]
+            slices.append(
+                {
+                    "key": key,
+                    "page": page,
+                    "pages": pages,
+                    "count": len(order),
+                    "ordinals": ordinals,
+                    "companies": [ids[i] for i in ordinals],
+                }
+            )
+        sorts[key] = (index, slices)
+    return sorts
+
+
+def is_permutation(order: list[int], count: int) -> bool:
+    return len(order) == count and sorted(order) == list(range(count))
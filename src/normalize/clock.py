@@ -0,0 +1,29 @@
+"""Clock utilities for build timestamps.
+
+Every `*_iso` timestamp in the build goes through `now_iso()` so that a fixed
+clock can be injected (e.g. when replaying an archive) to make builds
+reproducible.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+Clock = Callable[[], datetime]
+
+
+def system_clock() -> datetime:
+    """Return the current UTC time."""
+    return datetime.now(timezone.utc)
+
+
+def fixed_clock(iso: str) -> Clock:
+    """Return a clock that always reports the given ISO timestamp."""
+    frozen = datetime.strptime(iso, ISO_FORMAT).replace(tzinfo=timezone.utc)
+    return lambda: frozen
+
+
+def now_iso(clock: Clock | None = None) -> str:
+    """Format the clock's current time as an ISO 8601 UTC timestamp."""
+    return (clock or system_clock)().strftime(ISO_FORMAT)
@@ -1,12 +1,12 @@
 """Company normalization: apply schema defaults and normalize fields."""
 
-from datetime import datetime, timezone
 from typing import Any
 
+from src.normalize.clock import Clock, now_iso
 from src.normalize.slugify import slugify, make_id
 
 
-def normalize_company(raw: dict[str, Any]) -> dict[str, Any]:
+def normalize_company(raw: dict[str, Any], clock: Clock | None = None) -> dict[str, Any]:
     """Normalize a raw company dict into canonical schema form.
 
     Requires at minimum: name (string).
@@ -19,7 +19,7 @@ def normalize_company(raw: dict[str, Any]) -> dict[str, Any]:
 
     slug = raw.get("slug") or slugify(name)
     company_id = raw.get("id") or make_id(slug)
-    now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    seen_iso = now_iso(clock)
 
     return {
         "id": company_id,
@@ -28,9 +28,12 @@ def normalize_company(raw: dict[str, Any]) -> dict[str, Any]:
         "slug": slug,
         "description": raw.get("description"),
         "website": raw.get("website"),
+        "logo_url": raw.get("logo_url"),
+        "logo_path": raw.get("logo_path"),
         "status": raw.get("status", "unknown"),
         "sectors": raw.get("sectors", []),
         "stages": raw.get("stages", []),
+        "founders": raw.get("founders", []),
         "source_urls": {
             "investment_list": raw.get("source_urls", {}).get(
                 "investment_list", "https://a16z.com/investment-list/"
@@ -45,6 +48,6 @@ def normalize_company(raw: dict[str, Any]) -> dict[str, Any]:
                 "in_portfolio", False
             ),
         },
-        "first_seen_iso": raw.get("first_seen_iso", now_iso),
-        "last_seen_iso": raw.get("last_seen_iso", now_iso),
+        "first_seen_iso": raw.get("first_seen_iso", seen_iso),
+        "last_seen_iso": raw.get("last_seen_iso", seen_iso),
     }
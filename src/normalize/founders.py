@@ -0,0 +1,77 @@
+"""Founder names from the portfolio's free-text `founders_list`.
+
+The portfolio lists founders as one string ("Jane Doe, John Smith Jr. and
+Dr. Ada Lovelace (CEO)"). Records carry the cleaned names as a list, like
+sectors; the founder index keys each name by `founder_key` (accent- and
+case-folded, hyphen-joined) and shards the keys by their first
+`SHARD_PREFIX_LENGTH` characters, so looking up a founder reads one small
+founders/{prefix}.json.
+"""
+
+import re
+import unicodedata
+from typing import Any
+
+SHARD_PREFIX_LENGTH = 2
+
+# Separators between names; "and" only as a whole word
+_SEPARATORS = re.compile(r"\s*(?:[,;/|+&\n]|\band\b)\s*", re.IGNORECASE)
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+# Leading titles dropped from a name
+TITLES = frozenset({"dr", "prof", "mr", "mrs", "ms", "mx", "sir"})
+# Trailing words that qualify the previous name rather than naming a new founder
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "phd", "md", "mba", "esq"})
+
+
+def _word(token: str) -> str:
+    return token.strip(".").lower()
+
+
+def split_founders(text: str | None) -> list[str]:
+    """Cleaned founder names in listed order, without duplicates ([] for no names)."""
+    if not text:
+        return []
+    names: list[str] = []
+    for part in _SEPARATORS.split(_PARENTHESES.sub(" ", text)):
+        words = part.split()
+        while words and _word(words[0]) in TITLES:
+            words.pop(0)
+        if not words:
+            continue
+        if names and all(_word(w) in SUFFIXES for w in words):
+            # "John Smith, Jr." was split at the comma
+            names[-1] = f"{names[-1]} {' '.join(words)}"
+            continue
+        names.append(" ".join(words))
+    seen: set[str] = set()
+    unique = []
+    for name in names:
+        key = founder_key(name)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+def founder_key(name: str) -> str:
+    """Index key for a founder name: "José  García" -> ``jose-garcia`` ("" if nothing is left)."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    return "-".join(re.findall(r"[a-z0-9]+", name))
+
+
+def shard_of(key: str) -> str:
+    return key[:SHARD_PREFIX_LENGTH]
+
+
+def parse_founder(name: str) -> dict[str, Any]:
+    """Structured form of a cleaned name: given name first, family name last, suffixes dropped."""
+    words = name.split()
+    while len(words) > 1 and _word(words[-1]) in SUFFIXES:
+        words.pop()
+    return {
+        "id": founder_key(name),
+        "name": name,
+        "given_name": words[0],
+        "family_name": words[-1] if len(words) > 1 else None,
+    }
@@ -0,0 +1,97 @@
+"""Canonical forms of company names and website domains for matching.
+
+Two spellings of the same company should canonicalize to the same key:
+"Groupon, Inc.", "GROUPON" and "groupon" all become ``groupon``. Name keys
+are slug-like (lowercase ASCII words joined by hyphens) and never contain a
+dot; domain keys always do, so the two can share one lookup table.
+"""
+
+import re
+import unicodedata
+from urllib.parse import urlsplit
+
+# Trailing words that name a legal form rather than the company
+LEGAL_SUFFIXES = frozenset(
+    {
+        "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated",
+        "limited", "llc", "llp", "lp", "ltd", "nv", "pbc", "plc", "pte", "pty", "sa", "sarl", "sas",
+    }
+)
+
+# Second-level labels that, under a two-letter country TLD, are part of the
+# public suffix (co.uk, com.br, ac.jp)
+COUNTRY_SECOND_LEVELS = frozenset({"ac", "co", "com", "edu", "gov", "ltd", "ne", "net", "or", "org"})
+# Shared-hosting suffixes under which every subdomain belongs to someone else
+HOSTING_SUFFIXES = frozenset(
+    {
+        "github.io", "gitlab.io", "herokuapp.com", "netlify.app", "pages.dev", "vercel.app",
+        "web.app", "firebaseapp.com", "webflow.io", "substack.com", "notion.site",
+    }
+)
+
+
+def canonical_name(text: str) -> str:
+    """Canonical key for a company name or slug ("" if nothing is left).
+
+    Folds accents and case, spells out "&", drops punctuation and trailing
+    legal-form words ("Inc.", "LLC", ...) and a leading "The".
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower().replace("&", " and ")
+    words = re.findall(r"[a-z0-9]+", text)
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    if len(words) > 1 and words[0] == "the":
+        words.pop(0)
+    return "-".join(words)
+
+
+def canonical_domain(url: str | None) -> str | None:
+    """Lowercase host of a website URL or bare domain, without "www." (None if there is none)."""
+    if not url:
+        return None
+    url = url.strip()
+    if "://" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    if not host or "." not in host:
+        return None
+    host = host.rstrip(".")
+    return host[4:] if host.startswith("www.") else host
+
+
+def registrable_domain(url: str | None) -> str | None:
+    """The registrable part of a website's host: "https://shop.mayvenn.com/" -> ``mayvenn.com``.
+
+    Keeps one label below the public suffix, which is the last label, two
+    labels for country second levels ("dishpatch.co.uk") or a known
+    shared-hosting suffix ("acme.github.io"). IP addresses are returned whole.
+    """
+    host = canonical_domain(url)
+    if host is None:
+        return None
+    labels = host.split(".")
+    if all(label.isdigit() for label in labels):
+        return host
+    suffix = 1
+    if (len(labels[-1]) == 2 and labels[-2] in COUNTRY_SECOND_LEVELS) or ".".join(labels[-2:]) in HOSTING_SUFFIXES:
+        suffix = 2
+    return ".".join(labels[-suffix - 1 :]) if len(labels) > suffix else host
+
+
+def looks_like_domain(text: str) -> bool:
+    """Whether a query string is a URL or bare domain rather than a name."""
+    text = text.strip()
+    return "://" in text or ("." in text and " " not in text)
+
+
+def company_keys(company: dict) -> set[str]:
+    """Canonical name, slug and website-domain keys under which a company can be found."""
+    keys = {canonical_name(company.get("name") or ""), canonical_name(company.get("slug") or "")}
+    keys.add(canonical_domain(company.get("website")))
+    keys.discard("")
+    keys.discard(None)
+    return keys
@@ -0,0 +1,333 @@
+"""In-process columnar query engine over the company records.
+
+    from src.query.dataset import Dataset, col
+
+    ds = Dataset.load("docs/companies/all.json")   # or companies/columns.json
+    active_ai = ds.where(col("sectors").contains("ai") & (col("status") == "active"))
+    active_ai.group_count("stages")                 # {"venture": 31, "seed": 12, ...}
+    active_ai.sort("name").head(5).column("slug")
+
+Records are loaded once into NumPy-backed columns named by their flattened
+field paths (``status``, ``source_evidence.in_portfolio``):
+
+- Scalar fields are categorical: an int32 code per row into a sorted list of
+  distinct values (None first), so codes double as sort ranks.
+- List fields (sectors, stages) are CSR arrays: row i's codes are
+  ``codes[indptr[i]:indptr[i + 1]]``.
+
+Expressions built with `col()` evaluate to boolean masks over all rows; a
+`Dataset` is the shared columns plus the ordinals of the rows it selects, so
+filtering, sorting and slicing never copy the columns.
+"""
+
+from typing import Any, Iterable
+
+import numpy as np
+
+from src.formats import serializer
+from src.formats.columnar import FORMAT as COLUMNS_FORMAT, ColumnarReader, flatten
+
+
+def _sort_key(value: Any) -> tuple:
+    return (value is not None, value)
+
+
+class Categorical:
+    """A scalar column: codes into sorted distinct values."""
+
+    def __init__(self, values: list):
+        self.categories: list = sorted(set(values), key=_sort_key)
+        lookup = {value: code for code, value in enumerate(self.categories)}
+        self.codes = np.fromiter((lookup[v] for v in values), dtype=np.int32, count=len(values))
+        self.lookup = lookup
+
+    def code(self, value: Any) -> int:
+        """Code of a value, or -1 if no row has it."""
+        try:
+            return self.lookup.get(value, -1)
+        except TypeError:  # unhashable
+            return -1
+
+    def values(self, rows: np.ndarray) -> list:
+        categories = self.categories
+        return [categories[c] for c in self.codes[rows].tolist()]
+
+
+class MultiCategorical:
+    """A list-valued column: CSR arrays of codes into sorted distinct values."""
+
+    def __init__(self, values: list):
+        lists = [v or [] for v in values]
+        self.categories: list = sorted({item for v in lists for item in v}, key=_sort_key)
+        lookup = {value: code for code, value in enumerate(self.categories)}
+        lengths = np.fromiter((len(v) for v in lists), dtype=np.int64, count=len(lists))
+        self.indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.codes = np.fromiter((lookup[item] for v in lists for item in v), dtype=np.int32, count=int(self.indptr[-1]))
+        # Row ordinal of every entry in `codes`
+        self.entry_rows = np.repeat(np.arange(len(lists), dtype=np.int64), lengths)
+        self.lookup = lookup
+        self._masks: dict[int, np.ndarray] = {}
+
+    def code(self, value: Any) -> int:
+        try:
+            return self.lookup.get(value, -1)
+        except TypeError:
+            return -1
+
+    def mask(self, code: int) -> np.ndarray:
+        """Rows having the value with this code (cached per value)."""
+        if code not in self._masks:
+            mask = np.zeros(len(self.indptr) - 1, dtype=bool)
+            mask[self.entry_rows[self.codes == code]] = True
+            mask.flags.writeable = False
+            self._masks[code] = mask
+        return self._masks[code]
+
+    def values(self, rows: np.ndarray) -> list:
+        categories, codes, indptr = self.categories, self.codes.tolist(), self.indptr.tolist()
+        return [[categories[c] for c in codes[indptr[i] : indptr[i + 1]]] for i in rows.tolist()]
+
+    def expand(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(position in `rows`, code) for every entry of the given rows."""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        owners = np.repeat(np.arange(len(rows)), lengths)
+        # Entry index = start of its row + its offset within the row
+        offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return owners, self.codes[np.repeat(starts, lengths) + offsets]
+
+
+Column = Categorical | MultiCategorical
+
+
+class Expr:
+    """A boolean row predicate; combine with `&`, `|` and `~`."""
+
+    def mask(self, ds: "Dataset") -> np.ndarray:
+        raise NotImplementedError
+
+    def __and__(self, other: "Expr") -> "Expr":
+        return _Combine(np.logical_and, self, other)
+
+    def __or__(self, other: "Expr") -> "Expr":
+        return _Combine(np.logical_or, self, other)
+
+    def __invert__(self) -> "Expr":
+        return _Not(self)
+
+
+class _Combine(Expr):
+    def __init__(self, op, left: Expr, right: Expr):
+        self.op, self.left, self.right = op, left, right
+
+    def mask(self, ds: "Dataset") -> np.ndarray:
+        return self.op(self.left.mask(ds), self.right.mask(ds))
+
+
+class _Not(Expr):
+    def __init__(self, inner: Expr):
+        self.inner = inner
+
+    def mask(self, ds: "Dataset") -> np.ndarray:
+        return ~self.inner.mask(ds)
+
+
+class _In(Expr):
+    """Scalar column value is one of `values`; list column contains any of `values`."""
+
+    def __init__(self, name: str, values: Iterable):
+        self.name, self.values = name, list(values)
+
+    def mask(self, ds: "Dataset") -> np.ndarray:
+        column = ds.columns[ds._field(self.name)]
+        codes = [c for c in (column.code(v) for v in self.values) if c >= 0]
+        if isinstance(column, MultiCategorical):
+            mask = np.zeros(ds.size, dtype=bool)
+            for c in codes:
+                mask |= column.mask(c)
+            return mask
+        if len(codes) == 1:
+            return column.codes == codes[0]
+        return np.isin(column.codes, codes)
+
+
+class _Like(Expr):
+    """Case-insensitive substring match on a string column."""
+
+    def __init__(self, name: str, needle: str):
+        self.name, self.needle = name, needle.lower()
+
+    def mask(self, ds: "Dataset") -> np.ndarray:
+        column = ds.columns[ds._field(self.name)]
+        if isinstance(column, MultiCategorical):
+            raise ValueError(f"like() needs a scalar column, not {self.name}")
+        # Test each distinct value once, then map through the codes
+        hits = np.array([isinstance(v, str) and self.needle in v.lower() for v in column.categories], dtype=bool)
+        return hits[column.codes] if len(hits) else np.zeros(ds.size, dtype=bool)
+
+
+class Col:
+    """A reference to a column, used to build expressions."""
+
+    __hash__ = None  # `==` builds an expression
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value: Any) -> Expr:  # type: ignore[override]
+        return _In(self.name, [value])
+
+    def __ne__(self, value: Any) -> Expr:  # type: ignore[override]
+        return ~_In(self.name, [value])
+
+    def isin(self, values: Iterable) -> Expr:
+        return _In(self.name, values)
+
+    def contains(self, value: Any) -> Expr:
+        """List column has `value` among its items."""
+        return _In(self.name, [value])
+
+    def contains_any(self, values: Iterable) -> Expr:
+        return _In(self.name, values)
+
+    def isnull(self) -> Expr:
+        return _In(self.name, [None])
+
+    def like(self, needle: str) -> Expr:
+        return _Like(self.name, needle)
+
+
+def col(name: str) -> Col:
+    return Col(name)
+
+
+class Dataset:
+    """Company records as columns, plus a selection of rows in a given order."""
+
+    def __init__(self, columns: dict[str, Column], fields: list[str], rows: np.ndarray | None = None):
+        self.columns = columns
+        self.fields = fields
+        self.size = _column_size(columns)
+        self.rows = np.arange(self.size, dtype=np.int64) if rows is None else rows
+
+    @classmethod
+    def from_lists(cls, fields: list[str], values: dict[str, list]) -> "Dataset":
+        """Build from flattened field names and one list of values per field."""
+        columns: dict[str, Column] = {}
+        for name in fields:
+            column = values[name]
+            if any(isinstance(v, list) for v in column):
+                columns[name] = MultiCategorical(column)
+            else:
+                columns[name] = Categorical(column)
+        return cls(columns, fields)
+
+    @classmethod
+    def from_records(cls, companies: list[dict[str, Any]]) -> "Dataset":
+        flat = [flatten(c) for c in companies]
+        fields = list(dict.fromkeys(name for row in flat for name in row))
+        return cls.from_lists(fields, {name: [row.get(name) for row in flat] for name in fields})
+
+    @classmethod
+    def load(cls, path: str) -> "Dataset":
+        """Load all.json or the columnar columns.json."""
+        data = serializer.load(path)
+        if isinstance(data, dict) and data.get("format") == COLUMNS_FORMAT:
+            reader = ColumnarReader(data)
+            return cls.from_lists(reader.fields, {name: reader.column(name) for name in reader.fields})
+        return cls.from_records(data)
+
+    def _field(self, name: str) -> str:
+        if name not in self.columns:
+            raise KeyError(f"Unknown column {name!r} (have {', '.join(self.fields)})")
+        return name
+
+    def _with_rows(self, rows: np.ndarray) -> "Dataset":
+        return Dataset(self.columns, self.fields, rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def count(self) -> int:
+        return len(self.rows)
+
+    # --- Operations returning a new selection ---
+
+    def where(self, expr: Expr) -> "Dataset":
+        """Rows matching the expression, in the current order."""
+        return self._with_rows(self.rows[expr.mask(self)[self.rows]])
+
+    def sort(self, *keys: str, descending: bool = False) -> "Dataset":
+        """Rows ordered by scalar columns (stable; None sorts first ascending)."""
+        if not keys:
+            raise ValueError("sort() needs at least one column")
+        ranks = []
+        for name in reversed(keys):
+            column = self.columns[self._field(name)]
+            if isinstance(column, MultiCategorical):
+                raise ValueError(f"Cannot sort by list column {name}")
+            ranks.append(column.codes[self.rows])
+        # Negated ranks reverse the order while keeping ties in their current order
+        order = np.lexsort([-r for r in ranks] if descending else ranks)
+        return self._with_rows(self.rows[order])
+
+    def head(self, n: int) -> "Dataset":
+        return self._with_rows(self.rows[:n])
+
+    # --- Results ---
+
+    def group_count(self, *keys: str) -> dict:
+        """Rows per value (or per tuple of values with several keys), largest group first.
+
+        A row counts once towards each value of a list column it has, so
+        grouping by sectors counts a two-sector company in both sectors.
+        """
+        if not keys:
+            raise ValueError("group_count() needs at least one column")
+        owners = np.arange(len(self.rows))
+        combined = np.zeros(len(self.rows), dtype=np.int64)
+        columns = [self.columns[self._field(name)] for name in keys]
+        for column in columns:
+            if isinstance(column, MultiCategorical):
+                entry_owners, codes = column.expand(self.rows[owners])
+                owners, combined = owners[entry_owners], combined[entry_owners]
+            else:
+                codes = column.codes[self.rows[owners]]
+            combined = combined * len(column.categories) + codes
+        unique, counts = np.unique(combined, return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+
+        groups = {}
+        for key, count in zip(unique[order].tolist(), counts[order].tolist()):
+            values = []
+            for column in reversed(columns):
+                key, code = divmod(key, len(column.categories))
+                values.append(column.categories[code])
+            groups[values[0] if len(keys) == 1 else tuple(reversed(values))] = count
+        return groups
+
+    def column(self, name: str) -> list:
+        """Values of one column for the selected rows."""
+        return self.columns[self._field(name)].values(self.rows)
+
+    def records(self) -> list[dict[str, Any]]:
+        """The selected rows as records with the original nesting."""
+        columns = {name: self.column(name) for name in self.fields}
+        records = []
+        for i in range(len(self.rows)):
+            record: dict[str, Any] = {}
+            for name in self.fields:
+                if "." in name:
+                    parent, child = name.split(".", 1)
+                    record.setdefault(parent, {})[child] = columns[name][i]
+                else:
+                    record[name] = columns[name][i]
+            records.append(record)
+        return records
+
+
+def _column_size(columns: dict[str, Column]) -> int:
+    for column in columns.values():
+        return len(column.codes) if isinstance(column, Categorical) else len(column.indptr) - 1
+    return 0
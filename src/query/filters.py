@@ -0,0 +1,48 @@
+"""Company filters for the `query` command.
+
+The API server's /query answers the same filters from the posting lists of
+src.query.index, matching text with `search_text` from here. Only the
+standard library is imported here so read-only tooling starts fast.
+"""
+
+from typing import Any, Iterable, Iterator
+
+
+def search_text(company: dict[str, Any]) -> str:
+    """The lowercased name and description that `q` is matched against."""
+    return f"{company.get('name') or ''} {company.get('description') or ''}".lower()
+
+
+def matches(
+    company: dict[str, Any],
+    sector: str | None = None,
+    stage: str | None = None,
+    status: str | None = None,
+    q: str | None = None,
+) -> bool:
+    """Return True if the company satisfies every given filter.
+
+    `q` is a case-insensitive substring match on name and description.
+    """
+    if sector and sector not in company.get("sectors", []):
+        return False
+    if stage and stage not in company.get("stages", []):
+        return False
+    if status and company.get("status") != status:
+        return False
+    if q and q.lower() not in search_text(company):
+        return False
+    return True
+
+
+def filter_companies(
+    companies: Iterable[dict[str, Any]],
+    sector: str | None = None,
+    stage: str | None = None,
+    status: str | None = None,
+    q: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield the companies matching all given filters, in input order."""
+    for company in companies:
+        if matches(company, sector, stage, status, q):
+            yield company
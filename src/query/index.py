@@ -0,0 +1,60 @@
+"""In-memory facet indexes for answering company queries without scanning every record."""
+
+from typing import Any
+
+from src.query.filters import search_text
+
+
+class QueryIndex:
+    """Posting lists of record ordinals per sector, stage and status.
+
+    Built once from the all.json records; `search()` intersects the posting
+    lists of the requested facets (smallest first) and applies the text
+    filter only to the surviving candidates. It selects exactly the records
+    `filters.matches` accepts.
+    """
+
+    def __init__(self, companies: list[dict[str, Any]]):
+        self.companies = companies
+        self.by_sector: dict[str, list[int]] = {}
+        self.by_stage: dict[str, list[int]] = {}
+        self.by_status: dict[str, list[int]] = {}
+        self.text: list[str] = []
+        for i, company in enumerate(companies):
+            for sector in company.get("sectors", []):
+                self.by_sector.setdefault(sector, []).append(i)
+            for stage in company.get("stages", []):
+                self.by_stage.setdefault(stage, []).append(i)
+            self.by_status.setdefault(company.get("status"), []).append(i)
+            self.text.append(search_text(company))
+
+    def search(
+        self,
+        sector: str | None = None,
+        stage: str | None = None,
+        status: str | None = None,
+        q: str | None = None,
+    ) -> list[int]:
+        """Return the ordinals of matching records in all.json order."""
+        postings = []
+        if sector:
+            postings.append(self.by_sector.get(sector, []))
+        if stage:
+            postings.append(self.by_stage.get(stage, []))
+        if status:
+            postings.append(self.by_status.get(status, []))
+
+        if postings:
+            postings.sort(key=len)
+            candidates = postings[0]
+            for other in postings[1:]:
+                members = set(other)
+                candidates = [i for i in candidates if i in members]
+        else:
+            candidates = range(len(self.companies))
+
+        if q:
+            needle = q.lower()
+            text = self.text
+            return [i for i in candidates if needle in text[i]]
+        return list(candidates)
@@ -0,0 +1,420 @@
+"""Local asyncio HTTP server over the docs/ build output.
+
+Static files are loaded into an in-memory snapshot at startup, each with a
+precompressed gzip body and a strong ETag, and served with conditional
+(If-None-Match → 304) and byte-range (Range → 206, multipart/byteranges for
+several ranges) support. Files of DISK_FILE_SIZE and up (api.bundle, and
+all.json on large builds) stay on disk: the snapshot holds an open handle
+and their ETag, and their bytes are streamed from it per request,
+uncompressed. The snapshot also holds facet indexes built from all.json
+that answer
+
+    GET /query?sector=&stage=&status=&q=&limit=&offset=
+
+A background task watches meta.json (written last by the build) and swaps in
+a freshly loaded snapshot once a new, complete build is published, so
+requests never see a half-written build.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import time
+from email.utils import formatdate
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.formats import serializer
+from src.query.index import QueryIndex
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+RELOAD_INTERVAL = 2.0
+# Files smaller than this are not worth compressing
+MIN_GZIP_SIZE = 256
+MAX_HEADER_BYTES = 16 * 1024
+MAX_RANGES = 256
+# Files this large are streamed from disk in chunks of STREAM_CHUNK instead of held in memory
+DISK_FILE_SIZE = 1024 * 1024
+STREAM_CHUNK = 256 * 1024
+# Request bodies up to this size are read and dropped so the connection can be reused
+MAX_DISCARDED_BODY = 1024 * 1024
+BOUNDARY = "a16z-oss-api-byteranges"
+
+REASONS = {
+    200: "OK",
+    206: "Partial Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
+    503: "Service Unavailable",
+}
+
+CONTENT_TYPES = {
+    ".json": "application/json; charset=utf-8",
+    ".md": "text/markdown; charset=utf-8",
+    ".bin": "application/octet-stream",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+    ".bundle": "application/octet-stream",
+}
+# Already-compressed formats that gzip would only spend time on
+PRECOMPRESSED = {".png", ".jpg", ".gif", ".webp", ".bundle"}
+
+
+class StaticFile:
+    def __init__(self, body: bytes, content_type: str, compress: bool = True):
+        self.body = body
+        self.size = len(body)
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        compressed = None
+        if compress and len(body) >= MIN_GZIP_SIZE:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        self.gzip_body = compressed if compressed is not None and len(compressed) < len(body) else None
+        self.gzip_etag = self.etag[:-1] + '-gz"'
+
+    def read(self, start: int = 0, end: int | None = None) -> bytes:
+        return self.body[start:end]
+
+    span = read  # the response body carrying bytes [start, end)
+
+
+class DiskFile:
+    """A large file served from disk through a handle opened with the snapshot.
+
+    The handle keeps the loaded file readable after a build replaces it with
+    os.replace; a file rewritten in place shows up as `changed()`.
+    """
+
+    gzip_body = None
+    file = None
+
+    def __init__(self, path: str, content_type: str):
+        self.file = open(path, "rb", buffering=0)
+        self.content_type = content_type
+        digest = hashlib.sha1()
+        while chunk := self.file.read(STREAM_CHUNK):
+            digest.update(chunk)
+        self.size = self.file.tell()
+        self.signature = self._signature()
+        self.etag = '"' + digest.hexdigest() + '"'
+
+    def __del__(self):
+        if self.file is not None:
+            self.file.close()
+
+    def _signature(self) -> tuple[int, int]:
+        st = os.fstat(self.file.fileno())
+        return st.st_mtime_ns, st.st_size
+
+    def changed(self) -> bool:
+        return self._signature() != self.signature
+
+    def read(self, start: int = 0, end: int | None = None) -> bytes:
+        # Reads run on the event loop thread, so no other seek can land between these two calls
+        self.file.seek(start)
+        return self.file.read((self.size if end is None else end) - start)
+
+    def span(self, start: int, end: int) -> "FileSpan":
+        return FileSpan(self, start, end)
+
+
+class FileSpan:
+    """Bytes [start, end) of a DiskFile, streamed to the client in chunks."""
+
+    def __init__(self, file: DiskFile, start: int, end: int):
+        self.file, self.start, self.end = file, start, end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def chunks(self):
+        for offset in range(self.start, self.end, STREAM_CHUNK):
+            yield self.file.read(offset, min(offset + STREAM_CHUNK, self.end))
+
+
+class MultiPart:
+    """A multipart/byteranges body over a DiskFile: part headers in memory, ranges streamed."""
+
+    def __init__(self, parts: list[bytes | FileSpan]):
+        self.parts = parts
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self.parts)
+
+
+Body = bytes | FileSpan | MultiPart
+
+
+class Snapshot:
+    """An immutable view of one published build."""
+
+    def __init__(self, docs_dir: str):
+        self.docs_dir = docs_dir
+        self.version = _meta_signature(docs_dir)
+        self.files: dict[str, StaticFile | DiskFile] = {}
+        for root, _dirs, names in os.walk(docs_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                rel = "/" + os.path.relpath(path, docs_dir).replace(os.sep, "/")
+                ext = os.path.splitext(name)[1]
+                content_type = CONTENT_TYPES.get(ext, "application/octet-stream")
+                if os.path.getsize(path) >= DISK_FILE_SIZE:
+                    self.files[rel] = DiskFile(path, content_type)
+                    continue
+                with open(path, "rb") as f:
+                    body = f.read()
+                self.files[rel] = StaticFile(body, content_type, compress=ext not in PRECOMPRESSED)
+
+        meta = serializer.loads(self.files["/meta.json"].read())
+        companies = serializer.loads(self.files["/companies/all.json"].read())
+        if len(companies) != meta.get("total_companies"):
+            raise ValueError("all.json does not match meta.json; build still in progress?")
+        self.last_updated_iso = meta.get("last_updated_iso")
+        self.index = QueryIndex(companies)
+        # Pre-serialized records so query responses are joins of ready-made bytes
+        self.records = [serializer.dumps(c, pretty=False) for c in companies]
+
+    def query(self, params: dict[str, list[str]]) -> bytes:
+        def one(name: str) -> str | None:
+            values = params.get(name)
+            return values[0] if values else None
+
+        limit = min(_count(one("limit"), DEFAULT_LIMIT), MAX_LIMIT)
+        offset = _count(one("offset"), 0)
+
+        hits = self.index.search(one("sector"), one("stage"), one("status"), one("q"))
+        page = hits[offset : offset + limit]
+        header = serializer.dumps(
+            {"total": len(hits), "offset": offset, "limit": limit, "last_updated_iso": self.last_updated_iso},
+            pretty=False,
+        )
+        return header[:-1] + b',"results":[' + b",".join(self.records[i] for i in page) + b"]}"
+
+
+def _count(value: str | None, default: int) -> int:
+    """A non-negative integer query parameter (`default` if absent)."""
+    if not value:
+        return default
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError("limit and offset must be non-negative integers")
+    return int(value)
+
+
+def _meta_signature(docs_dir: str) -> tuple[int, int]:
+    st = os.stat(os.path.join(docs_dir, "meta.json"))
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse_ranges(header: str, size: int) -> list[tuple[int, int]]:
+    """Parse a `bytes=` Range header into inclusive (start, end) spans.
+
+    Unsatisfiable spans are dropped, so an empty list means 416.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes":
+        raise ValueError("only byte ranges are supported")
+    specs = spec.split(",")
+    if len(specs) > MAX_RANGES:
+        raise ValueError("too many ranges")
+    spans = []
+    for part in specs:
+        first, _, last = part.strip().partition("-")
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                raise ValueError("range ends before it starts")  # invalid, not unsatisfiable (RFC 9110 §14.1.1)
+        else:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0:
+                continue
+            start, end = max(size - length, 0), size - 1
+        if start < size and start <= end:
+            spans.append((start, min(end, size - 1)))
+    return spans
+
+
+class ApiServer:
+    def __init__(self, docs_dir: str, reload_interval: float = RELOAD_INTERVAL):
+        self.docs_dir = docs_dir
+        self.reload_interval = reload_interval
+        self.snapshot = Snapshot(docs_dir)
+        self.requests_served = 0
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        reloader = asyncio.create_task(self._watch())
+        print(f"Serving {self.docs_dir} on http://{host}:{port}/ (build {self.snapshot.last_updated_iso})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reloader.cancel()
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                if _meta_signature(self.docs_dir) == self.snapshot.version:
+                    continue
+                snapshot = await asyncio.to_thread(Snapshot, self.docs_dir)
+            except (OSError, ValueError, KeyError) as e:
+                # Build in progress or incomplete; keep serving the old snapshot
+                print(f"  reload deferred: {e}")
+                continue
+            self.snapshot = snapshot
+            print(f"  reloaded build {snapshot.last_updated_iso} ({len(snapshot.files)} files)")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                if len(head) > MAX_HEADER_BYTES:
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                # Drop any request body, so the next request on the connection starts where expected
+                length = headers.get("content-length", "0")
+                if "transfer-encoding" in headers or not length.isdigit() or int(length) > MAX_DISCARDED_BODY:
+                    keep_alive = False
+                elif int(length):
+                    try:
+                        await reader.readexactly(int(length))
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        break
+                status, out, body, is_head = self.respond(method, target, headers)
+                writer.write(self._head(status, out, len(body), keep_alive))
+                if not is_head and status != 304:
+                    await self._send(writer, body)
+                await writer.drain()
+                self.requests_served += 1
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    def respond(self, method: str, target: str, headers: dict[str, str]) -> tuple[int, dict[str, str], Body, bool]:
+        """Build (status, headers, body, is_head) for one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b"", False
+        is_head = method == "HEAD"
+        snapshot = self.snapshot  # one snapshot per request, even if a reload lands meanwhile
+        url = urlsplit(target)
+        path = unquote(url.path)
+
+        if path == "/query":
+            try:
+                body = snapshot.query(parse_qs(url.query))
+            except ValueError as e:
+                body = serializer.dumps({"error": str(e)}, pretty=False)
+                return 400, {"Content-Type": CONTENT_TYPES[".json"]}, body, is_head
+            # Dynamic bodies are not worth compressing per request
+            return self._entity(StaticFile(body, CONTENT_TYPES[".json"], compress=False), headers, is_head)
+
+        if path.endswith("/"):
+            path += "index.json"
+        static = snapshot.files.get(path)
+        if static is None:
+            return 404, {"Content-Type": "application/json"}, b'{"error": "not found"}', is_head
+        return self._entity(static, headers, is_head)
+
+    def _entity(self, static: StaticFile | DiskFile, headers: dict[str, str], is_head: bool):
+        if isinstance(static, DiskFile) and static.changed():
+            # Rewritten in place by a build still in progress; the next snapshot will serve it
+            body = serializer.dumps({"error": "build in progress"}, pretty=False)
+            out = {"Content-Type": CONTENT_TYPES[".json"], "Retry-After": str(max(1, round(self.reload_interval)))}
+            return 503, out, body, is_head
+        range_header = headers.get("range")
+        size = static.size
+        spans = None
+        if range_header is not None:
+            try:
+                spans = _parse_ranges(range_header, size)
+            except ValueError:
+                pass  # unsupported range syntax: ignore the header and send the whole entity (RFC 9110 §14.2)
+        use_gzip = static.gzip_body is not None and spans is None and "gzip" in headers.get("accept-encoding", "")
+        etag = static.gzip_etag if use_gzip else static.etag
+        out = {
+            "Content-Type": static.content_type,
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Vary": "Accept-Encoding",
+            "Access-Control-Allow-Origin": "*",
+        }
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and (if_none_match == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return 304, out, b"", is_head
+
+        if spans is not None:
+            if not spans:
+                out["Content-Range"] = f"bytes */{size}"
+                return 416, out, b"", is_head
+            if len(spans) == 1:
+                start, end = spans[0]
+                out["Content-Range"] = f"bytes {start}-{end}/{size}"
+                return 206, out, static.span(start, end + 1), is_head
+            parts: list[bytes | FileSpan] = []
+            for start, end in spans:
+                parts.append(
+                    f"--{BOUNDARY}\r\nContent-Type: {static.content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n".encode("latin-1")
+                )
+                parts.append(static.span(start, end + 1))
+                parts.append(b"\r\n")
+            parts.append(f"--{BOUNDARY}--\r\n".encode("latin-1"))
+            out["Content-Type"] = f"multipart/byteranges; boundary={BOUNDARY}"
+            if isinstance(static, StaticFile):
+                return 206, out, b"".join(parts), is_head
+            return 206, out, MultiPart(parts), is_head
+
+        if use_gzip:
+            out["Content-Encoding"] = "gzip"
+            return 200, out, static.gzip_body, is_head
+        return 200, out, static.span(0, size), is_head
+
+    def _head(self, status: int, headers: dict[str, str], length: int, keep_alive: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}", f"Date: {formatdate(time.time(), usegmt=True)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer: asyncio.StreamWriter, body: Body) -> None:
+        pieces = body.parts if isinstance(body, MultiPart) else [body]
+        for piece in pieces:
+            if isinstance(piece, FileSpan):
+                for chunk in piece.chunks():
+                    writer.write(chunk)
+                    await writer.drain()
+            else:
+                writer.write(piece)
+
+
+def serve(docs_dir: str, host: str = "127.0.0.1", port: int = 8000, reload_interval: float = RELOAD_INTERVAL) -> None:
+    """Run the API server until interrupted."""
+    try:
+        asyncio.run(ApiServer(docs_dir, reload_interval).serve(host, port))
+    except KeyboardInterrupt:
+        pass
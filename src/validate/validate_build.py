@@ -1,110 +1,439 @@
-"""Post-build validation: ensure the generated dataset is correct and consistent."""
+"""Post-build validation: ensure the generated dataset is correct and consistent.
 
-import json
+`Validator` accumulates the checks one record at a time, so the build runs
+it inline on the in-memory records it emits and never reads docs/ back.
+`validate()` runs the same checks over an existing docs/ directory. Every
+passing validation records the size, modification time and content hash of
+each validated file in a manifest under .cache/validation/; with
+`incremental=True`, `validate()` returns at once when no file changed since
+then, and otherwise re-checks only the records whose content changed (the
+dataset-level checks always re-run).
+"""
+
+import hashlib
 import os
 import sys
+import zlib
+from typing import Any, Callable, Iterable
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-DOCS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "docs")
-SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "schema", "company.schema.json")
+from src.formats.bundle import BUNDLE_NAME, BundleReader, bundle_paths
+from src.formats.domains import DomainIndex
+from src.formats.history import FACETS, HISTORY_PATH, facet_path, load_history, metrics_row
+from src.formats.layout import FLAT, PATTERNS, company_path, layout_of
+from src.formats.membership import NameIndex
+from src.formats.packed import PackedDataset
+from src.formats.serializer import dumps, load as _load
+from src.formats.sorts import SORT_KEYS, is_permutation
+from src.normalize.founders import founder_key, shard_of
+from src.normalize.names import company_keys, registrable_domain
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DOCS_DIR = os.path.join(ROOT_DIR, "docs")
+SCHEMA_PATH = os.path.join(ROOT_DIR, "schema", "company.schema.json")
+MANIFEST_DIR = os.path.join(ROOT_DIR, ".cache", "validation")
 
 MIN_COMPANIES = 500  # Sanity check: a16z should have at least this many
 
+# Files and directories (relative to docs/) whose contents the checks depend on
+VALIDATED_PATHS = (
+    "meta.json",
+    "companies",
+    "sectors",
+    "stages",
+    "statuses",
+    "founders",
+    "sorts",
+    "stats",
+    "logos",
+    BUNDLE_NAME,
+)
+
+
+def _compiled_schema():
+    """A reusable validator for the company schema, or None without jsonschema."""
+    try:
+        import jsonschema
+    except ImportError:
+        return None  # jsonschema not available, skip
+    schema = _load(SCHEMA_PATH)
+    return jsonschema.validators.validator_for(schema)(schema)
+
+
+class Validator:
+    """Validation checks fed one record at a time.
+
+    Call `check_company()` for every record, then the dataset-level checks
+    that apply, then `finish()`.
+    """
+
+    def __init__(self, layout: str = FLAT):
+        # Where check_files looks for the per-company files (see src/formats/layout.py)
+        self.layout = layout
+        self.errors: list[str] = []
+        self.count = 0
+        self.ids: set[str] = set()
+        self.slugs: list[str] = []
+        self.logo_paths: set[str] = set()
+        self.facets: dict[str, set[str]] = {"sectors": set(), "stages": set(), "statuses": set(), "founders": set()}
+        self.keys: list[tuple[str, set[str]]] = []
+        self.domains: list[tuple[str, str]] = []
+        self.schema = _compiled_schema()
+
+    def check_company(self, c: dict[str, Any], full: bool = True) -> None:
+        """Fold a record into the dataset-level checks; with full=True also check the record itself."""
+        if full:
+            if not c.get("name"):
+                self.errors.append(f"Company missing name: {c.get('id', '?')}")
+            if not c.get("slug"):
+                self.errors.append(f"Company missing slug: {c.get('name', '?')}")
+            if not c.get("id"):
+                self.errors.append(f"Company missing id: {c.get('name', '?')}")
+            evidence = c.get("source_evidence", {})
+            if not evidence.get("in_investment_list"):
+                self.errors.append(f"Company {c.get('name')} missing in_investment_list=true")
+            if self.schema is not None:
+                from jsonschema.exceptions import best_match
+
+                error = best_match(self.schema.iter_errors(c))
+                if error is not None:
+                    self.errors.append(f"Schema fail: {c.get('name')}: {error.message[:80]}")
+
+        self.count += 1
+        self.ids.add(c.get("id"))
+        if c.get("slug"):
+            self.slugs.append(c["slug"])
+            self.keys.append((c["slug"], company_keys(c)))
+        if c.get("id") and (domain := registrable_domain(c.get("website"))):
+            self.domains.append((c["id"], domain))
+        if c.get("logo_path"):
+            self.logo_paths.add(c["logo_path"])
+        if c.get("id"):
+            self.facets["sectors"].update(c.get("sectors", []))
+            self.facets["stages"].update(c.get("stages", []))
+            status = c.get("status", "unknown")
+            if status:
+                self.facets["statuses"].add(status)
+            for name in c.get("founders", []):
+                if key := founder_key(name):
+                    self.facets["founders"].add(shard_of(key))
+
+    def check_meta(self, meta: dict[str, Any]) -> None:
+        total = meta.get("total_companies", 0)
+        if total < MIN_COMPANIES:
+            self.errors.append(f"total_companies={total} is below minimum {MIN_COMPANIES}")
+        if self.count != total:
+            self.errors.append(f"all.json has {self.count} but meta says {total}")
+
+    def check_files(self, exists: Callable[[str], bool]) -> None:
+        """Check that the per-company, logo and index files exist (paths relative to docs/)."""
+        missing_slugs = sum(1 for slug in self.slugs if not exists(company_path(slug, self.layout)))
+        if missing_slugs:
+            self.errors.append(f"{missing_slugs} individual company files missing")
+
+        missing_logos = sum(1 for path in self.logo_paths if not exists(path))
+        if missing_logos:
+            self.errors.append(f"{missing_logos} mirrored logo files missing")
+
+        # Index consistency: every sector/stage/status/founder shard referenced by companies has an index file
+        labels = {"sectors": "sector", "stages": "stage", "statuses": "status", "founders": "founder shard"}
+        for kind, values in self.facets.items():
+            for value in sorted(values):
+                if not exists(f"{kind}/{value}.json"):
+                    self.errors.append(f"Missing {labels[kind]} index: {value}")
+
+    def check_related(self, related: dict[str, Any]) -> None:
+        """Check that the related-companies index only references known companies."""
+        related = related["related"]
+        if set(related) != self.ids:
+            self.errors.append(f"related.json covers {len(related)} companies, all.json has {len(self.ids)}")
+        dangling = sum(1 for entries in related.values() for r in entries if r["id"] not in self.ids)
+        if dangling:
+            self.errors.append(f"related.json has {dangling} references to unknown companies")
+
+    def check_packed(self, packed: PackedDataset) -> None:
+        """Check that companies/all.bin holds the same records as all.json."""
+        if len(packed) != self.count:
+            self.errors.append(f"all.bin has {len(packed)} records, all.json has {self.count}")
+        elif list(packed.slugs()) != sorted(self.slugs):
+            self.errors.append("all.bin slugs differ from all.json")
+
+    def check_membership(self, names: NameIndex) -> None:
+        """Check that the membership files cover every company under its canonical keys."""
+        unfindable = sum(1 for slug, keys in self.keys if any(slug not in names.lookup(k) for k in keys))
+        if unfindable:
+            self.errors.append(f"{unfindable} companies not found under their own names in names.bloom/aliases.json")
+
+    def check_domains(self, domains: DomainIndex) -> None:
+        """Check that the domain index maps every company's website domain to it."""
+        missing = sum(1 for company_id, domain in self.domains if company_id not in domains.lookup(domain))
+        if missing:
+            self.errors.append(f"{missing} companies not found under their website domain in domains.json")
+        expected = len({domain for _, domain in self.domains})
+        if len(domains) != expected:
+            self.errors.append(f"domains.json has {len(domains)} domains, all.json has {expected}")
+
+    def check_bundle(self, path: str, meta_bytes: bytes, files: Iterable[str]) -> None:
+        """Check that the bundle at `path` holds this build's meta.json and exactly `files` (the rest of docs/)."""
+        try:
+            with BundleReader.open(path) as bundle:
+                if "meta.json" not in bundle or bundle.read("meta.json") != meta_bytes:
+                    self.errors.append(f"{BUNDLE_NAME} does not hold the current meta.json")
+                held = set(bundle)
+        except (ValueError, OSError, zlib.error) as e:
+            self.errors.append(f"{BUNDLE_NAME} is unreadable: {e}")
+            return
+        files = set(files)
+        if missing := len(files - held):
+            self.errors.append(f"{BUNDLE_NAME} is missing {missing} files of the build")
+        if extra := len(held - files):
+            self.errors.append(f"{BUNDLE_NAME} holds {extra} files that are not in the build")
+
+    def check_history(self, tables: dict[str, dict[str, Any]], meta: dict[str, Any]) -> None:
+        """Check that the stats history tables are well-formed and hold this build's row."""
+        built_at = meta.get("last_updated_iso")
+        expected = {HISTORY_PATH: metrics_row(meta), **{facet_path(f): meta.get(c) or {} for f, c in FACETS.items()}}
+        for rel, row in expected.items():
+            table = tables.get(rel)
+            if table is None:
+                self.errors.append(f"{rel} missing")
+                continue
+            times, columns = table.get("built_at", []), table.get("columns", {})
+            if table.get("count") != len(times) or any(len(values) != len(times) for values in columns.values()):
+                self.errors.append(f"{rel} columns do not all have {table.get('count')} rows")
+                continue
+            if any(a >= b for a, b in zip(times, times[1:])):
+                self.errors.append(f"{rel} rows are not in build order")
+            if built_at not in times:
+                self.errors.append(f"{rel} has no row for this build ({built_at})")
+                continue
+            i = times.index(built_at)
+            if any(columns.get(name, [None] * len(times))[i] != value for name, value in row.items()):
+                self.errors.append(f"{rel} row for this build does not match meta.json")
+
+    def check_sort(self, index: dict[str, Any], pages: list[dict[str, Any] | None]) -> None:
+        """Check that a sort order is a permutation of the records and that its pages slice it."""
+        key, order = index.get("key"), index.get("order", [])
+        if not is_permutation(order, self.count):
+            self.errors.append(f"sorts/{key}.json is not a permutation of the {self.count} records")
+            return
+        if len(pages) != index.get("pages"):
+            self.errors.append(f"sorts/{key}.json lists {index.get('pages')} pages, {len(pages)} written")
+            return
+        sliced, unknown = [], 0
+        for page in pages:
+            if page is None:
+                self.errors.append(f"sorts/{key}/ has a missing page")
+                return
+            sliced.extend(page["ordinals"])
+            unknown += sum(1 for company_id in page["companies"] if company_id not in self.ids)
+        if sliced != order:
+            self.errors.append(f"sorts/{key}/ pages do not match the order in sorts/{key}.json")
+        if unknown:
+            self.errors.append(f"sorts/{key}/ pages have {unknown} references to unknown companies")
+
+    def finish(self) -> tuple[bool, list[str]]:
+        return len(self.errors) == 0, self.errors
+
+
+class Manifest:
+    """Size, modification time and SHA-256 of each validated file, keyed by path relative to docs/."""
+
+    def __init__(self, docs_dir: str, files: dict[str, list] | None = None, baseline: "Manifest | None" = None):
+        self.docs_dir = docs_dir
+        self.files: dict[str, list] = files if files is not None else {}
+        # What a writer recording into this manifest may assume is already on disk
+        self.baseline = baseline
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.docs_dir).replace(os.sep, "/")
 
-def _load(path):
-    with open(path) as f:
-        return json.load(f)
+    @staticmethod
+    def _path(docs_dir: str) -> str:
+        key = hashlib.sha256(os.path.realpath(docs_dir).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(MANIFEST_DIR, f"{key}.json")
 
+    @classmethod
+    def load(cls, docs_dir: str) -> "Manifest":
+        """The manifest of the last passing validation of docs_dir (empty if there is none)."""
+        try:
+            return cls(docs_dir, _load(cls._path(docs_dir))["files"])
+        except (OSError, ValueError, KeyError):
+            return cls(docs_dir)
 
-def validate() -> tuple[bool, list[str]]:
-    """Run all validation checks. Returns (passed, list of error messages)."""
-    errors = []
+    def save(self) -> None:
+        path = self._path(self.docs_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(dumps({"docs_dir": os.path.realpath(self.docs_dir), "files": self.files}, pretty=False))
+        os.replace(path + ".tmp", path)
 
-    # 1. meta.json exists and is valid
-    meta_path = os.path.join(DOCS_DIR, "meta.json")
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.files
+
+    def digest(self, rel: str) -> str | None:
+        entry = self.files.get(rel)
+        return entry[2] if entry else None
+
+    def holds(self, path: str, digest: str) -> bool:
+        """Whether the file at path still has the content hash, size and modification time recorded here."""
+        entry = self.files.get(self._rel(path))
+        if entry is None or entry[2] != digest:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return entry[:2] == [st.st_size, st.st_mtime_ns]
+
+    def add(self, path: str, digest: str) -> None:
+        """Record a file just written under docs/ with its content hash (ignored outside VALIDATED_PATHS)."""
+        rel = self._rel(path)
+        if rel.split("/", 1)[0] not in VALIDATED_PATHS:
+            return
+        st = os.stat(path)
+        self.files[rel] = [st.st_size, st.st_mtime_ns, digest]
+
+    def add_existing(self, path: str) -> None:
+        """Record a file already under docs/; hashed unless the baseline holds it at the same size and mtime."""
+        rel = self._rel(path)
+        if rel.split("/", 1)[0] not in VALIDATED_PATHS:
+            return
+        st = os.stat(path)
+        entry = self.baseline.files.get(rel) if self.baseline is not None else None
+        if entry is None or entry[:2] != [st.st_size, st.st_mtime_ns]:
+            with open(path, "rb") as f:
+                entry = [st.st_size, st.st_mtime_ns, hashlib.sha256(f.read()).hexdigest()]
+        self.files[rel] = entry
+
+    def scan(self) -> tuple["Manifest", set[str]]:
+        """The manifest of docs/ as it is now, and the paths added, changed or removed since this one.
+
+        Files whose size and modification time match are assumed unchanged
+        without being read; the rest are hashed.
+        """
+        current = Manifest(self.docs_dir)
+        for top in VALIDATED_PATHS:
+            top_path = os.path.join(self.docs_dir, top)
+            if os.path.isfile(top_path):
+                paths = [top_path]
+            else:
+                paths = [os.path.join(d, name) for d, _, names in os.walk(top_path) for name in names]
+            for path in paths:
+                rel = self._rel(path)
+                st = os.stat(path)
+                previous = self.files.get(rel)
+                if previous and previous[:2] == [st.st_size, st.st_mtime_ns]:
+                    current.files[rel] = previous
+                    continue
+                with open(path, "rb") as f:
+                    current.files[rel] = [st.st_size, st.st_mtime_ns, hashlib.sha256(f.read()).hexdigest()]
+        changed = {rel for rel in current.files.keys() | self.files.keys() if current.digest(rel) != self.digest(rel)}
+        return current, changed
+
+
+def record_digest(company: dict[str, Any]) -> str:
+    """SHA-256 of a record as the build writes it to its companies/ file."""
+    return hashlib.sha256(dumps(company) + b"\n").hexdigest()
+
+
+def validate(docs_dir: str = DOCS_DIR, incremental: bool = False) -> tuple[bool, list[str]]:
+    """Run all validation checks. Returns (passed, list of error messages).
+
+    With incremental=True, nothing is re-checked if no file changed since the
+    last passing validation, and otherwise only records whose own file
+    under companies/ changed are checked individually.
+    """
+    previous = Manifest.load(docs_dir)
+    current, changed = previous.scan()
+    if incremental and previous.files and not changed:
+        return True, []
+
+    # 1. meta.json exists
+    meta_path = os.path.join(docs_dir, "meta.json")
     if not os.path.exists(meta_path):
-        errors.append("meta.json missing")
-        return False, errors
+        return False, ["meta.json missing"]
     meta = _load(meta_path)
 
-    total = meta.get("total_companies", 0)
-    if total < MIN_COMPANIES:
-        errors.append(f"total_companies={total} is below minimum {MIN_COMPANIES}")
-
-    # 2. all.json exists and has correct count
-    all_path = os.path.join(DOCS_DIR, "companies", "all.json")
+    # 2. all.json exists
+    all_path = os.path.join(docs_dir, "companies", "all.json")
     if not os.path.exists(all_path):
-        errors.append("companies/all.json missing")
-        return False, errors
+        return False, ["companies/all.json missing"]
     companies = _load(all_path)
 
-    if len(companies) != total:
-        errors.append(f"all.json has {len(companies)} but meta says {total}")
-
-    # 3. Every company has required fields
+    # 3. Every company has required fields and matches the schema (facets are aggregated in the same pass)
+    layout = layout_of(meta)
+    if layout not in PATTERNS:
+        return False, [f"meta.json declares an unknown record_layout: {layout!r}"]
+    validator = Validator(layout)
     for c in companies:
-        if not c.get("name"):
-            errors.append(f"Company missing name: {c.get('id', '?')}")
-        if not c.get("slug"):
-            errors.append(f"Company missing slug: {c.get('name', '?')}")
-        if not c.get("id"):
-            errors.append(f"Company missing id: {c.get('name', '?')}")
-        evidence = c.get("source_evidence", {})
-        if not evidence.get("in_investment_list"):
-            errors.append(f"Company {c.get('name')} missing in_investment_list=true")
-
-    # 4. Schema validation (sample of 100)
-    try:
-        import jsonschema
-        schema = _load(SCHEMA_PATH)
-        for c in companies[:100]:
-            try:
-                jsonschema.validate(c, schema)
-            except jsonschema.ValidationError as e:
-                errors.append(f"Schema fail: {c['name']}: {e.message[:80]}")
-    except ImportError:
-        pass  # jsonschema not available, skip
+        rel = company_path(c.get("slug") or "", layout)
+        unchanged = incremental and previous.digest(rel) == record_digest(c)
+        validator.check_company(c, full=not unchanged)
 
-    # 5. Individual slug files exist for all companies
-    missing_slugs = 0
-    for c in companies:
-        slug_path = os.path.join(DOCS_DIR, "companies", f"{c['slug']}.json")
-        if not os.path.exists(slug_path):
-            missing_slugs += 1
-    if missing_slugs:
-        errors.append(f"{missing_slugs} individual company files missing")
-
-    # 6. Index consistency: every sector/stage/status referenced by companies has an index file
-    all_sectors = set()
-    all_stages = set()
-    all_statuses = set()
-    for c in companies:
-        for s in c.get("sectors", []):
-            all_sectors.add(s)
-        for s in c.get("stages", []):
-            all_stages.add(s)
-        status = c.get("status")
-        if status:
-            all_statuses.add(status)
-
-    for s in all_sectors:
-        if not os.path.exists(os.path.join(DOCS_DIR, "sectors", f"{s}.json")):
-            errors.append(f"Missing sector index: {s}")
-    for s in all_stages:
-        if not os.path.exists(os.path.join(DOCS_DIR, "stages", f"{s}.json")):
-            errors.append(f"Missing stage index: {s}")
-    for s in all_statuses:
-        if not os.path.exists(os.path.join(DOCS_DIR, "statuses", f"{s}.json")):
-            errors.append(f"Missing status index: {s}")
-
-    passed = len(errors) == 0
+    # 4. Counts agree with meta.json
+    validator.check_meta(meta)
+
+    # 5. Company, logo and index files exist
+    validator.check_files(lambda rel: rel in current or os.path.exists(os.path.join(docs_dir, rel)))
+
+    # 6. Related-companies index only references known companies
+    related_path = os.path.join(docs_dir, "companies", "related.json")
+    if os.path.exists(related_path):
+        validator.check_related(_load(related_path))
+
+    # 7. The binary dataset holds the same records
+    packed_path = os.path.join(docs_dir, "companies", "all.bin")
+    if os.path.exists(packed_path):
+        with PackedDataset.open(packed_path) as packed:
+            validator.check_packed(packed)
+
+    # 8. Domain index maps every website domain to its companies
+    domains_path = os.path.join(docs_dir, "companies", "domains.json")
+    if os.path.exists(domains_path):
+        validator.check_domains(DomainIndex.load(domains_path))
+
+    # 9. Sort orders are permutations of the records, sliced into their pages
+    for key in SORT_KEYS:
+        sort_path = os.path.join(docs_dir, "sorts", f"{key}.json")
+        if os.path.exists(sort_path):
+            index = _load(sort_path)
+            pages = []
+            for page in range(1, index.get("pages", 0) + 1):
+                page_path = os.path.join(docs_dir, "sorts", key, f"{page}.json")
+                pages.append(_load(page_path) if os.path.exists(page_path) else None)
+            validator.check_sort(index, pages)
+
+    # 10. The bundle holds this build
+    bundle_path = os.path.join(docs_dir, BUNDLE_NAME)
+    if os.path.exists(bundle_path):
+        with open(meta_path, "rb") as f:
+            meta_bytes = f.read()
+        validator.check_bundle(bundle_path, meta_bytes, bundle_paths(docs_dir))
+
+    # 11. The stats history holds this build's row
+    history = load_history(docs_dir)
+    if history:
+        validator.check_history(history, meta)
+
+    # 12. Membership files cover every company under its canonical keys
+    bloom_path = os.path.join(docs_dir, "companies", "names.bloom")
+    aliases_path = os.path.join(docs_dir, "companies", "aliases.json")
+    if os.path.exists(bloom_path) and os.path.exists(aliases_path):
+        validator.check_membership(NameIndex.load(bloom_path, aliases_path))
+    elif os.path.exists(bloom_path) or os.path.exists(aliases_path):
+        validator.errors.append("companies/names.bloom or companies/aliases.json missing")
+
+    passed, errors = validator.finish()
+    if passed:
+        current.save()
     return passed, errors
 
 
 def main():
     print("=== Validating Build Output ===")
-    passed, errors = validate()
+    passed, errors = validate(incremental="--incremental" in sys.argv[1:])
     if errors:
         for e in errors:
             print(f"  ERROR: {e}")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Time and memory budgets for the extractors on generated adversarial pages.
+
+Every page in src/bench/adversarial.py is extracted at size n and 4n. The
+extractor must stay above a minimum throughput, keep its peak allocation
+within a multiple of the page size, and take at most 8x as long on the
+larger page (a linear extractor takes 4x, a quadratic one 16x).
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.bench.adversarial import PORTFOLIO_PAGES, ROSTER_PAGES
+from src.extract.investment_list import InvestmentListExtractor
+from src.extract.portfolio import PortfolioExtractor
+from src.normalize.clock import fixed_clock
+
+# Base size per page; each is also extracted at 4x this size
+SIZES = {
+    "huge_list": 2000,
+    "many_headings": 1000,
+    "deep_nesting": 4000,
+    "stray_end_tags": 4000,
+    "entity_names": 1000,
+    "long_name": 400_000,
+    "big_blob": 2000,
+    "entity_blob": 1000,
+    "near_misses": 50_000,
+    "deep_json": 20_000,
+}
+# Minimum throughput (bytes/s) and maximum peak allocation (multiple of page bytes)
+ROSTER_BUDGET = (250_000, 64)
+PORTFOLIO_BUDGET = (2_000_000, 10)
+MAX_GROWTH = 8  # time(4n) / time(n)
+MIN_TIMED = 0.002  # shorter timings are noise, so growth is measured against at least this
+
+
+def _best_time(extract, page: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            extract(page)
+        except (ValueError, RecursionError):
+            pass  # rejecting the page is fine, as long as it is quick
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_bytes(extract, page: str) -> int:
+    tracemalloc.start()
+    try:
+        extract(page)
+    except (ValueError, RecursionError):
+        pass
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak
+
+
+def _check(pages: dict, extract, budget: tuple[int, int]) -> list[str]:
+    min_rate, max_memory = budget
+    failures = []
+    for name, generate in pages.items():
+        small, large = generate(SIZES[name]), generate(4 * SIZES[name])
+        times = [_best_time(extract, page) for page in (small, large)]
+        for page, seconds in zip((small, large), times):
+            if seconds > len(page) / min_rate:
+                failures.append(f"{name}: {len(page)} bytes took {seconds * 1000:.0f}ms")
+        growth = times[1] / max(times[0], MIN_TIMED)
+        if growth > MAX_GROWTH:
+            failures.append(f"{name}: 4x the input took {growth:.1f}x the time")
+        peak = _peak_bytes(extract, large)
+        if peak > max_memory * len(large):
+            failures.append(f"{name}: peak {peak} bytes for a {len(large)}-byte page")
+        print(f"  {name}: {len(large) // 1024}KB in {times[1] * 1000:.0f}ms ({growth:.1f}x for 4x input), peak {peak / len(large):.1f}x")
+    return failures
+
+
+def test_roster_extractor_budgets():
+    extractor = InvestmentListExtractor(clock=fixed_clock("2026-01-01T00:00:00Z"))
+    failures = _check(ROSTER_PAGES, extractor.extract_companies, ROSTER_BUDGET)
+    assert not failures, failures
+    # The generated entries are still found
+    assert len(extractor.extract_companies(ROSTER_PAGES["stray_end_tags"](1000))) == 10
+    assert [c["letter_group"] for c in extractor.extract_companies(ROSTER_PAGES["many_headings"](3))] == ["G0", "G1", "G2"]
+    print("PASS: roster extraction is linear and within budget on every adversarial page")
+    return True
+
+
+def test_portfolio_extractor_budgets():
+    extractor = PortfolioExtractor()
+    failures = _check(PORTFOLIO_PAGES, extractor.extract_data, PORTFOLIO_BUDGET)
+    assert not failures, failures
+    assert len(extractor.extract_data(PORTFOLIO_PAGES["entity_blob"](5))["companies"]) == 5
+    assert extractor.extract_data(PORTFOLIO_PAGES["near_misses"](100)) == {"companies": []}
+    print("PASS: portfolio extraction is linear and within budget on every adversarial page")
+    return True
+
+
+def main():
+    print("=== Testing Extractors on Adversarial Pages ===")
+    tests = [test_roster_extractor_budgets, test_portfolio_extractor_budgets]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
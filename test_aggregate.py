@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test the single-pass Aggregator against naive counts over all.json."""
+
+import json
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.build.aggregate import COVERAGE_FIELDS, Aggregator, _has
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _companies():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        companies = json.load(f)
+    # Edge cases the portfolio may not contain: no facets at all, and several of each
+    return companies + [
+        {"id": "t:bare", "name": "Bare"},
+        {"id": "t:multi", "name": "Multi", "sectors": ["ai", "bio"], "stages": ["seed", "growth"], "status": "active"},
+    ]
+
+
+def test_crosstab_matches_naive_count():
+    companies = _companies()
+    crosstab = Aggregator().add_all(companies).crosstab()
+    assert crosstab["total_companies"] == len(companies)
+
+    expected = Counter()
+    for company in companies:
+        status = company.get("status", "unknown")
+        for sector in company.get("sectors") or [None]:
+            for stage in company.get("stages") or [None]:
+                expected[(sector, stage, status)] += 1
+    cells = [(c["sector"], c["stage"], c["status"]) for c in crosstab["counts"]]
+    assert len(cells) == len(set(cells)), "each cell appears once"
+    assert {cell: c["count"] for cell, c in zip(cells, crosstab["counts"])} == dict(expected)
+    assert expected[(None, None, "unknown")] >= 1 and expected[("bio", "growth", "active")] >= 1
+    print(f"PASS: {len(cells)} cross-tab cells match a naive count over {len(companies)} companies")
+    return True
+
+
+def test_counts_and_coverage_match_naive_count():
+    companies = _companies()
+    stats = Aggregator().add_all(companies)
+    for facet, field in (("sectors", "sectors"), ("stages", "stages")):
+        assert stats.counts(facet) == dict(Counter(v for c in companies for v in c.get(field, []))), facet
+    assert stats.counts("statuses") == dict(Counter(c.get("status", "unknown") for c in companies))
+
+    for key, field in COVERAGE_FIELDS.items():
+        with_field = sum(1 for c in companies if _has(c, field))
+        assert stats.coverage_metrics()[f"pct_with_{key}"] == round(100 * with_field / len(companies), 1), key
+
+    by_sector = stats.crosstab()["coverage_by_sector"]
+    for sector, coverage in by_sector.items():
+        members = [c for c in companies if sector in c.get("sectors", [])]
+        assert coverage["total"] == len(members), sector
+        with_description = sum(1 for c in members if c.get("description"))
+        assert coverage["pct_with_description"] == round(100 * with_description / len(members), 1), sector
+    print(f"PASS: facet counts and coverage for {len(by_sector)} sectors match naive counts")
+    return True
+
+
+def main():
+    print("=== Testing Aggregator ===")
+    tests = [test_crosstab_matches_naive_count, test_counts_and_coverage_match_naive_count]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
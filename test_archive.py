@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Test recording source pages to an archive and replaying them."""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.extract.archive import SourceArchive, latest_archive
+from src.extract.investment_list import INVESTMENT_LIST_URL, InvestmentListExtractor
+from src.extract.portfolio import PORTFOLIO_URL, PortfolioExtractor
+from src.normalize.clock import fixed_clock, now_iso
+
+RECORDED_ISO = "2026-03-06T06:34:46Z"
+PAGES = {INVESTMENT_LIST_URL: "<ul><li>Acme</li></ul>", PORTFOLIO_URL: '<div data-json="{}">é</div>'}
+
+
+def test_record_and_replay_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SourceArchive.record(tmp, clock=fixed_clock(RECORDED_ISO))
+        assert archive.path == os.path.join(tmp, "2026-03-06.json.gz") and not archive.replaying
+        assert archive.clock is None
+        for url, text in PAGES.items():
+            archive.put(url, text)
+        with open(archive.path, "rb") as f:
+            recorded = f.read()
+        # Saving the same pages again writes the same bytes
+        archive.save()
+        with open(archive.path, "rb") as f:
+            assert f.read() == recorded
+        assert not os.path.exists(archive.path + ".tmp")
+
+        replayed = SourceArchive.replay(archive.path)
+        assert replayed.replaying and replayed.recorded_iso == RECORDED_ISO and replayed.pages == PAGES
+        assert now_iso(replayed.clock) == RECORDED_ISO
+        # Extractors read from the archive instead of the network and take its clock
+        assert InvestmentListExtractor(replayed).fetch_page(INVESTMENT_LIST_URL) == PAGES[INVESTMENT_LIST_URL]
+        assert PortfolioExtractor(replayed).fetch_page_if_changed(PORTFOLIO_URL) == PAGES[PORTFOLIO_URL]
+        assert now_iso(InvestmentListExtractor(replayed).clock) == RECORDED_ISO
+    print("PASS: recorded pages, time and clock survive a save and replay")
+    return True
+
+
+def test_replay_miss_and_unsupported_format():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SourceArchive(os.path.join(tmp, "2026-03-06.json.gz"), False, RECORDED_ISO, {PORTFOLIO_URL: "x"})
+        archive.save()
+        replayed = SourceArchive.replay(archive.path)
+        for fetch in (replayed.get, InvestmentListExtractor(replayed).fetch_page):
+            try:
+                fetch(INVESTMENT_LIST_URL)
+            except KeyError as e:
+                assert INVESTMENT_LIST_URL in str(e)
+            else:
+                raise AssertionError("a page missing from the archive should raise KeyError")
+
+        future = os.path.join(tmp, "2026-03-07.json.gz")
+        with gzip.open(future, "wt", encoding="utf-8") as f:
+            json.dump({"format_version": 99, "recorded_iso": RECORDED_ISO, "pages": {}}, f)
+        try:
+            SourceArchive.replay(future)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an unsupported archive format should be rejected")
+        assert latest_archive(tmp) == future
+        assert latest_archive(os.path.join(tmp, "empty")) is None
+    print("PASS: a replay miss raises KeyError and unknown formats are rejected")
+    return True
+
+
+def main():
+    print("=== Testing Source Archive ===")
+    tests = [test_record_and_replay_round_trip, test_replay_miss_and_unsupported_format]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
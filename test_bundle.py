@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Test the single-file api.bundle mirror."""
+
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats import bundle as bundle_format
+from src.formats.bundle import STORED, BundleReader, train_dictionary, write_bundle
+from src.formats.layout import company_path
+from src.validate.validate_build import Validator
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _companies():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        return json.load(f)
+
+
+def _record_files(count=300):
+    """(path, content) pairs for the first `count` checked-in company files."""
+    files = []
+    for company in _companies()[:count]:
+        path = company_path(company["slug"])
+        with open(os.path.join(DOCS, path), "rb") as f:
+            files.append((path, f.read()))
+    return files
+
+
+def _bundle(files, dictionary):
+    f = io.BytesIO()
+    totals = write_bundle(f, files, dictionary)
+    f.seek(0)
+    return BundleReader(f), totals
+
+
+def test_round_trip():
+    files = _record_files() + [("meta.json", b'{"total": 0}\n'), ("logos/x.png", os.urandom(512))]
+    reader, totals = _bundle(files, train_dictionary(content for _, content in files))
+    assert len(reader) == totals["files"] == len(files)
+    assert list(reader) == sorted(path for path, _ in files)
+    for path, content in files:
+        assert path in reader and reader.read(path) == content and reader.size(path) == len(content)
+    assert "companies/no-such-company.json" not in reader
+    try:
+        reader.read("companies/no-such-company.json")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("reading a missing file should raise KeyError")
+    # Random bytes do not compress, so they are stored as they are
+    assert reader._index["methods"][reader._find("logos/x.png")] == STORED
+    print(f"PASS: {len(files)} files round-trip ({totals['size']} bytes in {totals['compressed']})")
+    return True
+
+
+def test_dictionary_shrinks_small_records():
+    files = _record_files()
+    dictionary = train_dictionary(content for _, content in files)
+    assert 0 < len(dictionary) <= bundle_format.DICTIONARY_SIZE
+    _, plain = _bundle(files, b"")
+    _, trained = _bundle(files, dictionary)
+    # The dictionary is stored once; each record still has to shrink by more than its share
+    assert trained["compressed"] < plain["compressed"] * 0.8, (trained, plain)
+    print(f"PASS: dictionary shrinks {len(files)} records from {plain['compressed']} to {trained['compressed']} bytes")
+    return True
+
+
+def test_corruption_and_unsafe_paths():
+    f = io.BytesIO()
+    write_bundle(f, [("meta.json", b'{"total": 1}\n' * 20)], b"")
+    data = bytearray(f.getvalue())
+    index_offset = len(data) - 20
+    # Not a bundle, truncated inside the header, truncated inside the index, a damaged index
+    broken_bundles = (b"PK\x03\x04" + b"\0" * 60, data[:20], data[:-5], data[:index_offset] + b"x" * 20)
+    for broken in map(bytes, broken_bundles):
+        try:
+            BundleReader(io.BytesIO(broken))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"a broken bundle should be rejected: {broken[:12]!r}")
+
+    reader = BundleReader(io.BytesIO(bytes(data)))
+    offset = reader._index["offsets"][0]
+    data[offset : offset + 4] = b"\xff" * 4
+    try:
+        BundleReader(io.BytesIO(bytes(data))).read("meta.json")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a damaged entry should not be returned")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reader, _ = _bundle([("../outside.json", b"{}")], b"")
+        try:
+            reader.extract_all(os.path.join(tmp, "mirror"))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("extract_all should refuse paths outside the destination")
+        assert not os.path.exists(os.path.join(tmp, "outside.json"))
+    print("PASS: foreign files, damaged entries and unsafe paths are rejected")
+    return True
+
+
+def _write_file(path, files):
+    with open(path, "wb") as f:
+        write_bundle(f, files, b"")
+
+
+def test_validator_checks_bundle_contents():
+    files = _record_files(50)
+    meta = b'{"total": 50}\n'
+    on_disk = [path for path, _ in files] + ["meta.json"]
+    validator = Validator()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "api.bundle")
+        _write_file(path, files + [("meta.json", meta)])
+        validator.check_bundle(path, meta, on_disk)
+        assert validator.errors == [], validator.errors
+
+        # A stale meta.json, a file deleted since (still bundled) and a file added since (not bundled)
+        _write_file(path, files + [("meta.json", b"{}\n")])
+        validator.check_bundle(path, meta, on_disk[1:] + ["companies/new.json"])
+        with open(path, "r+b") as f:
+            f.truncate(30)
+        validator.check_bundle(path, meta, on_disk)
+        validator.check_bundle(os.path.join(tmp, "missing.bundle"), meta, on_disk)
+    assert validator.errors[:3] == [
+        "api.bundle does not hold the current meta.json",
+        "api.bundle is missing 1 files of the build",
+        "api.bundle holds 1 files that are not in the build",
+    ], validator.errors
+    assert len(validator.errors) == 5 and all(e.startswith("api.bundle is unreadable: ") for e in validator.errors[3:])
+    print("PASS: the validator reports a stale, incomplete or unreadable bundle")
+    return True
+
+
+def main():
+    print("=== Testing API Bundle ===")
+    tests = [
+        test_round_trip,
+        test_dictionary_shrinks_small_records,
+        test_corruption_and_unsafe_paths,
+        test_validator_checks_bundle_contents,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
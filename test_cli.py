@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test the subcommand CLI: lazy imports and startup time budget."""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Wall-clock budget for importing main.py and parsing a read-only subcommand
+IMPORT_BUDGET_MS = 50
+HEAVY_MODULES = ("requests", "jsonschema", "src.extract.investment_list", "src.build.build_dataset")
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_read_only_commands_skip_heavy_imports():
+    for command in ("stats", "query --limit 1"):
+        out = _run(
+            "import sys, main\n"
+            f"main.main({command.split()!r})\n"
+            f"print('LOADED', [m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        loaded = out.rsplit("LOADED", 1)[1].strip()
+        assert loaded == "[]", f"`{command}` imported {loaded}"
+    print("PASS: stats/query do not import build dependencies")
+    return True
+
+
+def test_import_time_budget():
+    out = _run(
+        "import time\n"
+        "t0 = time.perf_counter()\n"
+        "import main\n"
+        "main.make_parser().parse_args(['stats'])\n"
+        "print((time.perf_counter() - t0) * 1000)\n"
+    )
+    elapsed_ms = float(out.strip())
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"CLI startup took {elapsed_ms:.1f}ms (budget {IMPORT_BUDGET_MS}ms)"
+    print(f"PASS: CLI startup {elapsed_ms:.1f}ms (budget {IMPORT_BUDGET_MS}ms)")
+    return True
+
+
+def main():
+    print("=== Testing CLI ===")
+    tests = [test_read_only_commands_skip_heavy_imports, test_import_time_budget]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
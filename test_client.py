@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Test the API client's conditional meta.json requests, per-build disk cache and record LRU."""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.client.client import ApiClient
+from src.formats.layout import company_path
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+class _Static(BaseHTTPRequestHandler):
+    """Serves `root` with strong ETags and logs (path, status) of every request."""
+
+    root = ""
+    log: list[tuple[str, int]] = []
+
+    def do_GET(self):
+        path = os.path.join(self.root, self.path.lstrip("/"))
+        if not os.path.isfile(path):
+            self._reply(404, b"")
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, b"", etag)
+        else:
+            self._reply(200, body, etag)
+
+    def _reply(self, status, body, etag=None):
+        _Static.log.append((self.path, status))
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _slugs(count):
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        return [c["slug"] for c in json.load(f)[:count]]
+
+
+def _serve(tmp, slugs):
+    """A docs/ holding meta.json and a few company records, served over HTTP."""
+    root = os.path.join(tmp, "site")
+    os.makedirs(os.path.join(root, "companies"))
+    shutil.copy(os.path.join(DOCS, "meta.json"), root)
+    for slug in slugs:
+        shutil.copy(os.path.join(DOCS, company_path(slug)), os.path.join(root, company_path(slug)))
+    _Static.root, _Static.log = root, []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Static)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, root, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def _republish(root, last_updated_iso):
+    with open(os.path.join(root, "meta.json")) as f:
+        meta = json.load(f)
+    meta["last_updated_iso"] = last_updated_iso
+    with open(os.path.join(root, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def test_meta_revalidation_and_build_cache():
+    slug = _slugs(1)[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        server, root, url = _serve(tmp, [slug])
+        cache = os.path.join(tmp, "cache")
+        try:
+            assert ApiClient(url, cache_dir=cache).company(slug)["slug"] == slug
+            assert _Static.log == [("/meta.json", 200), ("/" + company_path(slug), 200)]
+
+            # A warm start against an unchanged build: one 304, the record comes from disk
+            _Static.log.clear()
+            assert ApiClient(url, cache_dir=cache).company(slug)["slug"] == slug
+            assert _Static.log == [("/meta.json", 304)], _Static.log
+            old_build = os.listdir(os.path.join(cache, "builds"))
+
+            # A new build: meta.json is downloaded again and the old build's files are pruned
+            _republish(root, "2027-01-01T00:00:00Z")
+            _Static.log.clear()
+            client = ApiClient(url, cache_dir=cache)
+            assert client.meta()["last_updated_iso"] == "2027-01-01T00:00:00Z"
+            assert _Static.log == [("/meta.json", 200)], _Static.log
+            assert os.listdir(os.path.join(cache, "builds")) == [], "the previous build's cache is pruned"
+            assert client.company(slug)["slug"] == slug
+            new_build = os.listdir(os.path.join(cache, "builds"))
+            assert len(new_build) == 1 and new_build != old_build
+            assert _Static.log[-1] == ("/" + company_path(slug), 200)
+        finally:
+            server.shutdown()
+    print("PASS: meta.json is revalidated with a 304 and files are cached per build, old builds pruned")
+    return True
+
+
+def test_lru_eviction_and_refresh():
+    slugs = _slugs(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        server, root, url = _serve(tmp, slugs)
+        try:
+            client = ApiClient(url, cache_dir=os.path.join(tmp, "cache"), lru_size=2)
+            for slug in slugs:
+                client.company(slug)
+            assert list(client._lru) == slugs[1:]
+            # A hit moves the record to the back; the evicted record is read back from the disk cache
+            client.company(slugs[1])
+            _Static.log.clear()
+            assert client.company(slugs[0])["slug"] == slugs[0]
+            assert list(client._lru) == [slugs[1], slugs[0]] and _Static.log == []
+            assert client.company("no-such-company") is None and "no-such-company" in client._lru
+
+            # Refreshing onto a new build empties the LRU
+            _republish(root, "2027-01-01T00:00:00Z")
+            client.meta(refresh=True)
+            assert len(client._lru) == 0
+        finally:
+            server.shutdown()
+    print("PASS: the record LRU evicts the least recently used slug and is cleared on a new build")
+    return True
+
+
+def test_many_records_come_from_all_json():
+    slugs = _slugs(20)
+    with tempfile.TemporaryDirectory() as tmp:
+        server, root, url = _serve(tmp, slugs)
+        shutil.copy(os.path.join(DOCS, "companies", "all.json"), os.path.join(root, "companies"))
+        os.makedirs(os.path.join(root, "sectors"))
+        for name, count in (("few", 3), ("many", 20)):
+            with open(os.path.join(root, "sectors", f"{name}.json"), "w") as f:
+                json.dump({"id": name, "companies": [f"a16z:{slug}" for slug in slugs[:count]]}, f)
+        try:
+            client = ApiClient(url, cache_dir=os.path.join(tmp, "cache"))
+            assert [c["slug"] for c in client.by_sector("few")] == slugs[:3]
+            expected = ["/sectors/few.json"] + ["/" + company_path(slug) for slug in slugs[:3]]
+            assert [path for path, _ in _Static.log[1:]] == expected, _Static.log
+
+            # Past the threshold, all.json is downloaded once instead of one request per record
+            _Static.log.clear()
+            assert [c["slug"] for c in client.by_sector("many")] == slugs
+            assert _Static.log == [("/sectors/many.json", 200), ("/companies/all.json", 200)], _Static.log
+        finally:
+            server.shutdown()
+    print("PASS: a lookup of more than a few records downloads all.json once instead of each record")
+    return True
+
+
+def test_missing_indexes_answer_empty():
+    # The checked-in docs/ has no names.bloom, aliases.json or domains.json
+    with tempfile.TemporaryDirectory() as tmp:
+        client = ApiClient(DOCS, cache_dir=os.path.join(tmp, "cache"))
+        assert client.find("stripe") == [] and client.by_domain("https://stripe.com") == []
+    print("PASS: find() and by_domain() return no matches when their index files are missing")
+    return True
+
+
+def main():
+    print("=== Testing API Client ===")
+    tests = [
+        test_meta_revalidation_and_build_cache,
+        test_lru_eviction_and_refresh,
+        test_many_records_come_from_all_json,
+        test_missing_indexes_answer_empty,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test that companies/columns.json decodes back to exactly the records of all.json."""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats import serializer
+from src.formats.columnar import ColumnarReader, encode_columns
+
+ALL_JSON = os.path.join(os.path.dirname(__file__), "docs", "companies", "all.json")
+
+
+def _companies():
+    with open(ALL_JSON) as f:
+        return json.load(f)
+
+
+def test_round_trip_matches_all_json():
+    companies = _companies()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "columns.json")
+        serializer.write(path, encode_columns(companies), pretty=False)
+        reader = ColumnarReader.load(path)
+    assert len(reader) == len(companies)
+    # Row by row, without decoding whole columns; key order and nesting included
+    for i in (0, 1, len(companies) // 2, len(companies) - 1):
+        assert json.dumps(reader.row(i)) == json.dumps(companies[i]), i
+    assert list(reader.rows()) == companies
+    for name in reader.fields:
+        parent, _, child = name.partition(".")
+        assert reader.column(name) == [c[parent][child] if child else c[parent] for c in companies], name
+    # Rows read after their columns are decoded come from the decoded cache
+    assert [reader.row(i) for i in range(len(companies))] == companies
+    encodings = {column["encoding"] for column in encode_columns(companies)["columns"].values()}
+    print(f"PASS: {len(companies)} records round-trip through {sorted(encodings)} columns")
+    return True
+
+
+def test_edge_cases():
+    companies = [
+        {"id": "a16z:a", "slug": "a", "status": None, "flag": True, "tags": [], "meta": {"n": 1}},
+        {"id": "a16z:b", "slug": "b", "status": "active", "flag": False, "tags": ["x", "y"], "meta": {"n": None}},
+        {"id": "a16z:c", "slug": "c", "status": None, "flag": True, "tags": None, "meta": {"n": 3}},
+    ]
+    for i in range(10):
+        companies.append({"id": f"a16z:d{i}", "slug": f"d{i}", "status": "active", "flag": False, "tags": ["x"]})
+        companies[-1]["meta"] = {"n": i}
+    data = serializer.loads(serializer.dumps(encode_columns(companies), pretty=False))
+    columns = data["columns"]
+    assert columns["id"]["encoding"] == "derived" and columns["flag"]["encoding"] == "bitmap"
+    assert columns["status"]["encoding"] == "dictionary" and "validity" in columns["status"]
+    assert columns["tags"]["encoding"] == "dictionary-list"
+    reader = ColumnarReader(data)
+    expected = [dict(c, tags=c["tags"] or []) for c in companies]
+    assert [reader.row(i) for i in range(len(companies))] == expected
+    assert reader.column("meta.n") == [c["meta"]["n"] for c in companies]
+
+    assert list(ColumnarReader(encode_columns([])).rows()) == []
+    for bad in ({}, dict(data, version=99)):
+        try:
+            ColumnarReader(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a foreign or newer file should be rejected")
+    try:
+        reader.row(len(companies))
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("rows past the end should raise IndexError")
+    print("PASS: nulls, bitmaps, derived ids and list columns decode; foreign files are rejected")
+    return True
+
+
+def main():
+    print("=== Testing Columnar Format ===")
+    tests = [test_round_trip_matches_all_json, test_edge_cases]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Test the refresh daemon against a local server that honours conditional requests."""
+
+import contextlib
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.build.daemon import RefreshDaemon
+from src.extract import investment_list, portfolio
+from src.formats.bundle import BundleReader
+from src.validate import validate_build
+
+
+ROSTER = (
+    '<div class="list-row"><h4>Investments</h4><div class="row">'
+    '<div class="col-xs-6 col-sm-3"><h6>A</h6><ul class="list"><li>Acme</li></ul></div>'
+    '<div class="col-xs-6 col-sm-3"><h6>B</h6><ul class="list"><li>Beta</li></ul></div>'
+    '<div class="col-xs-6 col-sm-3"><h6>G</h6><ul class="list"><li>Gamma</li></ul></div>'
+    "</div></div>"
+)
+PORTFOLIO = '<div class="portfolio-app" data-json="{}"></div>'.format(
+    html.escape(
+        json.dumps(
+            {
+                "companies": [
+                    {"a16z_company_name": "Acme", "website_categories": "AI", "website_current_status": "Active"},
+                    {"a16z_company_name": "Beta", "website_categories": "Fintech", "website_current_status": "Active"},
+                ]
+            }
+        )
+    )
+)
+
+
+class _Sources(BaseHTTPRequestHandler):
+    pages: dict[str, str] = {}
+    statuses: list[int] = []
+
+    def do_GET(self):
+        body = self.pages[self.path].encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_daemon_rebuilds_only_on_data_changes():
+    _Sources.pages = {"/investment-list/": ROSTER, "/portfolio/": PORTFOLIO}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Sources)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    saved = (investment_list.REQUEST_DELAY_MIN, investment_list.REQUEST_DELAY_MAX, validate_build.MANIFEST_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        investment_list.REQUEST_DELAY_MIN = investment_list.REQUEST_DELAY_MAX = 0
+        portfolio.REQUEST_DELAY_MIN = portfolio.REQUEST_DELAY_MAX = 0
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        try:
+            docs = os.path.join(tmp, "docs")
+            daemon = RefreshDaemon(
+                docs,
+                interval=0,
+                urls={"investment_list": f"{base}/investment-list/", "portfolio": f"{base}/portfolio/"},
+                cache_dir=os.path.join(tmp, "cache"),
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                first = daemon.refresh()
+                assert first is not None and first["roster_parsed_count"] == 3
+                sector_file = os.path.join(docs, "sectors", "ai.json")
+                sector_mtime = os.stat(sector_file).st_mtime_ns
+
+                # Nothing changed: both requests come back 304 and nothing is built
+                _Sources.statuses.clear()
+                assert daemon.refresh() is None
+                assert _Sources.statuses == [304, 304]
+
+                # New markup around the same roster: fetched, parsed, not built
+                _Sources.pages["/investment-list/"] += "<!-- cache-buster 2 -->"
+                assert daemon.refresh() is None
+                assert daemon.builds == 1
+
+                # A company leaves the roster: rebuilt, its file removed, untouched indexes not rewritten
+                _Sources.pages["/investment-list/"] = _Sources.pages["/investment-list/"].replace("<li>Gamma</li>", "")
+                second = daemon.refresh()
+        finally:
+            investment_list.REQUEST_DELAY_MIN, investment_list.REQUEST_DELAY_MAX, validate_build.MANIFEST_DIR = saved
+            portfolio.REQUEST_DELAY_MIN, portfolio.REQUEST_DELAY_MAX = saved[:2]
+            server.shutdown()
+
+        assert second["roster_parsed_count"] == 2
+        assert daemon.builds == 2
+        assert not os.path.exists(os.path.join(docs, "companies", "gamma.json"))
+        with BundleReader.open(os.path.join(docs, "api.bundle")) as bundle:
+            assert "companies/gamma.json" not in bundle and "companies/beta.json" in bundle
+        assert os.path.exists(os.path.join(docs, "companies", "beta.json"))
+        assert os.stat(sector_file).st_mtime_ns == sector_mtime
+    print("PASS: 304s and markup-only changes skip the build; a roster change rebuilds incrementally")
+    return True
+
+
+def main():
+    print("=== Testing Refresh Daemon ===")
+    tests = [test_daemon_rebuilds_only_on_data_changes]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
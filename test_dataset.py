@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the columnar Dataset against plain Python loops over all.json."""
+
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats.columnar import encode_columns
+from src.query.dataset import Dataset, col
+from src.query.filters import filter_companies
+
+ALL_JSON = os.path.join(os.path.dirname(__file__), "docs", "companies", "all.json")
+
+
+def _companies():
+    with open(ALL_JSON) as f:
+        return json.load(f)
+
+
+def test_filters_match_loops():
+    companies = _companies()
+    ds = Dataset.from_records(companies)
+    sectors = sorted({s for c in companies for s in c["sectors"]})
+    for sector in [None, *sectors, "no-such-sector"]:
+        for status in (None, "active", "exited", "unknown"):
+            expr = col("sectors").contains(sector) if sector else None
+            if status:
+                expr = (expr & (col("status") == status)) if expr else col("status") == status
+            got = (ds.where(expr) if expr else ds).column("slug")
+            assert got == [c["slug"] for c in filter_companies(companies, sector=sector, status=status)], (sector, status)
+
+    assert ds.where(col("name").like("PAY")).column("slug") == [c["slug"] for c in companies if "pay" in c["name"].lower()]
+    assert len(ds.where(~col("description").isnull() | col("stages").contains_any(["seed", "growth"]))) == sum(
+        1 for c in companies if c["description"] is not None or {"seed", "growth"} & set(c["stages"])
+    )
+    assert len(ds.where(col("source_evidence.in_portfolio") == True)) == sum(  # noqa: E712
+        c["source_evidence"]["in_portfolio"] for c in companies
+    )
+    print("PASS: where() matches filter_companies for every sector/status combination")
+    return True
+
+
+def test_group_count_and_sort():
+    companies = _companies()
+    ds = Dataset.from_records(companies)
+    assert ds.group_count("status") == dict(Counter(c["status"] for c in companies).most_common())
+    assert ds.group_count("sectors", "stages") == Counter(
+        (s, t) for c in companies for s in c["sectors"] for t in c["stages"]
+    )
+    active = ds.where(col("status") == "active")
+    assert active.group_count("sectors") == Counter(s for c in companies if c["status"] == "active" for s in c["sectors"])
+
+    by_name = sorted(companies, key=lambda c: c["name"])
+    assert ds.sort("name").column("slug") == [c["slug"] for c in by_name]
+    assert ds.sort("status", "name", descending=True).head(5).column("slug") == [
+        c["slug"] for c in sorted(companies, key=lambda c: (c["status"], c["name"]), reverse=True)[:5]
+    ]
+    assert active.sort("name").head(3).records() == [c for c in by_name if c["status"] == "active"][:3]
+    print("PASS: group_count and sort match Counter and sorted()")
+    return True
+
+
+def test_load_from_columns():
+    companies = _companies()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "columns.json")
+        with open(path, "w") as f:
+            json.dump(encode_columns(companies), f)
+        ds = Dataset.load(path)
+    assert ds.records() == companies
+    assert Dataset.load(ALL_JSON).group_count("stages") == ds.group_count("stages")
+    print("PASS: columns.json and all.json load into the same Dataset")
+    return True
+
+
+def main():
+    print("=== Testing Dataset ===")
+    tests = [test_filters_match_loops, test_group_count_and_sort, test_load_from_columns]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
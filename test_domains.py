@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Test the website-domain reverse index (companies/domains.json and its shards)."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.client.client import ApiClient
+from src.formats.domains import DomainIndex, build_domain_index, shard_of, shard_prefix_length
+from src.normalize.names import registrable_domain
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _companies():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        return json.load(f)
+
+
+def test_registrable_domain():
+    cases = {
+        "https://shop.mayvenn.com/hair?x=1": "mayvenn.com",
+        "HTTP://WWW.Groupon.com:8080": "groupon.com",
+        "mayvenn.com": "mayvenn.com",
+        "https://www.dishpatch.co.uk/": "dishpatch.co.uk",
+        "https://app.acme.github.io/": "acme.github.io",
+        "http://10.0.0.1/": "10.0.0.1",
+        "localhost": None,  # not a website
+        "": None,
+        None: None,
+    }
+    for url, expected in cases.items():
+        assert registrable_domain(url) == expected, (url, registrable_domain(url))
+    print("PASS: URLs reduce to their registrable domain")
+    return True
+
+
+def test_every_company_found_by_website():
+    companies = _companies()
+    index, shards = build_domain_index(companies)
+    domains = DomainIndex(index)
+    with_website = [c for c in companies if registrable_domain(c.get("website"))]
+    assert with_website
+    for company in with_website:
+        assert company["id"] in domains.lookup(company["website"]), company["id"]
+    assert index["domains"] == sorted(index["domains"])
+    assert domains.lookup("https://no-such-company.example/") == [] and domains.lookup(None) == []
+
+    values = [c["website"] for c in with_website[:50]] + ["initech.com", None] + [c["website"] for c in with_website[:50]]
+    assert domains.lookup_many(values) == [domains.lookup(v) for v in values]
+    print(f"PASS: all {len(with_website)} companies with a website resolve from their URL")
+    return True
+
+
+def test_shards_partition_the_index():
+    index, shards = build_domain_index(_companies())
+    merged = DomainIndex()
+    for prefix, shard in shards.items():
+        assert len(prefix) == index["prefix_length"] and shard["shard"] == prefix
+        assert all(shard_of(domain, len(prefix)) == prefix for domain in shard["domains"])
+        merged.add(shard)
+    assert merged.ids == DomainIndex(index).ids
+
+    assert [shard_prefix_length(n) for n in (0, 16_000, 16_001, 256_001)] == [1, 1, 2, 3]
+    try:
+        DomainIndex({"format": "a16z-aliases", "version": 1, "domains": [], "ids": []})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a non-domains table should be rejected")
+    print(f"PASS: {len(shards)} shards hold exactly the entries of the full index")
+    return True
+
+
+def test_client_by_domain():
+    companies = _companies()
+    index, _ = build_domain_index(companies)
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        shutil.copytree(DOCS, docs)
+        with open(os.path.join(docs, "companies", "domains.json"), "w") as f:
+            json.dump(index, f)
+        client = ApiClient(docs, cache_dir=os.path.join(tmp, "cache"))
+        company = next(c for c in companies if c.get("website"))
+        assert company["id"] in [c["id"] for c in client.by_domain(company["website"])]
+        assert client.by_domain("initech.com") == []
+    print("PASS: the client resolves a website to its company")
+    return True
+
+
+def main():
+    print("=== Testing Domain Index ===")
+    tests = [
+        test_registrable_domain,
+        test_every_company_found_by_website,
+        test_shards_partition_the_index,
+        test_client_by_domain,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
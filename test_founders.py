@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Test founder parsing, enrichment and the sharded founder index (founders/{prefix}.json)."""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.build.aggregate import Aggregator
+from src.build.merge import merge_enrichment
+from src.client.client import ApiClient
+from src.extract.portfolio import PortfolioExtractor
+from src.normalize.company import normalize_company
+from src.normalize.founders import founder_key, parse_founder, shard_of, split_founders
+
+
+def test_split_founders():
+    cases = {
+        "Jane Doe, John Smith": ["Jane Doe", "John Smith"],
+        "Dr. Ada Lovelace (CEO) and Charles Babbage; John Smith, Jr.": [
+            "Ada Lovelace", "Charles Babbage", "John Smith Jr.",
+        ],
+        "José García & Jose Garcia": ["José García"],
+        "Sam Altman / Greg Brockman\nIlya Sutskever": ["Sam Altman", "Greg Brockman", "Ilya Sutskever"],
+        "Alexandra Andersen": ["Alexandra Andersen"],
+        " , ": [],
+        None: [],
+    }
+    for text, expected in cases.items():
+        assert split_founders(text) == expected, (text, split_founders(text))
+
+    assert parse_founder("John Smith Jr.") == {
+        "id": "john-smith-jr", "name": "John Smith Jr.", "given_name": "John", "family_name": "Smith",
+    }
+    assert parse_founder("Cher")["family_name"] is None
+    assert founder_key("José  García") == "jose-garcia" and shard_of("jose-garcia") == "jo"
+    print("PASS: founders lists split into clean, de-duplicated names")
+    return True
+
+
+def test_founders_reach_records():
+    portfolio = PortfolioExtractor().normalize_company(
+        {"a16z_company_name": "Acme", "founders_list": "Jane Doe, John Smith"}
+    )
+    assert portfolio["founders"] == ["Jane Doe", "John Smith"]
+    roster = [normalize_company({"name": "Acme"}), normalize_company({"name": "Beta"})]
+    assert roster[1]["founders"] == []
+    companies, _, _ = merge_enrichment(roster, [portfolio])
+    by_slug = {c["slug"]: c for c in companies}
+    assert by_slug["acme"]["founders"] == ["Jane Doe", "John Smith"]
+    assert by_slug["beta"]["founders"] == []
+    print("PASS: portfolio founders are copied onto matched records")
+    return True
+
+
+def _companies():
+    return [
+        {"id": "a16z:acme", "founders": ["Jane Doe", "John Smith"]},
+        {"id": "a16z:beta", "founders": ["Jane Doe", "Jose Garcia"]},
+        {"id": "a16z:gamma", "founders": ["José García"]},
+        {"id": "a16z:delta", "founders": []},
+    ]
+
+
+def test_founder_shards():
+    stats = Aggregator().add_all(_companies())
+    shards = stats.founder_shards()
+    assert sorted(shards) == ["ja", "jo"]
+    assert list(shards["jo"]["founders"]) == ["john-smith", "jose-garcia"]
+    assert shards["ja"]["founders"]["jane-doe"]["companies"] == ["a16z:acme", "a16z:beta"]
+    # Spellings that fold to the same key share one entry, named as first seen
+    garcia = shards["jo"]["founders"]["jose-garcia"]
+    assert garcia["name"] == "Jose Garcia" and garcia["companies"] == ["a16z:beta", "a16z:gamma"]
+    assert stats.coverage_metrics()["pct_with_founders"] == 75.0
+    print("PASS: founders are indexed by key in prefix shards")
+    return True
+
+
+def test_client_by_founder():
+    stats = Aggregator().add_all(_companies())
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        os.makedirs(os.path.join(docs, "companies"))
+        os.makedirs(os.path.join(docs, "founders"))
+        with open(os.path.join(docs, "meta.json"), "w") as f:
+            json.dump({"last_updated_iso": "2026-01-01T00:00:00Z"}, f)
+        for company in _companies():
+            with open(os.path.join(docs, "companies", f"{company['id'][5:]}.json"), "w") as f:
+                json.dump(company, f)
+        for prefix, shard in stats.founder_shards().items():
+            with open(os.path.join(docs, "founders", f"{prefix}.json"), "w") as f:
+                json.dump(shard, f)
+        client = ApiClient(docs, cache_dir=os.path.join(tmp, "cache"))
+        assert [c["id"] for c in client.by_founder("JOSÉ GARCÍA")] == ["a16z:beta", "a16z:gamma"]
+        assert client.by_founder("Nobody Here") == [] and client.by_founder("!!") == []
+    print("PASS: the client finds a founder's companies from one shard")
+    return True
+
+
+def main():
+    print("=== Testing Founder Index ===")
+    tests = [test_split_founders, test_founders_reach_records, test_founder_shards, test_client_by_founder]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Test the per-build stats history under docs/stats/."""
+
+import copy
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.client.client import ApiClient
+from src.formats.history import HISTORY_PATH, append_row, empty_table, extend_history, facet_path, load_history
+from src.validate.validate_build import Validator
+
+
+def _meta(built_at, total, sectors, match_rate=80.0):
+    return {
+        "last_updated_iso": built_at,
+        "total_companies": total,
+        "counts_by_status": {"active": total},
+        "counts_by_sector": sectors,
+        "counts_by_stage": {},
+        "extraction_metrics": {"portfolio_match_rate": match_rate, "pct_with_website": 50.0},
+    }
+
+
+def _history(*metas):
+    tables = {}
+    for meta in metas:
+        tables = extend_history(tables, meta)
+    return tables
+
+
+def test_rows_are_added_in_build_order():
+    tables = _history(
+        _meta("2026-01-02T00:00:00Z", 10, {"ai": 3}),
+        _meta("2026-01-03T00:00:00Z", 12, {"ai": 5, "crypto": 1}),
+        # An older archive replayed later lands in its place
+        _meta("2026-01-01T00:00:00Z", 8, {"ai": 2, "games": 1}),
+        # The same build again replaces its row
+        _meta("2026-01-02T00:00:00Z", 11, {"ai": 4}, match_rate=81.5),
+    )
+    history = tables[HISTORY_PATH]
+    assert history["count"] == 3 and history["built_at"] == [f"2026-01-0{d}T00:00:00Z" for d in (1, 2, 3)]
+    assert history["columns"]["total_companies"] == [8, 11, 12]
+    assert history["columns"]["portfolio_match_rate"] == [80.0, 81.5, 80.0]
+    assert history["facets"] == ["statuses", "sectors", "stages"]
+    sectors = tables[facet_path("sectors")]
+    assert sectors["facet"] == "sectors" and sectors["built_at"] == history["built_at"]
+    # Values a build did not have count 0 in its row
+    assert sectors["columns"] == {"ai": [2, 4, 5], "crypto": [0, 0, 1], "games": [1, 0, 0]}, sectors["columns"]
+    assert tables[facet_path("stages")]["columns"] == {}
+
+    # A metric that appears later is null for the builds before it
+    table = append_row(empty_table(), "2026-01-01T00:00:00Z", {"total_companies": 8})
+    append_row(table, "2026-01-02T00:00:00Z", {"total_companies": 9, "pct_with_founders": 20.0})
+    assert table["columns"] == {"total_companies": [8, 9], "pct_with_founders": [None, 20.0]}
+    try:
+        append_row({"format": "a16z-domains", "version": 1}, "2026-01-01T00:00:00Z", {})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a file of another format should be rejected")
+    print(f"PASS: {history['count']} builds in order, replaced and back-filled")
+    return True
+
+
+def test_history_round_trips_through_docs():
+    first, second = _meta("2026-01-01T00:00:00Z", 8, {"ai": 2}), _meta("2026-01-02T00:00:00Z", 9, {"ai": 3})
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        # Each build extends what the previous one left in docs/
+        for meta in (first, second):
+            tables = extend_history(load_history(docs), meta)
+            for rel, table in tables.items():
+                path = os.path.join(docs, *rel.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    json.dump(table, f)
+        with open(os.path.join(docs, "meta.json"), "w") as f:
+            json.dump(second, f)
+
+        client = ApiClient(docs, cache_dir=os.path.join(tmp, "cache"))
+        assert client.history()["columns"]["total_companies"] == [8, 9]
+        assert client.history("sectors")["columns"] == {"ai": [2, 3]}
+        assert client.history("founders") is None
+    print("PASS: each build extends the history the previous build wrote")
+    return True
+
+
+def test_validator_checks_history():
+    meta = _meta("2026-01-02T00:00:00Z", 9, {"ai": 3})
+    tables = _history(_meta("2026-01-01T00:00:00Z", 8, {"ai": 2}), meta)
+    validator = Validator()
+    validator.check_history(tables, meta)
+    assert validator.errors == [], validator.errors
+
+    stale = _history(_meta("2026-01-01T00:00:00Z", 8, {"ai": 2}))
+    ragged = copy.deepcopy(tables)
+    ragged[HISTORY_PATH]["columns"]["total_companies"].pop()
+    wrong = copy.deepcopy(tables)
+    wrong[facet_path("sectors")]["columns"]["ai"][-1] = 4
+    missing = copy.deepcopy(tables)
+    del missing[facet_path("stages")]
+    for broken in (stale, ragged, wrong, missing):
+        validator.check_history(broken, meta)
+    assert validator.errors == [
+        "stats/history.json has no row for this build (2026-01-02T00:00:00Z)",
+        "stats/history/statuses.json has no row for this build (2026-01-02T00:00:00Z)",
+        "stats/history/sectors.json has no row for this build (2026-01-02T00:00:00Z)",
+        "stats/history/stages.json has no row for this build (2026-01-02T00:00:00Z)",
+        "stats/history.json columns do not all have 2 rows",
+        "stats/history/sectors.json row for this build does not match meta.json",
+        "stats/history/stages.json missing",
+    ], validator.errors
+    print("PASS: the validator reports a history without a matching row for the build")
+    return True
+
+
+def main():
+    print("=== Testing Stats History ===")
+    tests = [test_rows_are_added_in_build_order, test_history_round_trips_through_docs, test_validator_checks_history]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the hashed fan-out layout for per-company files."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.client.client import ApiClient
+from src.formats.layout import FLAT, HASHED, bucket_of, company_path, layout_of
+from src.formats.membership import build_membership
+from src.validate import validate_build
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _companies():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        return json.load(f)
+
+
+def test_company_paths():
+    assert company_path("stripe") == company_path("stripe", FLAT) == "companies/stripe.json"
+    bucket = bucket_of("stripe")
+    assert company_path("stripe", HASHED) == f"companies/{bucket}/stripe.json"
+    assert len(bucket) == 2 and int(bucket, 16) < 256
+    try:
+        company_path("stripe", "nested")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unknown layout should be rejected")
+    assert layout_of(None) == layout_of({}) == FLAT and layout_of({"record_layout": HASHED}) == HASHED
+
+    buckets = Counter(bucket_of(c["slug"]) for c in _companies())
+    assert len(buckets) > 200 and max(buckets.values()) < 20, buckets.most_common(3)
+    most = max(buckets.values())
+    print(f"PASS: {sum(buckets.values())} slugs spread over {len(buckets)} buckets (at most {most} each)")
+    return True
+
+
+def _hashed_copy(tmp: str) -> str:
+    """The checked-in docs/ rearranged into the hashed layout, with the membership files it lacks."""
+    docs = os.path.join(tmp, "docs")
+    shutil.copytree(DOCS, docs)
+    companies = _companies()
+    for company in companies:
+        target = os.path.join(docs, company_path(company["slug"], HASHED))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(os.path.join(docs, company_path(company["slug"])), target)
+    bloom, aliases = build_membership(companies)
+    with open(os.path.join(docs, "companies", "names.bloom"), "wb") as f:
+        f.write(bloom)
+    with open(os.path.join(docs, "companies", "aliases.json"), "w") as f:
+        json.dump(aliases, f)
+    meta_path = os.path.join(docs, "meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    with open(meta_path, "w") as f:
+        json.dump(dict(meta, record_layout=HASHED), f)
+    return docs
+
+
+def test_validate_and_client_follow_the_layout():
+    saved = validate_build.MANIFEST_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        try:
+            docs = _hashed_copy(tmp)
+            assert validate_build.validate(docs) == (True, [])
+
+            client = ApiClient(docs, cache_dir=os.path.join(tmp, "cache"))
+            slug = _companies()[0]["slug"]
+            assert client.company(slug)["slug"] == slug
+            assert client.company("no-such-company") is None
+
+            os.remove(os.path.join(docs, company_path(slug, HASHED)))
+            passed, errors = validate_build.validate(docs)
+            assert not passed and errors == ["1 individual company files missing"], errors
+        finally:
+            validate_build.MANIFEST_DIR = saved
+    print("PASS: validate() and the client locate records through meta.json's record_layout")
+    return True
+
+
+def main():
+    print("=== Testing Record Layout ===")
+    tests = [test_company_paths, test_validate_and_client_follow_the_layout]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Test the load generator's statistics, mix parsing and error accounting."""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.bench.loadgen import parse_mix, percentile, run
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 11)]
+    # p·N/100 an odd integer: the 5th value, not the 6th
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 30) == 3.0
+    assert percentile(values, 95) == 10.0 and percentile(values, 100) == 10.0
+    assert percentile(values, 0) == 1.0 and percentile(values, 1) == 1.0
+    assert percentile([float(v) for v in range(1, 21)], 95) == 19.0
+    assert percentile([], 99) == 0.0
+    print("PASS: percentiles are nearest-rank")
+    return True
+
+
+def test_parse_mix():
+    assert parse_mix("slug=80,facet=15,all=5") == {"slug": 0.8, "facet": 0.15, "all": 0.05}
+    assert parse_mix("meta, slug=3") == {"meta": 0.25, "slug": 0.75}
+    for spec in ("slugs=1", "slug=0", ""):
+        try:
+            parse_mix(spec)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{spec!r} should be rejected")
+    print("PASS: mixes are normalized and unknown patterns or empty weights rejected")
+    return True
+
+
+def test_run_against_docs_directory():
+    report = run(DOCS, mix="slug=80,facet=15,meta=5", concurrency=[1, 4], requests=200, seed=1)
+    assert [level["concurrency"] for level in report["levels"]] == [1, 4]
+    for level in report["levels"]:
+        patterns = level["patterns"]
+        assert sum(p["requests"] for p in patterns.values()) == 200
+        assert all(p["errors"] == 0 for p in patterns.values()), patterns
+        assert patterns["slug"]["requests"] > patterns["meta"]["requests"] and patterns["slug"]["bytes"] > 0
+        assert patterns["slug"]["p50_ms"] <= patterns["slug"]["p95_ms"] <= patterns["slug"]["p99_ms"]
+    try:
+        run(DOCS, mix="query", requests=1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("the query pattern should need an HTTP target")
+    print("PASS: a run over docs/ issues every request of each level without errors")
+    return True
+
+
+class _Flaky(BaseHTTPRequestHandler):
+    """Serves a two-company build; every other record response is cut off mid-body."""
+
+    protocol_version = "HTTP/1.1"
+    records = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path == "/meta.json":
+            body = json.dumps({"counts_by_sector": {"ai": 2}}).encode()
+        elif self.path == "/companies/all.json":
+            body = json.dumps([{"slug": "acme"}, {"slug": "beta"}]).encode()
+        else:
+            with _Flaky.lock:
+                _Flaky.records += 1
+                drop = _Flaky.records % 2 == 0
+            body = b'{"slug": "acme", "padding": "' + b"x" * 200 + b'"}'
+            if drop:
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body[:10])
+                self.close_connection = True
+                return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_dropped_connections_are_counted():
+    _Flaky.records = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Flaky)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        report = run(f"http://127.0.0.1:{server.server_address[1]}", mix="slug", concurrency=[2], requests=40)
+    finally:
+        server.shutdown()
+    slug = report["levels"][0]["patterns"]["slug"]
+    assert slug["requests"] == 40 and slug["errors"] == 20, slug
+    print(f"PASS: {slug['errors']} of {slug['requests']} requests on dropped connections counted as errors")
+    return True
+
+
+def main():
+    print("=== Testing Load Generator ===")
+    tests = [
+        test_percentile_is_nearest_rank,
+        test_parse_mix,
+        test_run_against_docs_directory,
+        test_dropped_connections_are_counted,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test logo mirroring against a local stand-in image server."""
+
+import functools
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.extract import logos
+from src.extract.logos import LogoMirror
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg"/>'
+
+
+class _CountingHandler(SimpleHTTPRequestHandler):
+    requests_seen: list[str] = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_mirror_content_addressed_and_cached():
+    with tempfile.TemporaryDirectory() as images, tempfile.TemporaryDirectory() as docs:
+        for name, body in (("a.png", PNG), ("copy-of-a.png", PNG), ("b.svg", SVG)):
+            with open(os.path.join(images, name), "wb") as f:
+                f.write(body)
+        handler = functools.partial(_CountingHandler, directory=images)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/a.png", f"{base}/copy-of-a.png", f"{base}/b.svg", f"{base}/missing.png", None]
+
+        try:
+            mirror = LogoMirror(docs, max_workers=4)
+            paths = mirror.mirror(urls)
+            assert mirror.stats == {"cached": 0, "fetched": 3, "failed": 1}
+            # Identical images share one content-hash file
+            assert paths[f"{base}/a.png"] == paths[f"{base}/copy-of-a.png"]
+            assert paths[f"{base}/a.png"].startswith("logos/") and paths[f"{base}/a.png"].endswith(".png")
+            assert paths[f"{base}/b.svg"].endswith(".svg")
+            with open(os.path.join(docs, paths[f"{base}/b.svg"]), "rb") as f:
+                assert f.read() == SVG
+
+            # A fresh mirror reuses the manifest and only retries the failed URL
+            _CountingHandler.requests_seen.clear()
+            again = LogoMirror(docs)
+            assert again.mirror(urls) == paths
+            assert _CountingHandler.requests_seen == ["/missing.png"]
+
+            # Without fetching, only already-mirrored logos resolve
+            assert LogoMirror(docs).mirror([f"{base}/new.png", f"{base}/a.png"], fetch=False) == {
+                f"{base}/a.png": paths[f"{base}/a.png"]
+            }
+        finally:
+            server.shutdown()
+            server.server_close()
+    print("PASS: logos are mirrored under content-hash names and never refetched")
+    return True
+
+
+OVERSIZED_BYTES = 64 * 1024 * 1024
+
+
+class _Oversized(BaseHTTPRequestHandler):
+    """Serves a 64 MB PNG; /declared.png announces its size up front, /undeclared.png does not."""
+
+    sent: dict[str, int] = {}
+    done = threading.Semaphore(0)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        if self.path == "/declared.png":
+            self.send_header("Content-Length", str(OVERSIZED_BYTES))
+        self.end_headers()
+        self.sent[self.path] = 0
+        chunk = PNG * 1024
+        try:
+            while self.sent[self.path] < OVERSIZED_BYTES:
+                self.wfile.write(chunk)
+                self.sent[self.path] += len(chunk)
+        except OSError:
+            pass  # the client hung up
+        finally:
+            self.close_connection = True
+            _Oversized.done.release()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_oversized_logos_are_abandoned():
+    saved = logos.MAX_LOGO_BYTES
+    logos.MAX_LOGO_BYTES = 4096
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Oversized)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as docs:
+            mirror = LogoMirror(docs)
+            assert mirror.mirror([f"{base}/declared.png", f"{base}/undeclared.png"]) == {}
+            assert mirror.stats["failed"] == 2
+            assert os.listdir(os.path.join(docs, "logos")) == ["manifest.json"]
+            with open(os.path.join(docs, "logos", "manifest.json")) as f:
+                assert f.read() == '{\n  "logos": {}\n}\n'
+        for _ in range(2):
+            assert _Oversized.done.acquire(timeout=30)
+    finally:
+        logos.MAX_LOGO_BYTES = saved
+        server.shutdown()
+        server.server_close()
+    # The body without a declared size is read only until it passes the limit, not to the end
+    assert _Oversized.sent["/undeclared.png"] < OVERSIZED_BYTES // 2, _Oversized.sent
+    print("PASS: logos over the size limit are rejected without downloading them in full")
+    return True
+
+
+def main():
+    print("=== Testing Logo Mirror ===")
+    tests = [test_mirror_content_addressed_and_cached, test_oversized_logos_are_abandoned]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Test name canonicalization, the names Bloom filter and the alias table."""
+
+import json
+import os
+import random
+import shutil
+import string
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats.membership import BloomFilter, NameIndex, build_membership
+from src.formats.serializer import dumps, loads
+from src.normalize.names import canonical_domain, canonical_name
+from src.validate import validate_build
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+COMPANIES = [
+    {"name": "Groupon, Inc.", "slug": "groupon", "website": "https://www.groupon.com/"},
+    {"name": "The Browser Company", "slug": "the-browser-company", "website": "thebrowser.company"},
+    {"name": "Café Labs LLC", "slug": "cafe-labs-llc", "website": None},
+    {"name": "Acme", "slug": "acme", "website": "https://acme.io"},
+    {"name": "ACME Corp", "slug": "acme-corp", "website": "http://acme.com"},
+]
+
+
+def test_canonical_forms():
+    assert canonical_name("Groupon, Inc.") == canonical_name("GROUPON") == canonical_name("groupon") == "groupon"
+    assert canonical_name("The Browser Company") == "browser"
+    assert canonical_name("Café Labs, LLC") == "cafe-labs"
+    assert canonical_name("Inc.") == "inc"  # a legal word on its own is kept
+    assert canonical_name("Ben & Jerry's") == "ben-and-jerry-s"
+    assert canonical_domain("https://WWW.Groupon.com/deals?x=1") == "groupon.com"
+    assert canonical_domain("groupon.com") == "groupon.com"
+    assert canonical_domain("not a url") is None and canonical_domain(None) is None
+    print("PASS: names and domains canonicalize")
+    return True
+
+
+def test_lookup_by_name_slug_and_domain():
+    bloom, aliases = build_membership(COMPANIES)
+    assert aliases["aliases"] == sorted(aliases["aliases"])
+    index = NameIndex(BloomFilter.from_bytes(bloom), loads(dumps(aliases, pretty=False)))
+
+    assert index.lookup("Groupon") == ["groupon"]
+    assert index.lookup("groupon llc") == ["groupon"]
+    assert index.lookup("https://groupon.com") == ["groupon"]
+    assert index.lookup("Browser Company, Inc.") == ["the-browser-company"]
+    assert index.lookup("cafe-labs") == ["cafe-labs-llc"]
+    # Two companies share the canonical name "acme"
+    assert sorted(index.lookup("Acme, Inc.")) == ["acme", "acme-corp"]
+    assert index.lookup("acme.com") == ["acme-corp"]
+    assert index.lookup("Initech") == [] and not index.might_contain("Initech")
+    print("PASS: companies are found under name variants, slugs and domains")
+    return True
+
+
+def test_bloom_false_positive_rate():
+    rng = random.Random(0)
+    keys = {"".join(rng.choices(string.ascii_lowercase, k=10)) for _ in range(2000)}
+    bloom = BloomFilter.for_capacity(len(keys))
+    for key in keys:
+        bloom.add(key)
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+    assert all(key in restored for key in keys)
+    probes = ["".join(rng.choices(string.ascii_lowercase, k=11)) for _ in range(20000)]
+    rate = sum(probe in restored for probe in probes) / len(probes)
+    assert rate < 0.02, f"false positive rate {rate:.3f}"
+    assert len(bloom.to_bytes()) < 3000
+    print(f"PASS: {len(keys)} keys in {len(bloom.to_bytes())} bytes, false positive rate {rate:.3%}")
+    return True
+
+
+def test_validate_checks_membership_files_only_when_present():
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = validate_build.MANIFEST_DIR
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        try:
+            docs = os.path.join(tmp, "docs")
+            shutil.copytree(DOCS, docs)
+            for name in ("names.bloom", "aliases.json"):
+                if os.path.exists(os.path.join(docs, "companies", name)):
+                    os.remove(os.path.join(docs, "companies", name))
+            # A build from before the membership files
+            assert validate_build.validate(docs) == (True, [])
+
+            with open(os.path.join(docs, "companies", "all.json")) as f:
+                bloom, aliases = build_membership(json.load(f))
+            with open(os.path.join(docs, "companies", "names.bloom"), "wb") as f:
+                f.write(bloom)
+            assert validate_build.validate(docs) == (False, ["companies/names.bloom or companies/aliases.json missing"])
+            with open(os.path.join(docs, "companies", "aliases.json"), "wb") as f:
+                f.write(dumps(aliases))
+            assert validate_build.validate(docs) == (True, [])
+        finally:
+            validate_build.MANIFEST_DIR = saved
+    print("PASS: validate() checks the membership files when a build has them, and rejects half of them")
+    return True
+
+
+def main():
+    print("=== Testing Membership Files ===")
+    tests = [
+        test_canonical_forms,
+        test_lookup_by_name_slug_and_domain,
+        test_bloom_false_positive_rate,
+        test_validate_checks_membership_files_only_when_present,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Test reading single records out of all.json through the byte-offset index."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats.offsets import OffsetIndex, _parse_partial, build_index, dump_array_with_offsets
+from src.serve.server import ApiServer
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _companies():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        return json.load(f)
+
+
+class _Response:
+    def __init__(self, status, headers, body):
+        self.status_code, self.headers, self.content = status, headers, body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"HTTP {self.status_code}")
+
+
+class _ServerSession:
+    """A requests-like session answered in-process by the API server."""
+
+    def __init__(self, server, honour_range=True):
+        self.server, self.honour_range, self.ranges = server, honour_range, []
+
+    def get(self, url, headers, timeout):
+        self.ranges.append(headers["Range"])
+        request = {"range": headers["Range"]} if self.honour_range else {}
+        status, out, body, _ = self.server.respond("GET", url, request)
+        return _Response(status, out, body)
+
+
+def _docs_with_offsets(tmp, companies):
+    docs = os.path.join(tmp, "docs")
+    os.makedirs(os.path.join(docs, "companies"))
+    shutil.copy(os.path.join(DOCS, "meta.json"), docs)
+    all_json, spans = dump_array_with_offsets(companies)
+    with open(os.path.join(docs, "companies", "all.json"), "wb") as f:
+        f.write(all_json)
+    return docs, OffsetIndex(build_index((c["slug"] for c in companies), spans))
+
+
+def test_array_matches_json_dump():
+    companies = _companies()[:50]
+    all_json, spans = dump_array_with_offsets(companies)
+    assert all_json == (json.dumps(companies, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    assert dump_array_with_offsets([])[0] == b"[]\n"
+    for company, (offset, length) in zip(companies, spans):
+        assert json.loads(all_json[offset : offset + length]) == company
+    print(f"PASS: all.json is byte-identical to json.dump, with {len(spans)} exact record spans")
+    return True
+
+
+def test_read_local_and_range_header():
+    companies = _companies()
+    with tempfile.TemporaryDirectory() as tmp:
+        docs, index = _docs_with_offsets(tmp, companies)
+        wanted = [companies[500]["slug"], companies[3]["slug"], "no-such-company"]
+        records = index.read_local(os.path.join(docs, "companies", "all.json"), wanted)
+        assert records == {c["slug"]: c for c in (companies[3], companies[500])}
+
+    assert index.range_header(["no-such-company"]) is None
+    offset, length = index.locate(companies[3]["slug"])
+    assert index.range_header([companies[3]["slug"]]) == f"bytes={offset}-{offset + length - 1}"
+    # Neighbouring records merge into one range; distant ones stay separate
+    neighbours = index.range_header([c["slug"] for c in companies[10:13]])
+    assert neighbours.count("-") == 1, neighbours
+    assert index.range_header([companies[10]["slug"], companies[900]["slug"]]).count(",") == 1
+    print("PASS: local reads seek to each record; range headers merge neighbours")
+    return True
+
+
+def test_fetch_http_single_multi_and_ignored_range():
+    companies = _companies()
+    with tempfile.TemporaryDirectory() as tmp:
+        docs, index = _docs_with_offsets(tmp, companies)
+        server = ApiServer(docs)
+        url = "/companies/all.json"
+        one = [companies[7]["slug"]]
+        several = [companies[7]["slug"], companies[300]["slug"], companies[1000]["slug"]]
+        expected = {c["slug"]: c for c in companies}
+
+        session = _ServerSession(server)
+        assert index.fetch_http(session, url, one) == {one[0]: expected[one[0]]}
+        assert index.fetch_http(session, url, several) == {s: expected[s] for s in several}
+        assert index.fetch_http(session, url, ["no-such-company"]) == {}
+        assert len(session.ranges) == 2 and session.ranges[1].count(",") == 2
+
+        # A server that ignores Range sends the whole file with 200
+        ignoring = _ServerSession(server, honour_range=False)
+        assert index.fetch_http(ignoring, url, several) == {s: expected[s] for s in several}
+    print("PASS: fetch_http reads single-part, multipart/byteranges and full 200 responses")
+    return True
+
+
+def test_parse_partial():
+    assert _parse_partial("application/json", "bytes 10-14/100", b"hello") == [(10, b"hello")]
+    body = (
+        b"--sep\r\nContent-Type: application/json\r\nContent-Range: bytes 0-1/10\r\n\r\nab\r\n"
+        b"--sep\r\nContent-Range: bytes 5-7/10\r\n\r\n\r\nx\r\n"
+        b"--sep--\r\n"
+    )
+    assert _parse_partial('multipart/byteranges; boundary="sep"', None, body) == [(0, b"ab"), (5, b"\r\nx")]
+    print("PASS: 206 bodies split into their parts, including parts that contain CRLF")
+    return True
+
+
+def main():
+    print("=== Testing Offset Index ===")
+    tests = [
+        test_array_matches_json_dump,
+        test_read_local_and_range_header,
+        test_fetch_http_single_multi_and_ignored_range,
+        test_parse_partial,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test the memory-mapped binary dataset (companies/all.bin)."""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats import serializer
+from src.formats.packed import PackedDataset, pack_records
+
+ALL_JSON = os.path.join(os.path.dirname(__file__), "docs", "companies", "all.json")
+
+
+def _companies():
+    with open(ALL_JSON) as f:
+        return json.load(f)
+
+
+def test_mmap_round_trip():
+    companies = _companies()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "all.bin")
+        with open(path, "wb") as f:
+            f.write(pack_records(companies))
+        with PackedDataset.open(path) as packed:
+            assert len(packed) == len(companies)
+            # Same values and key order as all.json
+            assert [serializer.dumps(r) for r in packed] == [serializer.dumps(c) for c in companies]
+            for i in (0, len(companies) // 2, len(companies) - 1):
+                assert packed.get(companies[i]["slug"]) == companies[i]
+            assert packed.get("no-such-company") is None
+            assert list(packed.slugs()) == sorted(c["slug"] for c in companies)
+    print(f"PASS: {len(companies)} records decode from the mapped file unchanged")
+    return True
+
+
+def test_value_kinds():
+    records = [
+        {"slug": "b", "name": "Zoë & Co", "tags": [], "flag": False, "extra": 3, "nested": {"x": None}},
+        {"slug": "a", "name": None, "tags": ["x", "ü"], "flag": None, "extra": [1, 2.5], "nested": {"x": "y"}},
+        {"slug": "c", "name": "Zoë & Co", "tags": None, "flag": True, "extra": None, "nested": {"x": "y"}},
+    ]
+    packed = PackedDataset(pack_records(records))
+    assert dict(packed.fields) == {
+        "slug": "str", "name": "str", "tags": "list", "flag": "bool", "extra": "json", "nested.x": "str",
+    }
+    assert list(packed) == records
+    assert [packed.find(s) for s in ("a", "b", "c", "d", "")] == [1, 0, 2, None, None]
+    try:
+        packed.record(3)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("record(3) should raise IndexError")
+
+    empty = PackedDataset(pack_records([]))
+    assert len(empty) == 0 and list(empty.slugs()) == [] and empty.get("a") is None
+    print("PASS: strings, lists, booleans, JSON values and nulls round-trip")
+    return True
+
+
+def test_rejects_other_files():
+    try:
+        PackedDataset(b"A16ZBLM" + bytes(200))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a non-all.bin buffer")
+    print("PASS: non-all.bin content is rejected")
+    return True
+
+
+def main():
+    print("=== Testing Packed Dataset ===")
+    tests = [test_mmap_round_trip, test_value_kinds, test_rejects_other_files]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
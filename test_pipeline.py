@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Test the staged build pipeline's artifact cache and stage ranges."""
+
+import contextlib
+import html
+import io
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.build.build_dataset import build
+from src.build.daemon import RefreshDaemon
+from src.build.pipeline import Pipeline, Stage
+from src.extract.archive import SourceArchive
+from src.extract.investment_list import INVESTMENT_LIST_URL
+from src.extract.portfolio import PORTFOLIO_URL
+from src.normalize import clock
+from src.validate import validate_build
+
+CALLS: list[str] = []
+
+
+def _source(ctx):
+    CALLS.append("source")
+    return ctx["value"]
+
+
+def _double(ctx, value):
+    CALLS.append("double")
+    return value * 2 + ctx["offset"]
+
+
+STAGES = [
+    Stage("source", _source),
+    Stage("double", _double, inputs=("source",), params=("offset",)),
+]
+
+
+def test_cache_hits_and_misses():
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        pipeline = Pipeline(STAGES, cache_dir=tmp)
+        CALLS.clear()
+        assert pipeline.run({"value": 3, "offset": 0}) == {"source": 3, "double": 6}
+        assert CALLS == ["source", "double"]
+
+        # Same source output and params: the source runs (it is keyed by its output), the next stage is cached
+        CALLS.clear()
+        assert pipeline.run({"value": 3, "offset": 0})["double"] == 6
+        assert CALLS == ["source"]
+
+        # A changed param or a changed upstream output re-runs the stage
+        CALLS.clear()
+        assert pipeline.run({"value": 3, "offset": 1})["double"] == 7
+        assert pipeline.run({"value": 4, "offset": 1})["double"] == 9
+        assert CALLS == ["source", "double", "source", "double"]
+
+        # A fresh pipeline over the same directory reads the pickled artifacts
+        CALLS.clear()
+        assert Pipeline(STAGES, cache_dir=tmp).run({"value": 4, "offset": 1})["double"] == 9
+        assert CALLS == ["source"]
+        artifacts = sorted(entry.split("-")[0] for entry in os.listdir(tmp) if entry.endswith(".pkl"))
+        assert artifacts == ["double", "source"], os.listdir(tmp)
+    print("PASS: stages re-run only when their inputs, params or code change; one artifact kept per stage")
+    return True
+
+
+def test_stage_ranges():
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        pipeline = Pipeline(STAGES, cache_dir=tmp)
+        try:
+            pipeline.run({"value": 1, "offset": 0}, start="double")
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("--from a stage whose inputs were never built should fail")
+
+        CALLS.clear()
+        assert pipeline.run({"value": 5, "offset": 0}, stop="source") == {"source": 5}
+        assert CALLS == ["source"]
+
+        # --from loads earlier stages from their latest artifact, even if the context has moved on
+        CALLS.clear()
+        assert pipeline.run({"value": 100, "offset": 0}, start="double") == {"source": 5, "double": 10}
+        assert CALLS == ["double"]
+
+        try:
+            pipeline.run({"value": 1, "offset": 0}, start="double", stop="source")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("--from after --to should be rejected")
+    print("PASS: --from loads earlier stages from the cache and --to stops after the named stage")
+    return True
+
+
+ROSTER = (
+    '<div class="list-row"><h4>Investments</h4><div class="row">'
+    '<div class="col-xs-6 col-sm-3"><h6>A</h6><ul class="list"><li>Acme</li></ul></div>'
+    '<div class="col-xs-6 col-sm-3"><h6>B</h6><ul class="list"><li>Beta</li></ul></div>'
+    "</div></div>"
+)
+PORTFOLIO = '<div class="portfolio-app" data-json="{}"></div>'.format(
+    html.escape(json.dumps({"companies": [{"a16z_company_name": "Acme", "website_categories": "AI"}]}))
+)
+
+
+def test_replay_timestamps_do_not_depend_on_the_cache():
+    saved = validate_build.MANIFEST_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        try:
+            stamps = []
+            # Equal pages recorded on different days, replayed against the same warm cache
+            for recorded_iso in ("2026-01-01T00:00:00Z", "2026-02-02T00:00:00Z", "2026-01-01T00:00:00Z"):
+                archive = SourceArchive(os.path.join(tmp, f"{recorded_iso[:10]}.json.gz"), False, recorded_iso)
+                archive.pages = {INVESTMENT_LIST_URL: ROSTER, PORTFOLIO_URL: PORTFOLIO}
+                archive.save()
+                docs = os.path.join(tmp, "docs")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    summary = build(archive=SourceArchive.replay(archive.path), output_dir=docs, cache_dir=tmp)
+                with open(os.path.join(docs, "companies", "acme.json")) as f:
+                    acme = json.load(f)
+                stamps.append((summary["meta"]["last_updated_iso"], acme["first_seen_iso"], acme["last_seen_iso"]))
+        finally:
+            validate_build.MANIFEST_DIR = saved
+    expected = ["2026-01-01T00:00:00Z", "2026-02-02T00:00:00Z", "2026-01-01T00:00:00Z"]
+    assert stamps == [(iso,) * 3 for iso in expected], stamps
+    print("PASS: replaying equal pages recorded at different times stamps each build with its own time")
+    return True
+
+
+def test_live_builds_stamp_their_own_time():
+    saved = validate_build.MANIFEST_DIR, clock.system_clock
+    stamps = []
+    with tempfile.TemporaryDirectory() as tmp:
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        docs = os.path.join(tmp, "docs")
+        try:
+            daemon = RefreshDaemon(docs, cache_dir=tmp)
+            daemon.pages = {"investment_list": ROSTER, "portfolio": PORTFOLIO}
+            # Unchanged pages built at two different times, over the same warm cache
+            for day in (1, 2):
+                now = datetime(2026, 1, day, tzinfo=timezone.utc)
+                clock.system_clock = lambda: now
+                with contextlib.redirect_stdout(io.StringIO()):
+                    summary = daemon.rebuild()
+                with open(os.path.join(docs, "companies", "acme.json")) as f:
+                    acme = json.load(f)
+                stamps.append((summary["meta"]["last_updated_iso"], acme["last_seen_iso"]))
+        finally:
+            validate_build.MANIFEST_DIR, clock.system_clock = saved
+    assert stamps == [("2026-01-01T00:00:00Z",) * 2, ("2026-01-02T00:00:00Z",) * 2], stamps
+    print("PASS: a live build over unchanged pages stamps its own time, not the cached one")
+    return True
+
+
+def main():
+    print("=== Testing Build Pipeline ===")
+    tests = [
+        test_cache_hits_and_misses,
+        test_stage_ranges,
+        test_replay_timestamps_do_not_depend_on_the_cache,
+        test_live_builds_stamp_their_own_time,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test the related-companies index against a brute-force similarity computation."""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.build.related import (
+    FACET_WEIGHT,
+    SCORE_STEPS,
+    TEXT_WEIGHT,
+    related_companies,
+    related_index,
+    text_features,
+)
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _brute_force(companies, k):
+    """Top-k by scoring every pair densely, ranked like the index: quantized score, then ordinal."""
+    n = len(companies)
+    rows, cols, weights, _ = text_features([c.get("description") for c in companies])
+    text = np.zeros((n, int(cols.max()) + 1 if len(cols) else 1))
+    text[rows, cols] = weights
+    facets = sorted({f"{kind}:{v}" for c in companies for kind in ("sectors", "stages") for v in c.get(kind, [])})
+    onehot = np.zeros((n, max(len(facets), 1)))
+    for i, c in enumerate(companies):
+        hot = [facets.index(f"{kind}:{v}") for kind in ("sectors", "stages") for v in set(c.get(kind, []))]
+        if hot:
+            onehot[i, hot] = 1 / np.sqrt(len(hot))
+    score = TEXT_WEIGHT * (text @ text.T) + FACET_WEIGHT * (onehot @ onehot.T)
+    expected = []
+    for i in range(n):
+        candidates = [(SCORE_STEPS - round(min(score[i, j], 1) * SCORE_STEPS), j) for j in range(n) if j != i]
+        ranked = sorted((rank, j) for rank, j in candidates if score[i, j] > 1e-9)[:k]
+        expected.append(([j for _, j in ranked], [score[i, j] for _, j in ranked]))
+    return expected
+
+
+def _company(i, description=None, sectors=(), stages=()):
+    return {"id": f"t:{i}", "description": description, "sectors": list(sectors), "stages": list(stages)}
+
+
+def test_ties_and_companies_without_facets():
+    companies = [
+        _company(0, "quantum ledger settlement", ["fintech"], ["seed"]),
+        _company(1, "quantum ledger for banks", ["fintech"], ["seed"]),
+        _company(2, None, ["fintech"], ["seed"]),
+        _company(3, None, ["fintech"], ["seed"]),
+        _company(4, None, ["fintech"], ["seed"]),
+        _company(5, "settlement rails", [], []),
+        _company(6, None, [], []),
+        _company(7, "", ["games"], []),
+    ]
+    neighbors, scores = related_companies(companies, k=3)
+    expected = _brute_force(companies, 3)
+    for i, (ids, values) in enumerate(expected):
+        got = [int(j) for j in neighbors[i] if j >= 0]
+        assert got == ids, (i, got, ids)
+        assert np.allclose(scores[i][: len(got)], values, atol=1e-5), (i, scores[i], values)
+    # Facet-only ties are broken by ordinal
+    assert [int(j) for j in neighbors[2]] == [0, 1, 3]
+    # No description and no facets: nothing is related; a shared rare term alone still links
+    assert list(neighbors[6]) == [-1, -1, -1] and list(neighbors[7]) == [-1, -1, -1]
+    assert int(neighbors[5][0]) == 0 and scores[5][0] > 0
+    print("PASS: ties, facet-less records and text-only links match the brute-force ranking")
+    return True
+
+
+def test_matches_brute_force_on_portfolio():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        companies = json.load(f)[:400]
+    k = 5
+    expected = _brute_force(companies, k)
+    # A tiny pair budget forces many chunks; the ranking must not depend on chunking
+    for budget in (4_000_000, 500):
+        neighbors, scores = related_companies(companies, k=k, pair_budget=budget)
+        mismatched = 0
+        for i, (ids, values) in enumerate(expected):
+            got = [int(j) for j in neighbors[i] if j >= 0]
+            assert len(got) == len(ids), (i, got, ids)
+            assert np.allclose(scores[i][: len(got)], values, atol=1e-5), (i, scores[i], values)
+            # Positions whose score is within float noise of a neighbour's may legitimately swap
+            for pos, (a, b) in enumerate(zip(got, ids)):
+                near = [values[p] for p in (pos - 1, pos + 1) if 0 <= p < len(values)]
+                if a != b and all(abs(values[pos] - v) > 1e-5 for v in near):
+                    mismatched += 1
+        assert mismatched == 0, (budget, mismatched)
+    index = related_index(companies, k=k)
+    assert len(index["related"]) == len(companies)
+    assert all(len(entries) <= k for entries in index["related"].values())
+    print(f"PASS: top-{k} of {len(companies)} companies match brute force, with and without chunking")
+    return True
+
+
+def main():
+    print("=== Testing Related Companies ===")
+    tests = [test_ties_and_companies_without_facets, test_matches_brute_force_on_portfolio]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Test that the event-driven roster parser extracts what the BeautifulSoup extractor it replaced did.
+
+`reference` is the BeautifulSoup extraction the roster parser replaced.
+Every page is parsed by both, whole and in chunks, and the company lists
+must be identical.
+"""
+
+import os
+import random
+import sys
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.bench.adversarial import ROSTER_PAGES
+from src.extract.investment_list import InvestmentListExtractor
+from src.normalize.clock import fixed_clock, now_iso
+from src.normalize.slugify import slugify
+
+CLOCK = fixed_clock("2026-01-01T00:00:00Z")
+ROW = '<div class="list-row">{}</div>'
+CASES = {
+    "nested_li": ROW.format('<h6>A</h6><ul class="list"><li>Outer<li>Inner</li> Tail</li><li>Next</li></ul>'),
+    "unclosed_li": ROW.format('<h6>A</h6><ul class="list"><li>One<li>Two<li>Three</ul>'),
+    "script_and_style": ROW.format(
+        '<h6>A<script>var x = "<li>";</script></h6><ul class="list"><li>Acme<style>li{}</style> Co</li></ul>'
+    ),
+    "template_and_ruby": ROW.format(
+        '<h6>A</h6><ul class="list"><li>Kanji<rp>(</rp><rt>kan</rt><rp>)</rp></li><li><template>T</template>X</li></ul>'
+    ),
+    "comments_split_strings": ROW.format(
+        '<h6>A</h6><ul class="list"><li>Acme <!-- c --> Co</li><li>Beta <?pi?> <!doctype x> Labs</li></ul>'
+    ),
+    "cdata": ROW.format('<h6>A</h6><ul class="list"><li><![CDATA[ Raw ]]>Name</li></ul>'),
+    "entities": ROW.format(
+        '<h6>&#35;-A</h6><ul class="list"><li>Acme &amp; Co</li><li>&ampx &foo; &#150;&#x41;&#0;&nbsp;B</li></ul>'
+    ),
+    "void_end_tags": ROW.format(
+        '<h6>A</h6><ul class="list"><li>Acme <br> Co</br> Inc</li><li>Beta<br/> Labs</li></ul>'
+    ),
+    "heading_sibling_before_nested": ROW.format('<h6>A</h6><div><h6>B</h6></div><ul class="list"><li>Acme</li></ul>'),
+    "heading_in_earlier_column": ROW.format('<div><h6>B</h6></div><div><ul class="list"><li>Beta</li></ul></div>'),
+    "heading_ancestor": ROW.format(
+        '<h6>A <ul class="list"><li>Acme</li></ul> Tail</h6><ul class="list"><li>B</li></ul>'
+    ),
+    "empty_heading": ROW.format('<h6></h6><ul class="list"><li>Acme</li></ul><h6/><ul class="list"><li>Beta</li></ul>'),
+    "nested_lists": ROW.format(
+        '<h6>A</h6><ul class="list"><li>Acme</li><h6>B</h6><ul class="list"><li>Beta</li></ul><li>Cee</li></ul>'
+        '<ul class="list"><li>Beta</li><li>Dee</li></ul>'
+    ),
+    "class_attributes": ROW.format(
+        '<ul class="other list"><li>One</li></ul><ul class=list class=other><li>Two</li></ul>'
+        '<ul class=other class=list><li>Three</li></ul><UL CLASS="list"><li>Four</li></UL>'
+    ),
+    "stray_and_misnested": ROW.format('<h6>A</h6><ul class="list"><li><b>Acme</li></b></i><li>Beta</ul></div><li>X'),
+    "outside_list_row": '<ul class="list"><li>Nope</li></ul>' + ROW.format('<ul class="list"><li>Yes</li></ul>'),
+}
+TOKENS = (
+    '<div class="list-row">', '<div class="a list-row">', "<div>", "</div>", '<ul class="list">', "<ul>", "</ul>",
+    '<ul class="list"/>', '<ol class="list">', "</ol>", "<li>", "</li>", "<li/>", "<h6>", "</h6>", "<h6/>", "<b>",
+    "</b>", "<span>", "</span>", "<p>", "</p>", "<i/>", "<br>", "</br>", "<br/>", "<img src=a>",
+    "<script>x<y</script>", "<style>s</style>", "<template>T<b>t</b></template>", "<template>", "</template>",
+    "<rt>R</rt>", "<rp>", "</rp>", "<!-- c -->", "<!doctype html>", "<?pi x?>", "<![CDATA[ cd ]]>", "&amp;", "&amp",
+    "&foo;", "&#65;", "&#x42;", "&#150;", "&nbsp;", " A ", "B", "c d", "é", "\n", "<",
+)
+
+
+def reference(html: str) -> list[dict]:
+    """The BeautifulSoup extraction the roster parser replaced."""
+    soup = BeautifulSoup(html, "html.parser")
+    seen_iso = now_iso(CLOCK)
+    companies = []
+    seen_slugs: set[str] = set()
+    for ul in soup.select("div.list-row ul.list"):
+        letter_group = None
+        prev = ul.find_previous_sibling("h6") or ul.find_previous("h6")
+        if prev:
+            letter_group = prev.get_text(strip=True)
+        for li in ul.find_all("li"):
+            name = li.get_text(strip=True)
+            if not name:
+                continue
+            slug = slugify(name)
+            if not slug or slug in seen_slugs:
+                continue
+            seen_slugs.add(slug)
+            companies.append({"name": name, "slug": slug, "letter_group": letter_group, "first_seen_iso": seen_iso})
+    return companies
+
+
+def _extract(html: str, chunk_size: int | None = None) -> list[dict]:
+    extractor = InvestmentListExtractor(clock=CLOCK)
+    if chunk_size is None:
+        companies = extractor.extract_companies(html)
+    else:
+        companies = list(extractor.iter_companies(html[i : i + chunk_size] for i in range(0, len(html), chunk_size)))
+    return [{key: c[key] for key in ("name", "slug", "letter_group", "first_seen_iso")} for c in companies]
+
+
+def _check(html: str, chunk_sizes=(None, 1, 7)) -> list[dict]:
+    expected = reference(html)
+    for chunk_size in chunk_sizes:
+        got = _extract(html, chunk_size)
+        assert got == expected, (html, chunk_size)
+    return expected
+
+
+def test_named_cases():
+    found = {name: [(c["name"], c["letter_group"]) for c in _check(html)] for name, html in CASES.items()}
+    # Spot checks that the cases exercise what their names say
+    assert found["nested_li"] == [("OuterInnerTail", "A"), ("Inner", "A"), ("Next", "A")]
+    assert found["script_and_style"] == [("AcmeCo", "A")]
+    assert found["heading_sibling_before_nested"] == [("Acme", "A")]
+    assert found["heading_ancestor"][0] == ("Acme", "AAcmeTail")
+    assert found["empty_heading"] == [("Acme", ""), ("Beta", "")]
+    print(f"PASS: {len(CASES)} hand-written pages extract the same companies as BeautifulSoup")
+    return True
+
+
+def test_generated_pages():
+    for name, generate in ROSTER_PAGES.items():
+        assert _check(generate(50), chunk_sizes=(None, 64)), name
+    rng = random.Random(44)
+    pages = 1000
+    for _ in range(pages):
+        _check('<div class="list-row">' + "".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 40))) + "</div>")
+    print(f"PASS: the adversarial pages and {pages} random token soups extract the same companies as BeautifulSoup")
+    return True
+
+
+def main():
+    print("=== Testing Roster Parser Parity ===")
+    tests = [test_named_cases, test_generated_pages]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
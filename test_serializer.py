@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test that the fast serializer backend writes byte-identical files to the stdlib encoder."""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats import serializer
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "docs")
+
+EDGE_CASES = {
+    "floats": [0.1, 1.0, -0.0, 0.0001, 9.99e-5, 1e-05, 1e-7, 1e15, 1e16, 1.2345e16, 1.5e300, 5e-324],
+    "ints": [0, -1, 2**63 - 1, -(2**63), 2**64, 10**30],
+    "strings": ["", "naïve café", "日本語", "emoji 🚀", "quote \" backslash \\ slash /", "\x00\x1f\x7f ", "e12 0.00001"],
+    "containers": [[], {}, [{}], {"a": []}, [[[]]]],
+    "literals": [True, False, None],
+}
+
+
+def _stdlib_file(obj, pretty):
+    """What the build wrote before the serializer existed."""
+    with tempfile.TemporaryFile("w+b") as raw:
+        with open(raw.fileno(), "w", closefd=False) as f:
+            if pretty:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+            f.write("\n")
+        raw.seek(0)
+        return raw.read()
+
+
+def _written(obj, pretty):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.json")
+        serializer.write(path, obj, pretty=pretty)
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def test_byte_identical_output():
+    with open(os.path.join(DOCS_DIR, "companies", "all.json")) as f:
+        companies = json.load(f)
+    with open(os.path.join(DOCS_DIR, "meta.json")) as f:
+        meta = json.load(f)
+    for obj in (companies, meta, EDGE_CASES, {1: "non-string key"}):
+        for pretty in (True, False):
+            assert _written(obj, pretty) == _stdlib_file(obj, pretty), f"mismatch (pretty={pretty})"
+    print(f"PASS: {serializer.BACKEND} backend output is byte-identical to json.dump, pretty and minified")
+    return True
+
+
+def test_loads_round_trip():
+    data = serializer.dumps(dict(EDGE_CASES, ints=[0, -1, 2**63 - 1, -(2**63)]))
+    assert serializer.loads(data) == serializer.loads(data.decode("utf-8")) == json.loads(data)
+    assert serializer.loads(b"[NaN, 1]")[1] == 1
+    try:
+        serializer.loads(b"{not json")
+    except json.JSONDecodeError:
+        pass
+    else:
+        raise AssertionError("invalid JSON accepted")
+    nested = {"a": [{"b": "[[[{{"}, [1, [2]]], "c": {}}
+    assert serializer.nesting_depth(serializer.dumps(nested)) == 4
+    assert serializer.loads(serializer.dumps(nested), max_depth=4) == nested
+    for deep in (b"[" * 5 + b"]" * 5, "[" * 500_000):
+        try:
+            serializer.loads(deep, max_depth=4)
+        except ValueError as e:
+            assert "deeper than 4" in str(e), e
+        else:
+            raise AssertionError("nesting past max_depth accepted")
+    print("PASS: loads agrees with json.loads, raises JSONDecodeError and refuses nesting past max_depth")
+    return True
+
+
+def main():
+    print("=== Testing Serializer ===")
+    tests = [test_byte_identical_output, test_loads_round_trip]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
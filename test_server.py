@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Test the local API server against the committed docs/ output."""
+
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.query.filters import filter_companies
+from src.serve import server as server_module
+from src.serve.server import ApiServer, DiskFile
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs")
+
+
+def _server():
+    return ApiServer(DOCS_DIR)
+
+
+def _listen(server):
+    """Serve `server` over TCP on a background event loop; returns (loop, port)."""
+    loop = asyncio.new_event_loop()
+    listener = loop.run_until_complete(asyncio.start_server(server._handle_connection, "127.0.0.1", 0))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop, listener.sockets[0].getsockname()[1]
+
+
+def _fetch(conn, method, path, headers=None, body=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    return response.status, response.getheaders(), response.read()
+
+
+def test_static_conditional_and_range():
+    server = _server()
+    status, headers, body, _ = server.respond("GET", "/meta.json", {})
+    assert status == 200 and json.loads(body)["total_companies"] > 0
+
+    status, _, body, _ = server.respond("GET", "/meta.json", {"if-none-match": headers["ETag"]})
+    assert status == 304 and body == b""
+
+    status, headers, body, _ = server.respond("GET", "/companies/all.json", {"range": "bytes=0-9"})
+    assert status == 206 and len(body) == 10 and headers["Content-Range"].startswith("bytes 0-9/")
+
+    status, headers, body, _ = server.respond("GET", "/companies/all.json", {"range": "bytes=0-9,20-29"})
+    assert status == 206 and headers["Content-Type"].startswith("multipart/byteranges")
+    assert body.count(b"Content-Range: bytes ") == 2
+
+    status, _, _, _ = server.respond("GET", "/companies/all.json", {"range": "bytes=999999999-"})
+    assert status == 416
+
+    # A Range header that cannot be parsed is ignored: 200 with the whole entity, gzipped if accepted
+    _, _, full, _ = server.respond("GET", "/companies/all.json", {})
+    for header in ("bytes=x-9", "items=0-9", "bytes=5-3", "bytes=0-1,9-2", "bytes=" + ",".join(["0-1"] * 300)):
+        status, headers, body, _ = server.respond("GET", "/companies/all.json", {"range": header})
+        assert status == 200 and body == full and "Content-Range" not in headers, (header, status)
+    status, headers, _, _ = server.respond(
+        "GET", "/companies/all.json", {"range": "bytes=x-9", "accept-encoding": "gzip"}
+    )
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+
+    status, headers, _, _ = server.respond("GET", "/companies/all.json", {"accept-encoding": "gzip, br"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+
+    status, _, _, _ = server.respond("GET", "/companies/no-such-company.json", {})
+    assert status == 404
+    print("PASS: static files support ETag/304, single and multi-range, and gzip")
+    return True
+
+
+def test_query_matches_filters():
+    server = _server()
+    companies = json.load(open(os.path.join(DOCS_DIR, "companies", "all.json")))
+    expected = [c["id"] for c in companies if "ai" in c["sectors"] and c["status"] == "active"]
+
+    status, _, body, _ = server.respond("GET", "/query?sector=ai&status=active&limit=5&offset=2", {})
+    result = json.loads(body)
+    assert status == 200
+    assert result["total"] == len(expected)
+    assert [c["id"] for c in result["results"]] == expected[2:7]
+
+    # Every filter selects what the query command's filters select
+    filters = ({}, {"sector": "ai"}, {"stage": "seed", "status": "active"}, {"q": "DATA"}, {"q": "ai", "sector": "x"})
+    for params in filters:
+        query = "&".join(f"{name}={value}" for name, value in params.items())
+        _, _, body, _ = server.respond("GET", f"/query?{query}&limit=1000", {})
+        assert [c["id"] for c in json.loads(body)["results"]] == [
+            c["id"] for c in filter_companies(companies, **params)
+        ][:1000], params
+
+    for query in ("limit=abc", "limit=-1", "offset=1.5", "offset=%C2%B2"):
+        status, _, body, _ = server.respond("GET", f"/query?{query}", {})
+        assert status == 400 and json.loads(body) == {"error": "limit and offset must be non-negative integers"}, body
+    print(f"PASS: /query returns {len(expected)} active AI companies")
+    return True
+
+
+def test_large_files_stream_from_disk():
+    with open(os.path.join(DOCS_DIR, "companies", "all.json"), "rb") as f:
+        full = f.read()
+    saved = server_module.DISK_FILE_SIZE
+    server_module.DISK_FILE_SIZE = len(full) // 2
+    try:
+        server = _server()
+    finally:
+        server_module.DISK_FILE_SIZE = saved
+    static = server.snapshot.files["/companies/all.json"]
+    assert isinstance(static, DiskFile) and not hasattr(static, "body")
+    assert not isinstance(server.snapshot.files["/meta.json"], DiskFile)
+
+    loop, port = _listen(server)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        status, headers, body = _fetch(conn, "GET", "/companies/all.json", {"Accept-Encoding": "gzip"})
+        assert status == 200 and body == full and "Content-Encoding" not in dict(headers)
+        etag = dict(headers)["ETag"]
+        assert _fetch(conn, "GET", "/companies/all.json", {"If-None-Match": etag})[0] == 304
+        status, headers, body = _fetch(conn, "GET", "/companies/all.json", {"Range": "bytes=10-19"})
+        assert status == 206 and body == full[10:20]
+        status, headers, body = _fetch(conn, "GET", "/companies/all.json", {"Range": "bytes=0-4,-5"})
+        assert status == 206 and full[:5] in body and full[-5:] in body and body.endswith(b"--\r\n")
+        assert int(dict(headers)["Content-Length"]) == len(body)
+        status, _, body = _fetch(conn, "GET", "/query?sector=ai&limit=1")
+        assert status == 200 and json.loads(body)["total"] > 0
+    finally:
+        conn.close()
+        loop.call_soon_threadsafe(loop.stop)
+
+    # A file rewritten in place under the snapshot is not served torn
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "all.json")
+        shutil.copy(os.path.join(DOCS_DIR, "companies", "all.json"), path)
+        static = DiskFile(path, "application/json")
+        with open(path, "r+b") as f:
+            f.truncate(10)
+        status, headers, _, _ = server._entity(static, {}, False)
+        assert status == 503 and "Retry-After" in headers
+        static.file.close()
+    print(f"PASS: a {len(full)}-byte file is streamed from disk whole, by range and multi-range, with ETags")
+    return True
+
+
+def test_request_bodies_are_discarded():
+    loop, port = _listen(_server())
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        status, headers, _ = _fetch(conn, "POST", "/meta.json", body=b"GET /x HTTP/1.1\r\n\r\n" * 10)
+        assert status == 405 and dict(headers)["Connection"] == "keep-alive"
+        # The next request on the same connection is read from where the body ended
+        status, _, body = _fetch(conn, "GET", "/meta.json")
+        assert status == 200 and json.loads(body)["total_companies"] > 0
+    finally:
+        conn.close()
+        loop.call_soon_threadsafe(loop.stop)
+    print("PASS: a POST body is read and dropped, and the connection serves the next request")
+    return True
+
+
+def main():
+    print("=== Testing API Server ===")
+    tests = [
+        test_static_conditional_and_range,
+        test_query_matches_filters,
+        test_large_files_stream_from_disk,
+        test_request_bodies_are_discarded,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
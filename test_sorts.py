@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test the precomputed sort orders (sorts/{key}.json and their pages)."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.client.client import ApiClient
+from src.formats.sorts import PAGE_SIZE, SORT_KEYS, build_sorts, is_permutation, page_count
+from src.normalize.names import canonical_name
+from src.validate.validate_build import Validator
+
+DOCS = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _companies():
+    with open(os.path.join(DOCS, "companies", "all.json")) as f:
+        return json.load(f)
+
+
+def test_orders_sort_the_records():
+    companies = _companies()
+    sorts = build_sorts(companies)
+    assert list(sorts) == list(SORT_KEYS)
+    for key, (index, pages) in sorts.items():
+        order = index["order"]
+        assert is_permutation(order, len(companies)), key
+        assert index["pages"] == len(pages) == page_count(len(companies))
+        assert [i for page in pages for i in page["ordinals"]] == order
+        assert all(len(page["companies"]) <= PAGE_SIZE for page in pages)
+        assert pages[0]["companies"] == [companies[i]["id"] for i in order[:PAGE_SIZE]]
+
+    by_name = [canonical_name(companies[i]["name"]) for i in sorts["name"][0]["order"]]
+    assert by_name == sorted(by_name)
+    sector_counts = [len(companies[i]["sectors"]) for i in sorts["sector_count"][0]["order"]]
+    assert sector_counts == sorted(sector_counts, reverse=True)
+    statuses = [companies[i]["status"] for i in sorts["status"][0]["order"]]
+    assert statuses.index("unknown") > statuses.index("exited") > statuses.index("active")
+    print(f"PASS: {len(sorts)} orders over {len(companies)} companies, {len(sorts['name'][1])} pages each")
+    return True
+
+
+def test_ties_are_stable():
+    seen = "2026-01-01T00:00:00Z"
+    companies = [
+        {"id": f"a16z:c{i}", "name": "Same", "sectors": [], "status": "active", "first_seen_iso": seen}
+        for i in range(7)
+    ]
+    sorts = build_sorts(companies, page_size=3)
+    for index, pages in sorts.values():
+        assert index["order"] == list(range(7))
+        assert [page["ordinals"] for page in pages] == [[0, 1, 2], [3, 4, 5], [6]]
+    empty_index, empty_pages = build_sorts([])["name"]
+    assert empty_index["order"] == [] and empty_index["pages"] == 0 and empty_pages == []
+    print("PASS: equal keys keep all.json order and pages split the order exactly")
+    return True
+
+
+def test_validator_rejects_broken_orders():
+    companies = _companies()[:120]
+    validator = Validator()
+    for company in companies:
+        validator.check_company(company, full=False)
+    index, pages = build_sorts(companies)["name"]
+    validator.check_sort(index, pages)
+    assert validator.errors == []
+    validator.check_sort(dict(index, order=index["order"][:-1] + [0]), pages)
+    validator.check_sort(index, pages[:-1] + [None])
+    validator.check_sort(index, list(reversed(pages)))
+    assert len(validator.errors) == 3, validator.errors
+    print("PASS: non-permutations, missing pages and misordered pages are reported")
+    return True
+
+
+def test_client_sorted_page():
+    companies = _companies()
+    sorts = build_sorts(companies)
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        shutil.copytree(DOCS, docs)
+        for key, (index, pages) in sorts.items():
+            os.makedirs(os.path.join(docs, "sorts", key))
+            for page in pages:
+                with open(os.path.join(docs, "sorts", key, f"{page['page']}.json"), "w") as f:
+                    json.dump(page, f)
+        client = ApiClient(docs, cache_dir=os.path.join(tmp, "cache"))
+        second = client.sorted_page("name", 2)
+        assert [c["id"] for c in second] == sorts["name"][1][1]["companies"]
+        assert client.sorted_page("name", 10_000) == []
+    print("PASS: the client reads one page of a sorted view")
+    return True
+
+
+def main():
+    print("=== Testing Sort Orders ===")
+    tests = [
+        test_orders_sort_the_records,
+        test_ties_are_stable,
+        test_validator_rejects_broken_orders,
+        test_client_sorted_page,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
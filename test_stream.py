@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test the streaming building blocks: chunked roster parsing and record-at-a-time merging."""
+
+import contextlib
+import copy
+import html
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.build.build_dataset import STREAM_SKIPPED, build, build_streaming
+from src.build.merge import StreamingMerger, merge_enrichment
+from src.extract.archive import SourceArchive
+from src.extract.investment_list import INVESTMENT_LIST_URL, InvestmentListExtractor
+from src.extract.portfolio import PORTFOLIO_URL
+from src.normalize.clock import fixed_clock
+from src.normalize.company import normalize_company
+from src.validate import validate_build
+
+HTML = (
+    '<div class="list-row"><h4>Investments</h4><div class="row">'
+    '<div class="col-xs-6 col-sm-3"><h6>#-A</h6><ul class="list">'
+    "<li>11x</li><li>Acme &amp; Co</li><li>Alpha <b>Beta</b></li><li>  </li></ul></div>"
+    '<div class="col-xs-6 col-sm-3"><h6>B</h6><ul class="list"><li>Beta Labs</li><li>11X</li></ul></div>'
+    '</div></div><ul class="list"><li>Not In A List Row</li></ul>'
+)
+
+
+def test_chunked_parse_matches_whole_page():
+    clock = fixed_clock("2026-01-01T00:00:00Z")
+    whole = InvestmentListExtractor(clock=clock).extract_companies(HTML)
+    assert [(c["name"], c["letter_group"]) for c in whole] == [
+        ("11x", "#-A"),
+        ("Acme & Co", "#-A"),
+        ("AlphaBeta", "#-A"),
+        ("Beta Labs", "B"),
+    ]
+    for size in (1, 5, 64):
+        chunks = (HTML[i : i + size] for i in range(0, len(HTML), size))
+        assert list(InvestmentListExtractor(clock=clock).iter_companies(chunks)) == whole
+    print("PASS: roster parses identically whole or in chunks")
+    return True
+
+
+def test_streaming_merger_matches_batch_merge():
+    clock = fixed_clock("2026-01-01T00:00:00Z")
+    roster = [normalize_company({"name": n}, clock) for n in ("Acme", "Beta", "Gamma")]
+    portfolio = [
+        {"slug": "beta", "description": "Beta does things", "sectors": ["ai"], "logo_url": "https://x/beta.png"},
+        {"slug": "beta", "stages": ["seed"]},
+        {"slug": "delta", "name": "Delta"},
+        {"slug": ""},
+    ]
+    batch = merge_enrichment(copy.deepcopy(roster), portfolio)
+
+    merger = StreamingMerger(portfolio)
+    streamed = [merger.enrich(c) for c in copy.deepcopy(roster)]
+    quarantined, stats = merger.finish()
+    assert (streamed, quarantined, stats) == batch
+    assert stats["matched"] == 2 and [q["slug"] for q in quarantined] == ["delta"]
+    print("PASS: streaming merge matches merge_enrichment")
+    return True
+
+
+def test_streaming_build_matches_staged_and_reports_skipped_exports():
+    portfolio = '<div class="portfolio-app" data-json="{}"></div>'.format(
+        html.escape(json.dumps({"companies": [{"a16z_company_name": "Beta Labs", "website_categories": "AI"}]}))
+    )
+    saved = validate_build.MANIFEST_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        archive = SourceArchive(os.path.join(tmp, "2026-01-01.json.gz"), False, "2026-01-01T00:00:00Z")
+        archive.pages = {INVESTMENT_LIST_URL: HTML, PORTFOLIO_URL: portfolio}
+        archive.save()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                replay = SourceArchive.replay(archive.path)
+                staged = build(archive=replay, output_dir=os.path.join(tmp, "staged"), cache_dir=tmp)
+                streamed = build_streaming(archive=replay, output_dir=os.path.join(tmp, "streamed"))
+        finally:
+            validate_build.MANIFEST_DIR = saved
+        # Both fail only the minimum-size check of a four-company roster
+        assert staged["validation"] == streamed["validation"], (staged["validation"], streamed["validation"])
+        assert streamed["skipped_exports"] == list(STREAM_SKIPPED) and "skipped_exports" not in staged
+        assert ", ".join(STREAM_SKIPPED) in out.getvalue()
+        for rel in STREAM_SKIPPED:
+            assert os.path.exists(os.path.join(tmp, "staged", rel)), rel
+            assert not os.path.exists(os.path.join(tmp, "streamed", rel)), rel
+        with open(os.path.join(tmp, "staged", "companies", "all.json"), "rb") as a:
+            with open(os.path.join(tmp, "streamed", "companies", "all.json"), "rb") as b:
+                assert a.read() == b.read()
+    print("PASS: the streaming build writes the staged all.json and reports the exports it skips")
+    return True
+
+
+def main():
+    print("=== Testing Streaming Build ===")
+    tests = [
+        test_chunked_parse_matches_whole_page,
+        test_streaming_merger_matches_batch_merge,
+        test_streaming_build_matches_staged_and_reports_skipped_exports,
+    ]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Test standalone and incremental validation of a docs/ tree."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.formats import serializer
+from src.formats.bundle import BUNDLE_NAME, bundle_paths, write_bundle
+from src.formats.history import extend_history
+from src.formats.membership import build_membership
+from src.validate import validate_build
+from src.validate.validate_build import Validator, validate
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "docs")
+
+
+def _docs_copy(tmp: str) -> str:
+    """A copy of the committed docs/ with the membership files the build now writes."""
+    docs = os.path.join(tmp, "docs")
+    shutil.copytree(DOCS_DIR, docs, ignore=shutil.ignore_patterns("*.md", "logos"))
+    with open(os.path.join(docs, "companies", "all.json")) as f:
+        companies = json.load(f)
+    for company in companies:
+        company["logo_path"] = None  # logos are not copied
+        serializer.write(os.path.join(docs, "companies", f"{company['slug']}.json"), company)
+    serializer.write(os.path.join(docs, "companies", "all.json"), companies)
+    if os.path.exists(os.path.join(docs, "companies", "related.json")):
+        os.remove(os.path.join(docs, "companies", "related.json"))
+    bloom, aliases = build_membership(companies)
+    with open(os.path.join(docs, "companies", "names.bloom"), "wb") as f:
+        f.write(bloom)
+    with open(os.path.join(docs, "companies", "aliases.json"), "w") as f:
+        json.dump(aliases, f)
+    return docs
+
+
+def test_incremental_rechecks_only_changed_records():
+    checked = []
+    original = Validator.check_company
+
+    def counting(self, c, full=True):
+        if full:
+            checked.append(c["slug"])
+        original(self, c, full)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_dir = validate_build.MANIFEST_DIR
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        Validator.check_company = counting
+        try:
+            docs = _docs_copy(tmp)
+            passed, errors = validate(docs)
+            assert passed, errors
+            total = len(checked)
+            assert total > 500
+
+            # Nothing changed: no record is read, let alone checked
+            checked.clear()
+            assert validate(docs, incremental=True) == (True, [])
+            assert checked == []
+
+            # One record changes: only it is re-checked, and its error is reported
+            all_path = os.path.join(docs, "companies", "all.json")
+            with open(all_path) as f:
+                companies = json.load(f)
+            slug = companies[3]["slug"]
+            companies[3]["source_evidence"]["in_investment_list"] = False
+            serializer.write(all_path, companies)
+            checked.clear()
+            passed, errors = validate(docs, incremental=True)
+            assert checked == [slug], checked
+            assert not passed and errors == [f"Company {companies[3]['name']} missing in_investment_list=true"], errors
+
+            # A failed run does not move the baseline; a full run re-checks everything
+            checked.clear()
+            assert not validate(docs, incremental=True)[0]
+            assert not validate(docs)[0] and len(checked) == 1 + total
+        finally:
+            Validator.check_company = original
+            validate_build.MANIFEST_DIR = manifest_dir
+    print(f"PASS: incremental validation re-checked 1 of {total} records")
+    return True
+
+
+def test_incremental_sees_bundle_and_stats_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_dir = validate_build.MANIFEST_DIR
+        validate_build.MANIFEST_DIR = os.path.join(tmp, "manifests")
+        try:
+            docs = _docs_copy(tmp)
+            with open(os.path.join(docs, "meta.json")) as f:
+                meta = json.load(f)
+            for rel, table in extend_history({}, meta).items():
+                os.makedirs(os.path.dirname(os.path.join(docs, rel)), exist_ok=True)
+                serializer.write(os.path.join(docs, rel), table)
+            files = []
+            for rel in bundle_paths(docs):
+                with open(os.path.join(docs, rel), "rb") as f:
+                    files.append((rel, f.read()))
+            with open(os.path.join(docs, BUNDLE_NAME), "wb") as f:
+                write_bundle(f, files, b"")
+            assert validate(docs) == (True, [])
+            assert validate(docs, incremental=True) == (True, [])
+
+            # Only the stats history changes
+            history_path = os.path.join(docs, "stats", "history.json")
+            with open(history_path) as f:
+                history = json.load(f)
+            serializer.write(history_path, dict(history, count=2))
+            assert validate(docs, incremental=True) == (False, ["stats/history.json columns do not all have 2 rows"])
+            serializer.write(history_path, history)
+
+            # Only the bundle changes
+            with open(os.path.join(docs, BUNDLE_NAME), "r+b") as f:
+                f.truncate(100)
+            passed, errors = validate(docs, incremental=True)
+            assert not passed and len(errors) == 1 and errors[0].startswith("api.bundle is unreadable"), errors
+        finally:
+            validate_build.MANIFEST_DIR = manifest_dir
+    print("PASS: incremental validation re-runs when only the bundle or the stats history changed")
+    return True
+
+
+def main():
+    print("=== Testing Validation ===")
+    tests = [test_incremental_rechecks_only_changed_records, test_incremental_sees_bundle_and_stats_changes]
+    all_passed = True
+    for test in tests:
+        print(f"\n--- {test.__name__} ---")
+        try:
+            test()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            all_passed = False
+    print(f"\n=== {'PASS' if all_passed else 'FAIL'} ===")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())